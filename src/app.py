@@ -1,4 +1,6 @@
 from utils import db_connect
-engine = db_connect()
 
 # your code here
+if __name__ == "__main__":
+    # Sin conexión al importar: el engine (con pool) se crea al ejecutar
+    engine = db_connect()
@@ -0,0 +1,107 @@
+# Caché de imágenes redimensionadas -----------------------------------
+# Las imágenes de las secciones se redimensionan una sola vez y se
+# guardan como PNG comprimido en streamlit/.cache, con el hash del
+# archivo original y el tamaño en el nombre. Los bytes también quedan en
+# memoria, así que en un acierto no se decodifica ninguna imagen.
+#
+# Uso (pre-generar todo antes de levantar la app):
+#   python src/assets.py
+import hashlib
+import io
+import os
+import threading
+
+# Obtener la ruta absoluta del directorio donde está el script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ASSETS_DIR = os.path.join(BASE_DIR, "../streamlit")
+CACHE_DIR = os.path.join(ASSETS_DIR, ".cache")
+
+# Imágenes usadas por la app y su tamaño de despliegue
+APP_ASSETS = {
+    "caratula.png": (256, 256),
+    "inicio.png": (256, 256),
+    "s_1.png": (256, 256),
+    "s_2.png": (256, 256),
+    "s_4.png": (256, 256),
+    "s_6_0.png": (1000, 1000),
+    "s_6_1.png": (1000, 1000),
+    "s_6_2.png": (1000, 1000),
+    "s_6_3.png": (1000, 1000),
+    "s_6_4.png": (500, 500),
+    "s_8.png": (256, 256),
+}
+
+# Caché en memoria: {(ruta, tamaño): ((mtime, tamaño_archivo), bytes)}
+_memory_cache = {}
+_lock = threading.Lock()
+
+
+def _source_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for block in iter(lambda: source.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def _cache_path(path, size, source_hash):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, f"{stem}_{size[0]}x{size[1]}_{source_hash}.png")
+
+
+def _render(path, size, cache_path):
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img_resized = img.resize(size)
+    buffer = io.BytesIO()
+    img_resized.save(buffer, format="PNG", optimize=True)
+    data = buffer.getvalue()
+
+    # Escribir a un temporal y renombrar (seguro con varios procesos)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as cache_file:
+        cache_file.write(data)
+    os.replace(tmp_path, cache_path)
+    return data
+
+
+def image_bytes(path, size):
+    """PNG de `path` redimensionado a `size`. FileNotFoundError si no existe."""
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = (os.path.abspath(path), tuple(size))
+
+    cached = _memory_cache.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with _lock:
+        cache_path = _cache_path(path, size, _source_hash(path))
+        if os.path.exists(cache_path):
+            with open(cache_path, "rb") as cache_file:
+                data = cache_file.read()
+        else:
+            data = _render(path, tuple(size), cache_path)
+        _memory_cache[key] = (signature, data)
+        return data
+
+
+def prerender_assets(assets=None):
+    """Generar la caché en disco para todas las imágenes de la app."""
+    assets = APP_ASSETS if assets is None else assets
+    rendered = {}
+    for file_name, size in assets.items():
+        path = os.path.join(ASSETS_DIR, file_name)
+        if os.path.exists(path):
+            rendered[file_name] = len(image_bytes(path, size))
+        else:
+            print(f"Error: No se encontró la imagen en la ruta: {path}")
+    return rendered
+
+
+if __name__ == "__main__":
+    for file_name, n_bytes in prerender_assets().items():
+        print(f"{file_name}: {n_bytes / 1024:.0f} KB")
@@ -0,0 +1,375 @@
+# Scoring por lotes de listas de campaña -------------------------------
+# Lee un CSV o Parquet por bloques, codifica cada bloque con
+# FeatureEncoder, calcula predict_proba con el modelo LightGBM y escribe
+# las predicciones al archivo de salida. La memoria depende del tamaño
+# del bloque, no del tamaño del archivo.
+#
+# Con --workers N los bloques se reparten entre N procesos. El modelo se
+# carga una sola vez en el proceso principal y los workers lo heredan por
+# fork (copy-on-write); los resultados se escriben en el orden original.
+#
+# Sin --threshold se usa el umbral ajustado en models/threshold.json
+# (src/threshold.py), o 0.5 si no existe.
+#
+# --input-format indica qué trae el archivo (cada bloque se valida y un
+# valor con el tipo equivocado detiene el scoring con un error claro):
+#   form       columnas del formulario: balance y campaign originales en
+#              balance_yeojohnson y campaign_log, pdays_tran 'no'/'yes'
+#   processed  formato df_clean o salida de ingest.py (ya transformado)
+#   raw        bank-full.csv (';'): se limpia con ingest.clean_chunk; las
+#              filas que el pipeline descarta (edad > 70) no se puntúan
+# La columna `row` de la salida es siempre el número de fila del archivo.
+#
+# Con --cache-size N los clientes repetidos (el mismo perfil codificado)
+# se puntúan una sola vez; cada proceso tiene su propio caché.
+#
+# Con --log-predictions cada bloque se registra también en el log de
+# predicciones (src/prediction_log.py), escrito por un hilo de fondo.
+#
+# Uso:
+#   python src/batch_score.py lista.csv predicciones.csv --id-column id
+#   python src/batch_score.py clientes.parquet scores.parquet --workers 8
+#   python src/batch_score.py ola.csv scores.csv --input-format raw
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from joblib import load
+
+from data_loader import RAW_DTYPES
+from feature_encoder import INPUT_COLUMNS, FeatureEncoder, validate_input
+from ingest import clean_chunk
+from model_registry import MODEL_PATH, get_model
+from prediction_log import open_prediction_log
+from preprocessing import load_preprocessing
+from score_cache import ScoreCache
+from threshold import DEFAULT_THRESHOLD, load_threshold
+
+DEFAULT_CHUNKSIZE = 50_000
+
+INPUT_FORMATS = ["form", "processed", "raw"]
+DEFAULT_INPUT_FORMAT = "form"
+# Columnas del CSV crudo que usa la limpieza (y no hace falta para puntuar)
+RAW_COLUMNS = [col for col in RAW_DTYPES if col != "y"]
+RAW_NUMERIC_COLUMNS = [col for col, dtype in RAW_DTYPES.items() if dtype == "int64"]
+
+
+def _is_parquet(path):
+    return path.endswith((".parquet", ".pq"))
+
+
+def iter_input_chunks(path, chunksize=DEFAULT_CHUNKSIZE, columns=None, sep=","):
+    """Generador de DataFrames de a lo sumo `chunksize` filas."""
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, sep=sep, usecols=columns, chunksize=chunksize)
+
+
+class _OutputWriter:
+    # Escritura incremental: CSV en modo append o ParquetWriter
+    def __init__(self, path):
+        self.path = path
+        self._parquet_writer = None
+        self._first_chunk = True
+
+    def write(self, frame):
+        if _is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            frame.to_csv(
+                self.path,
+                mode="w" if self._first_chunk else "a",
+                header=self._first_chunk,
+                index=False
+            )
+        self._first_chunk = False
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def _validate_raw(chunk):
+    missing = [col for col in RAW_COLUMNS if col not in chunk.columns]
+    if missing:
+        raise ValueError(f"Faltan columnas: {', '.join(missing)}")
+    columns = {col: pd.to_numeric(chunk[col], errors="coerce") for col in RAW_NUMERIC_COLUMNS}
+    invalid = [col for col, values in columns.items() if values.isna().any()]
+    if invalid:
+        raise ValueError(f"Entrada inválida: valores no numéricos en {', '.join(invalid)}")
+    return chunk.assign(**columns)
+
+
+def prepare_chunks(chunks, input_format=DEFAULT_INPUT_FORMAT, id_columns=(), balance_lambda=None):
+    """Bloques validados con las columnas del modelo y las de id.
+
+    El índice de cada bloque es el número de fila en el archivo. En
+    formato 'raw' el bloque queda en formato df_clean ('processed').
+    """
+    start = 0
+    for chunk in chunks:
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        if input_format == "raw":
+            data = validate_input(clean_chunk(_validate_raw(chunk), "raw", balance_lambda), "processed")
+        else:
+            data = validate_input(chunk, input_format)
+        if data.empty:
+            continue
+        extra = [col for col in id_columns if col not in data.columns]
+        yield data.join(chunk.loc[data.index, extra]) if extra else data
+
+
+def _predict_probability(model, encoder, data, num_threads=0, cache=None, version=None,
+                         prepared=False):
+    # num_threads=0 deja que LightGBM use todos los núcleos (OpenMP)
+    matrix = encoder.transform(data, prepared=prepared)
+    if cache is not None:
+        return cache.predict(
+            version, matrix, lambda rows: model.predict_proba(rows, num_threads=num_threads)[:, 1]
+        )
+    return model.predict_proba(matrix, num_threads=num_threads)[:, 1]
+
+
+def _scores_frame(probability, index, threshold):
+    return pd.DataFrame({
+        "probability": probability,
+        "prediction": (probability > threshold).astype(np.int8),
+    }, index=index)
+
+
+def score_frame(model, encoder, data, threshold=DEFAULT_THRESHOLD):
+    """DataFrame con 'probability' (clase 1) y 'prediction' para `data`."""
+    probability = _predict_probability(model, encoder, data)
+    return _scores_frame(probability, data.index, threshold)
+
+
+# Scoring en paralelo --------------------------------------------------
+# Estado de cada worker. Con fork se hereda del proceso principal sin
+# volver a deserializar el modelo; con spawn se carga en el initializer,
+# que también recibe el formato de entrada, la versión y el tamaño del
+# caché (los globales del proceso principal no llegan a los workers).
+_worker_model = None
+_worker_encoder = None
+_worker_cache = None
+_worker_version = None
+_worker_prepared = False
+
+
+def _init_worker(model_path, prepared=False, version=None, cache_size=0):
+    global _worker_model, _worker_encoder, _worker_cache, _worker_version, _worker_prepared
+    if _worker_model is None:
+        _worker_model = load(model_path)
+        _worker_encoder = FeatureEncoder.from_model(_worker_model, load_preprocessing())
+    if _worker_cache is None and cache_size > 0:
+        _worker_cache = ScoreCache(cache_size)
+    _worker_version, _worker_prepared = version, prepared
+
+
+def _score_chunk_in_worker(chunk):
+    # Un hilo por proceso: el paralelismo lo dan los procesos y así se
+    # evita la sobresuscripción de hilos OpenMP
+    return _predict_probability(
+        _worker_model, _worker_encoder, chunk, num_threads=1,
+        cache=_worker_cache, version=_worker_version, prepared=_worker_prepared
+    )
+
+
+class ParallelScorer:
+    """Reparte bloques entre procesos y devuelve los resultados en orden."""
+
+    def __init__(self, model, workers=1, model_path=MODEL_PATH, max_pending=None,
+                 encoder=None, cache=None, version=None, prepared=False):
+        self.model = model
+        # True: los bloques ya vienen en formato df_clean
+        self.prepared = prepared
+        # Caché de puntajes; con fork cada worker hereda una copia propia
+        self.cache = cache
+        self.version = version
+        self.encoder = encoder or FeatureEncoder.from_model(model, load_preprocessing())
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.model_path = model_path
+        # Bloques en vuelo como máximo: acota la memoria del proceso principal
+        self.max_pending = max_pending or 2 * self.workers
+
+    def imap(self, chunks):
+        """Generador de (bloque, probabilidades) en el orden de entrada."""
+        if self.workers == 1:
+            for chunk in chunks:
+                yield chunk, _predict_probability(
+                    self.model, self.encoder, chunk, cache=self.cache, version=self.version,
+                    prepared=self.prepared
+                )
+            return
+
+        global _worker_model, _worker_encoder, _worker_cache, _worker_version, _worker_prepared
+        start_methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in start_methods else None)
+        # Se asigna antes de crear los procesos para que fork lo copie
+        _worker_model, _worker_encoder = self.model, self.encoder
+        _worker_cache, _worker_version = self.cache, self.version
+        _worker_prepared = self.prepared
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.model_path, self.prepared, self.version,
+                      self.cache.max_entries if self.cache is not None else 0)
+        ) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append((chunk, pool.submit(_score_chunk_in_worker, chunk)))
+                if len(pending) >= self.max_pending:
+                    done_chunk, future = pending.popleft()
+                    yield done_chunk, future.result()
+            while pending:
+                done_chunk, future = pending.popleft()
+                yield done_chunk, future.result()
+
+
+def score_file(input_path, output_path, model=None, chunksize=DEFAULT_CHUNKSIZE,
+               id_columns=(), sep=None, threshold=None, workers=1,
+               model_path=MODEL_PATH, log_predictions=None, cache_size=0,
+               input_format=DEFAULT_INPUT_FORMAT):
+    """Puntuar un archivo completo por bloques.
+
+    Devuelve (filas puntuadas, segundos, filas descartadas por la
+    limpieza del formato 'raw'). Lanza ValueError si un bloque no tiene
+    el formato `input_format`.
+    Con `threshold=None` se usa el umbral de models/threshold.json.
+    `log_predictions` ('sqlite' o 'parquet') registra cada predicción.
+    `cache_size` > 0 activa el caché de puntajes (filas repetidas).
+    """
+    encoder = version = None
+    if model is None:
+        loaded = get_model(model_path)
+        model, encoder, version = loaded.model, loaded.encoder, loaded.version
+    if threshold is None:
+        threshold = load_threshold(version)
+    if input_format not in INPUT_FORMATS:
+        raise ValueError(f"Formato desconocido: {input_format}")
+    prepared = input_format != "form"
+    cache = ScoreCache(cache_size) if cache_size > 0 else None
+    scorer = ParallelScorer(model, workers=workers, model_path=model_path, encoder=encoder,
+                            cache=cache, version=version, prepared=prepared)
+    if input_format == "raw":
+        if scorer.encoder.balance_lambda is None:
+            raise FileNotFoundError("Falta el JSON de preprocesamiento para limpiar el CSV crudo")
+        columns = RAW_COLUMNS
+        sep = sep or ";"
+    else:
+        columns = INPUT_COLUMNS
+    columns = list(dict.fromkeys(list(id_columns) + columns))
+
+    writer = _OutputWriter(output_path)
+    # Cola corta y bloqueante: si el disco va más lento que el scoring, se
+    # espera en lugar de acumular bloques en memoria
+    prediction_log = (
+        open_prediction_log(log_predictions, flush_rows=chunksize, max_pending=4)
+        if log_predictions else None
+    )
+    n_rows = n_read = 0
+
+    def counted(chunks):
+        nonlocal n_read
+        for chunk in chunks:
+            n_read += len(chunk)
+            yield chunk
+
+    start = time.perf_counter()
+    try:
+        chunks = prepare_chunks(
+            counted(iter_input_chunks(input_path, chunksize, columns, sep or ",")),
+            input_format, id_columns, scorer.encoder.balance_lambda
+        )
+        for chunk, probability in scorer.imap(chunks):
+            scores = _scores_frame(probability, chunk.index, threshold)
+            if id_columns:
+                output = pd.concat([chunk[list(id_columns)], scores], axis=1)
+            else:
+                # Sin id, se usa el número de fila del archivo de entrada
+                output = scores.rename_axis("row").reset_index()
+            writer.write(output)
+            if prediction_log is not None:
+                prediction_log.log(chunk[INPUT_COLUMNS], probability, threshold, version,
+                                   source="batch", encoder=scorer.encoder, block=True,
+                                   input_format=input_format)
+            n_rows += len(chunk)
+    finally:
+        writer.close()
+        if prediction_log is not None:
+            prediction_log.close()
+    return n_rows, time.perf_counter() - start, n_read - n_rows
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Puntuar una lista de clientes con el modelo LightGBM."
+    )
+    parser.add_argument("input", help="CSV o Parquet con las columnas del formulario")
+    parser.add_argument("output", help="CSV o Parquet de salida")
+    parser.add_argument("--model", default=MODEL_PATH, help="Ruta del modelo joblib")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                        help="Filas por bloque (controla la memoria)")
+    parser.add_argument("--id-column", action="append", default=[],
+                        help="Columna a copiar a la salida (se puede repetir)")
+    parser.add_argument("--input-format", choices=INPUT_FORMATS, default=DEFAULT_INPUT_FORMAT,
+                        help="form: columnas del formulario; processed: df_clean; raw: bank-full.csv")
+    parser.add_argument("--sep", help="Separador del CSV de entrada (por defecto ',' o ';' en raw)")
+    parser.add_argument("--threshold", type=float,
+                        help="Umbral de probabilidad para la clase 1 (por defecto models/threshold.json)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Procesos de scoring (0 = todos los núcleos)")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="Filas en el caché de puntajes por proceso (0 = sin caché)")
+    parser.add_argument("--log-predictions", choices=["sqlite", "parquet"],
+                        help="Registrar las predicciones en data/predictions")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        n_rows, seconds, skipped = score_file(
+            args.input, args.output,
+            chunksize=args.chunksize,
+            id_columns=args.id_column,
+            sep=args.sep,
+            threshold=args.threshold,
+            workers=args.workers,
+            model_path=args.model,
+            log_predictions=args.log_predictions,
+            cache_size=args.cache_size,
+            input_format=args.input_format
+        )
+    except ValueError as e:
+        print(f"Error en {args.input} (--input-format {args.input_format}): {e}", file=sys.stderr)
+        return 2
+    rate = n_rows / seconds if seconds > 0 else float("inf")
+    print(f"{n_rows} filas puntuadas en {seconds:.2f} s ({rate:,.0f} filas/s)")
+    if skipped:
+        print(f"{skipped} filas descartadas por la limpieza del pipeline (no puntuadas)")
+    print(f"Resultados guardados en: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
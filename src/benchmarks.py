@@ -0,0 +1,363 @@
+# Benchmarks de las rutas críticas de la app ---------------------------
+# Mide carga del CSV, preprocesamiento, carga del modelo, predict_proba
+# (una fila y por lotes), redimensionado de imágenes, construcción de los
+# gráficos y render de cada sección de la app. Las mediciones que dependen
+# del tamaño de los datos se repiten con versiones sintéticas de
+# bank-full.csv (10x, 100x por defecto), generadas una vez en
+# data/interim/benchmarks.
+#
+# El grupo workers mide batch_score.score_file con 1, 2, 4 y 8 procesos
+# (--workers) sobre una lista de clientes sintética de cada escala y
+# reporta filas/s y la aceleración contra un solo proceso.
+#
+# Los resultados se guardan en JSON (con el commit de git y las versiones
+# de las librerías) para comparar entre versiones:
+#   python src/benchmarks.py                          # todo, escalas 1 10 100
+#   python src/benchmarks.py --scales 1 10 --skip render
+#   python src/benchmarks.py --compare anterior.json  # razón contra otro run
+#   python src/benchmarks.py --only workers --scales 10 --workers 1 2 4 8
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_loader import RAW_DATA_PATH, RAW_DTYPES
+from feature_encoder import make_sample_input, preprocess_input_data
+
+# Obtener la ruta absoluta del directorio donde está el script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+BENCHMARK_DIR = os.path.join(BASE_DIR, "../data/interim/benchmarks")
+APP_PATH = os.path.join(BASE_DIR, "fp_ds_bank.py")
+
+DEFAULT_SCALES = [1, 10, 100]
+DEFAULT_WORKERS = [1, 2, 4, 8]
+GROUPS = ["load", "preprocess", "model", "predict", "workers", "images", "figures", "render"]
+
+
+# Medición ----------------------------------------------------------------
+def measure(func, repeat=5, number=1):
+    """Tiempos por llamada (s): mediana y mínimo de `repeat` rondas."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return {"median_s": statistics.median(times), "min_s": min(times), "repeat": repeat, "number": number}
+
+
+class Results:
+    """Acumula las mediciones y las imprime a medida que se toman."""
+
+    def __init__(self):
+        self.rows = []
+
+    def add(self, group, name, timing, scale=None, rows=None):
+        self.rows.append({"group": group, "name": name, "scale": scale, "rows": rows, **timing})
+        label = name if scale is None else f"{name} [{scale}x]"
+        line = f"{group:10s} {label:55s} {timing['median_s'] * 1000:12.3f} ms"
+        if "rows_per_s" in timing:
+            line += f" {timing['rows_per_s']:12,.0f} filas/s (x{timing['speedup']:.2f})"
+        print(line)
+
+
+# Datos sintéticos --------------------------------------------------------
+def scaled_raw_path(scale, raw_path=RAW_DATA_PATH, output_dir=BENCHMARK_DIR):
+    """CSV crudo con `scale` veces las filas de bank-full (se genera una vez)."""
+    if scale == 1:
+        return raw_path
+    path = os.path.join(output_dir, f"bank-full_{scale}x.csv")
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(raw_path):
+        return path
+
+    os.makedirs(output_dir, exist_ok=True)
+    with open(raw_path, "rb") as raw_file:
+        header = raw_file.readline()
+        body = raw_file.read()
+    if not body.endswith(b"\n"):
+        body += b"\n"
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as scaled_file:
+        scaled_file.write(header)
+        for _ in range(scale):
+            scaled_file.write(body)
+    os.replace(tmp_path, path)
+    return path
+
+
+# Grupos de benchmarks ----------------------------------------------------
+def bench_load(results, scales):
+    for scale in scales:
+        path = scaled_raw_path(scale)
+        repeat = 3 if scale < 100 else 1
+        df = pd.read_csv(path, sep=";", dtype=RAW_DTYPES)
+        results.add("load", "pd.read_csv bank-full", measure(
+            lambda: pd.read_csv(path, sep=";", dtype=RAW_DTYPES), repeat
+        ), scale, len(df))
+
+
+def bench_preprocess(results, scales):
+    from model_registry import get_model
+
+    encoder = get_model().encoder
+    base_rows = 45_211
+    for scale in [None] + list(scales):
+        n_rows = 1 if scale is None else base_rows * scale
+        data = make_sample_input(n_rows)
+        repeat = 20 if n_rows == 1 else (3 if scale < 100 else 1)
+        label = "1 fila" if scale is None else None
+        if scale is None or scale <= 10:
+            # La implementación original es demasiado lenta a 100x
+            results.add("preprocess", f"preprocess_input_data {label or ''}".strip(),
+                        measure(lambda: preprocess_input_data(data), repeat), scale, n_rows)
+        results.add("preprocess", f"FeatureEncoder.transform {label or ''}".strip(),
+                    measure(lambda: encoder.transform(data), repeat), scale, n_rows)
+
+
+def bench_model(results):
+    from joblib import load
+
+    from model_registry import MODEL_PATH, ModelRegistry
+
+    results.add("model", "joblib.load", measure(lambda: load(MODEL_PATH), 5))
+    results.add("model", "ModelRegistry.get (en frío)", measure(lambda: ModelRegistry().get(), 3))
+    registry = ModelRegistry()
+    registry.get()
+    results.add("model", "ModelRegistry.get (en caché)", measure(registry.get, 5, 1_000))
+
+
+def bench_predict(results, scales):
+    from model_registry import get_model
+
+    loaded = get_model()
+    row = loaded.encoder.transform(make_sample_input(1))
+    results.add("predict", "predict_proba 1 fila", measure(lambda: loaded.model.predict_proba(row), 5, 100))
+    if loaded.predictor is not None:
+        results.add("predict", "ArrayTreePredictor 1 fila",
+                    measure(lambda: loaded.predictor.predict_proba_row(row[0]), 5, 1_000))
+
+    for scale in scales:
+        n_rows = 45_211 * scale
+        matrix = loaded.encoder.transform(make_sample_input(n_rows))
+        repeat = 3 if scale < 100 else 1
+        results.add("predict", "predict_proba lote",
+                    measure(lambda: loaded.model.predict_proba(matrix), repeat), scale, n_rows)
+
+
+def scaled_input_path(scale, output_dir=BENCHMARK_DIR):
+    """CSV con el formato del formulario y 45.211 * `scale` filas (se genera una vez)."""
+    path = os.path.join(output_dir, f"sample_input_{scale}x.csv")
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(output_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    make_sample_input(45_211 * scale).to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def bench_workers(results, scales, workers=DEFAULT_WORKERS):
+    from batch_score import score_file
+
+    output_path = os.path.join(BENCHMARK_DIR, "workers_scores.csv")
+    for scale in scales:
+        input_path = scaled_input_path(scale)
+        repeat = 3 if scale < 100 else 1
+        base_rate = None
+        for n_workers in workers:
+            n_rows = score_file(input_path, output_path, workers=n_workers, threshold=0.5)[0]
+            timing = measure(
+                lambda: score_file(input_path, output_path, workers=n_workers, threshold=0.5), repeat
+            )
+            rate = n_rows / timing["median_s"]
+            base_rate = base_rate or rate
+            results.add("workers", f"score_file --workers {n_workers}",
+                        {**timing, "rows_per_s": rate, "speedup": rate / base_rate}, scale, n_rows)
+    if os.path.exists(output_path):
+        os.remove(output_path)
+
+
+def bench_images(results):
+    from PIL import Image
+
+    import assets
+
+    for file_name, size in assets.APP_ASSETS.items():
+        path = os.path.join(assets.ASSETS_DIR, file_name)
+        if not os.path.exists(path):
+            continue
+
+        def resize():
+            with Image.open(path) as img:
+                img.resize(size)
+
+        results.add("images", f"PIL resize {file_name}", measure(resize, 3))
+    first = next(iter(assets.APP_ASSETS.items()))
+    path = os.path.join(assets.ASSETS_DIR, first[0])
+    assets.image_bytes(path, first[1])
+    results.add("images", f"image_bytes {first[0]} (en caché)",
+                measure(lambda: assets.image_bytes(path, first[1]), 5, 1_000))
+
+
+def bench_figures(results, scales):
+    import data_loader
+    import figures
+    from eda_snapshot import load_snapshot, snapshot_tables
+
+    builders = {
+        "1: target_pie": figures.target_pie,
+        "5: age_boxplot": figures.age_boxplot,
+        "5: balance_histograms": figures.balance_histograms,
+        "5: campaign_histograms": figures.campaign_histograms,
+        "5: quarter_histogram": figures.quarter_histogram,
+        "5: pdays_bar": figures.pdays_bar,
+    }
+    for name, build in builders.items():
+        def cold():
+            figures.clear_cache()
+            build()
+
+        results.add("figures", f"{name} (en frío)", measure(cold, 3))
+        results.add("figures", f"{name} (en caché)", measure(build, 5, 100))
+
+    # Sección 6: tablas del EDA desde el snapshot
+    snapshot = load_snapshot()
+    results.add("figures", "6: snapshot_tables", measure(lambda: snapshot_tables(snapshot), 5))
+
+    # Agregaciones de los gráficos con datos escalados
+    for scale in scales:
+        balance = np.tile(data_loader.load_raw_data(columns=["balance"])["balance"].to_numpy(), scale)
+        results.add("figures", "histogram_counts balance",
+                    measure(lambda: figures.histogram_counts(balance), 3), scale, len(balance))
+        results.add("figures", "box_statistics balance",
+                    measure(lambda: figures.box_statistics(balance), 3), scale, len(balance))
+
+
+def bench_render(results):
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("render     streamlit.testing no disponible, se omite")
+        return
+
+    # AppTest no agrega el directorio del script a sys.path
+    if BASE_DIR not in sys.path:
+        sys.path.insert(0, BASE_DIR)
+    app = AppTest.from_file(APP_PATH, default_timeout=300)
+    app.run()
+    for section in app.sidebar.radio[0].options:
+        app.sidebar.radio[0].set_value(section)
+        results.add("render", f"sección {section}", measure(app.run, 3))
+        if app.exception:
+            raise RuntimeError(f"Error al renderizar {section}: {app.exception}")
+
+
+# Resultados ---------------------------------------------------------------
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    import lightgbm
+    import sklearn
+
+    return {
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scikit-learn": sklearn.__version__,
+        "lightgbm": lightgbm.__version__,
+    }
+
+
+def compare(current, previous):
+    """DataFrame con la razón actual / anterior de la mediana por benchmark."""
+    key = ["group", "name", "scale"]
+    # scale es None en los benchmarks que no dependen del tamaño
+    frames = [pd.DataFrame(report["results"]).astype({"scale": "float64"})
+              for report in (current, previous)]
+    merged = frames[0].merge(frames[1], on=key, suffixes=("", "_previous"))
+    merged["ratio"] = merged["median_s"] / merged["median_s_previous"]
+    return merged[key + ["median_s_previous", "median_s", "ratio"]]
+
+
+def run(groups=GROUPS, scales=DEFAULT_SCALES, workers=DEFAULT_WORKERS):
+    results = Results()
+    if "load" in groups:
+        bench_load(results, scales)
+    if "preprocess" in groups:
+        bench_preprocess(results, scales)
+    if "model" in groups:
+        bench_model(results)
+    if "predict" in groups:
+        bench_predict(results, scales)
+    if "workers" in groups:
+        bench_workers(results, scales, workers)
+    if "images" in groups:
+        bench_images(results)
+    if "figures" in groups:
+        bench_figures(results, scales)
+    if "render" in groups:
+        bench_render(results)
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scales": list(scales),
+        "workers": list(workers),
+        "environment": environment(),
+        "results": results.rows,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de las rutas críticas de la app.")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="Multiplicadores del tamaño de bank-full")
+    parser.add_argument("--workers", type=int, nargs="+", default=DEFAULT_WORKERS,
+                        help="Número de procesos del grupo workers")
+    parser.add_argument("--skip", nargs="+", choices=GROUPS, default=[], help="Grupos a omitir")
+    parser.add_argument("--only", nargs="+", choices=GROUPS, help="Solo estos grupos")
+    parser.add_argument("--output", help="Ruta del JSON (por defecto data/interim/benchmarks)")
+    parser.add_argument("--compare", help="JSON de un run anterior para comparar")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    groups = [group for group in (args.only or GROUPS) if group not in args.skip]
+    report = run(groups, args.scales, args.workers)
+
+    output = args.output or os.path.join(
+        BENCHMARK_DIR,
+        f"benchmark_{time.strftime('%Y%m%d-%H%M%S')}_{report['environment']['git_commit']}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f"Resultados guardados en: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as previous_file:
+            previous = json.load(previous_file)
+        print(compare(report, previous).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
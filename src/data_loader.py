@@ -0,0 +1,213 @@
+# Capa de carga de datos ------------------------------------------------
+# Los DataFrames se leen una sola vez por proceso y se comparten entre
+# todas las sesiones de Streamlit. La caché se invalida sola cuando el
+# archivo en disco cambia (ruta + mtime + tamaño).
+# Los CSV se convierten a Parquet la primera vez (ver storage.py) y cada
+# sección puede pedir solo las columnas que necesita.
+# Al leerlos se compactan (enteros al menor tipo que alcanza, ver
+# frame_memory.py) y el split train/test se guarda como posiciones: los
+# DataFrames de train y test se arman solo cuando se piden.
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import storage
+from frame_memory import compact_frame
+
+# Obtener la ruta absoluta del directorio donde está el script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Rutas por defecto de los datasets
+RAW_DATA_PATH = os.path.join(BASE_DIR, "../data/raw_2/bank-full.csv")
+CLEAN_DATA_PATH = os.path.join(BASE_DIR, "../data/processed/df_clean_bank.csv")
+
+# Tipos de dato explícitos al momento de leer -------------------------
+RAW_DTYPES = {
+    "age": "int64",
+    "job": "category",
+    "marital": "category",
+    "education": "category",
+    "default": "category",
+    "balance": "int64",
+    "housing": "category",
+    "loan": "category",
+    "contact": "category",
+    "day": "int64",
+    "month": "category",
+    "duration": "int64",
+    "campaign": "int64",
+    "pdays": "int64",
+    "previous": "int64",
+    "poutcome": "category",
+    "y": "category",
+}
+
+CLEAN_DTYPES = {
+    "age": "int64",
+    "job": "category",
+    "marital": "category",
+    "education": "category",
+    "default": "category",
+    "housing": "category",
+    "loan": "category",
+    "contact": "category",
+    "day": "int64",
+    "duration": "int64",
+    "poutcome": "category",
+    "balance_yeojohnson": "float64",
+    "campaign_log": "float64",
+    "quarter": "category",
+    "pdays_tran": "int64",
+    "y": "category",
+}
+
+# Parámetros del split train/test usados en todo el proyecto
+TEST_SIZE = 0.2
+RANDOM_STATE = 42
+
+# Caché a nivel de proceso: {(tipo, ruta): (versión, valor)}
+_cache = {}
+_lock = threading.RLock()
+
+
+def dataset_version(path):
+    """Identificador de la versión del archivo: ruta, mtime y tamaño."""
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _get_or_load(kind, path, loader):
+    # Se mantiene solo la versión más reciente de cada archivo, así la
+    # memoria no crece cuando los datos se refrescan.
+    key = (kind, os.path.abspath(path))
+    version = dataset_version(path)
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        value = loader()
+        _cache[key] = (version, value)
+        return value
+
+
+def clear_cache():
+    """Vaciar la caché (útil en notebooks o scripts de larga duración)."""
+    with _lock:
+        _cache.clear()
+
+
+def _read_file(path, columns, **read_csv_kwargs):
+    # Parquet directo, o CSV convertido a Parquet una sola vez. Si pyarrow
+    # no está disponible se lee el CSV como antes.
+    if path.endswith(".parquet"):
+        return storage.read_parquet(path, columns)
+    try:
+        parquet_path = storage.ensure_parquet(path, **read_csv_kwargs)
+    except ImportError:
+        return pd.read_csv(path, usecols=columns, **read_csv_kwargs)
+    return storage.read_parquet(parquet_path, columns)
+
+
+def _read_dataset(path, columns, **read_csv_kwargs):
+    return compact_frame(_read_file(path, columns, **read_csv_kwargs))
+
+
+def _columns_key(columns):
+    return None if columns is None else tuple(columns)
+
+
+def load_raw_data(path=RAW_DATA_PATH, columns=None):
+    """df_raw compartido (bank-full.csv, separado por ';'). No modificar."""
+    return _get_or_load(
+        ("raw", _columns_key(columns)), path,
+        lambda: _read_dataset(path, columns, sep=";", dtype=RAW_DTYPES)
+    )
+
+
+def load_clean_data(path=CLEAN_DATA_PATH, columns=None):
+    """df_clean compartido (df_clean_bank.csv). No modificar."""
+    return _get_or_load(
+        ("clean", _columns_key(columns)), path,
+        lambda: _read_dataset(path, columns, index_col=0, dtype=CLEAN_DTYPES)
+    )
+
+
+def raw_dtypes(path=RAW_DATA_PATH):
+    """dtypes de df_raw sin cargar los datos (lee solo el esquema)."""
+    return _get_or_load(
+        "raw_schema", path,
+        lambda: storage.read_schema(
+            storage.ensure_parquet(path, sep=";", dtype=RAW_DTYPES)
+        )
+    )
+
+
+def clean_dtypes(path=CLEAN_DATA_PATH):
+    """dtypes de df_clean sin cargar los datos (lee solo el esquema)."""
+    return _get_or_load(
+        "clean_schema", path,
+        lambda: storage.read_schema(
+            storage.ensure_parquet(path, index_col=0, dtype=CLEAN_DTYPES)
+        )
+    )
+
+
+def get_split_positions(path=CLEAN_DATA_PATH):
+    """Posiciones (train, test) de las filas de df_clean, una vez por versión.
+
+    Es el mismo split que train_test_split(df_clean, ...): el orden
+    aleatorio depende solo de la cantidad de filas y de RANDOM_STATE.
+    """
+    def split():
+        from sklearn.model_selection import train_test_split
+        positions = np.arange(len(load_clean_data(path)), dtype=np.int32)
+        return tuple(train_test_split(positions, test_size=TEST_SIZE, random_state=RANDOM_STATE))
+
+    return _get_or_load("split", path, split)
+
+
+def get_train_data(path=CLEAN_DATA_PATH):
+    """df_train (se arma en cada llamada, no queda en la caché)."""
+    return load_clean_data(path).iloc[get_split_positions(path)[0]]
+
+
+def get_test_data(path=CLEAN_DATA_PATH):
+    """df_test (se arma en cada llamada, no queda en la caché)."""
+    return load_clean_data(path).iloc[get_split_positions(path)[1]]
+
+
+def get_train_test(path=CLEAN_DATA_PATH):
+    """(df_train, df_test) de df_clean a partir de las posiciones del split."""
+    return get_train_data(path), get_test_data(path)
+
+
+# Filas repetidas entre df_train y df_test -------------------------------
+# Con datos reales df_test casi no repite filas de df_train. Un archivo con
+# filas repetidas (p. ej. un CSV de ejemplo copiado varias veces) hace que
+# las métricas en df_test midan memoria y no generalización: la
+# evaluación, el ajuste del umbral y la búsqueda se niegan a usarlo.
+MAX_TEST_OVERLAP = 0.01
+
+
+def test_overlap(path=CLEAN_DATA_PATH):
+    """Fracción de filas de df_test idénticas a alguna fila de df_train."""
+    def overlap():
+        train_positions, test_positions = get_split_positions(path)
+        if not len(test_positions):
+            return 0.0
+        row_hashes = pd.util.hash_pandas_object(load_clean_data(path), index=False).to_numpy()
+        return float(np.isin(row_hashes[test_positions], row_hashes[train_positions]).mean())
+
+    return _get_or_load("test_overlap", path, overlap)
+
+
+def check_test_overlap(path=CLEAN_DATA_PATH, max_overlap=MAX_TEST_OVERLAP):
+    """ValueError si df_test repite filas de df_train más allá de `max_overlap`."""
+    overlap = test_overlap(path)
+    if overlap > max_overlap:
+        raise ValueError(
+            f"El {overlap:.0%} de las filas de df_test está repetido en df_train "
+            f"({os.path.basename(path)}): las métricas en df_test no son válidas"
+        )
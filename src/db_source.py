@@ -0,0 +1,353 @@
+# Fuente de datos en base de datos --------------------------------------
+# Los datos de campañas pueden vivir en Postgres en lugar de CSV. Este
+# módulo mantiene un engine de SQLAlchemy por URL y por proceso, con pool
+# de conexiones (las conexiones vuelven al pool al salir de cada `with`,
+# nunca quedan abiertas), y ofrece:
+#
+#   load_csv       CSV del banco -> tabla. En Postgres usa COPY FROM STDIN
+#                  por bloques; en otros motores (SQLite) executemany del
+#                  driver por lotes, todo en una sola transacción.
+#   iter_table     tabla -> DataFrames de `chunksize` filas, con cursor del
+#                  lado del servidor (stream_results), sin traer todo a
+#                  memoria.
+#   read_table     la tabla completa con los dtypes de data_loader.
+#   pull_parquet   tabla -> Parquet por bloques; la app lo lee con
+#                  data_loader.load_raw_data(path=...) y su caché.
+#
+# Sin DATABASE_URL se usa SQLite en data/interim/db/bank.sqlite.
+#
+# `check` recorre load_csv -> iter_table -> pull_parquet con un SQLite
+# temporal y verifica que cada paso devuelva exactamente el CSV original.
+#
+# Uso:
+#   python src/db_source.py load --kind raw data/raw_2/bank-full.csv
+#   python src/db_source.py pull --kind raw data/interim/db/bank_raw.parquet
+#   python src/db_source.py check                   # con data/raw_2/bank.csv
+import argparse
+import io
+import os
+import tempfile
+import threading
+import time
+
+import pandas as pd
+from sqlalchemy import create_engine, event, text
+
+from data_loader import CLEAN_DTYPES, RAW_DTYPES
+
+# Obtener la ruta absoluta del directorio donde está el script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SQLITE_PATH = os.path.join(BASE_DIR, "../data/interim/db/bank.sqlite")
+CHECK_CSV_PATH = os.path.join(BASE_DIR, "../data/raw_2/bank.csv")
+
+# Pool de conexiones (Postgres y otros motores con servidor)
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+POOL_RECYCLE_S = 1800
+POOL_TIMEOUT_S = 30
+
+DEFAULT_CHUNKSIZE = 50_000
+
+# Marcador de parámetro según el paramstyle del driver (DB-API)
+PLACEHOLDERS = {"qmark": "?", "format": "%s", "pyformat": "%s"}
+
+# Tabla y opciones de lectura del CSV según el tipo de datos
+KINDS = {
+    "raw": {"table": "bank_raw", "dtype": RAW_DTYPES, "read_csv": {"sep": ";"}},
+    "clean": {"table": "bank_clean", "dtype": CLEAN_DTYPES, "read_csv": {"index_col": 0}},
+}
+
+# Un engine por URL y por proceso: {url: Engine}
+_engines = {}
+_lock = threading.Lock()
+
+
+def database_url(url=None):
+    """URL indicada, DATABASE_URL (.env incluido) o el SQLite local."""
+    if url:
+        return url
+    try:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+    except ImportError:
+        pass
+    return os.getenv("DATABASE_URL") or f"sqlite:///{os.path.abspath(SQLITE_PATH)}"
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL: lectores y un escritor a la vez; NORMAL: sin fsync por commit
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def _create_engine(url):
+    if url.startswith("sqlite"):
+        path = url.split("///", 1)[-1]
+        if path and path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+        event.listen(engine, "connect", _sqlite_pragmas)
+        return engine
+    return create_engine(
+        url,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_recycle=POOL_RECYCLE_S,
+        pool_timeout=POOL_TIMEOUT_S,
+        # Descarta conexiones cerradas por el servidor antes de usarlas
+        pool_pre_ping=True,
+    )
+
+
+def get_engine(url=None):
+    """Engine compartido (con pool) para `url`."""
+    url = database_url(url)
+    with _lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = _engines[url] = _create_engine(url)
+        return engine
+
+
+def dispose_engines():
+    """Cerrar todas las conexiones del pool (p. ej. después de un fork)."""
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+def _quote(engine, name):
+    return engine.dialect.identifier_preparer.quote(name)
+
+
+# Carga: CSV -> tabla ---------------------------------------------------
+def _copy_chunk(connection, table, chunk):
+    # COPY FROM STDIN con el bloque serializado como CSV (psycopg2)
+    buffer = io.StringIO()
+    chunk.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    columns = ", ".join(_quote(connection.engine, column) for column in chunk.columns)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {_quote(connection.engine, table)} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+    finally:
+        cursor.close()
+
+
+def _insert_chunk(connection, table, chunk):
+    # executemany directo del driver: evita la conversión fila a fila de
+    # DataFrame.to_sql (~3x más rápido en SQLite)
+    placeholder = PLACEHOLDERS.get(connection.engine.dialect.paramstyle)
+    if placeholder is None:
+        chunk.to_sql(table, connection, index=False, if_exists="append")
+        return
+    columns = ", ".join(_quote(connection.engine, column) for column in chunk.columns)
+    values = ", ".join([placeholder] * chunk.shape[1])
+    rows = chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.executemany(
+            f"INSERT INTO {_quote(connection.engine, table)} ({columns}) VALUES ({values})", rows
+        )
+    finally:
+        cursor.close()
+
+
+def _use_copy(connection):
+    if connection.engine.dialect.name != "postgresql":
+        return False
+    cursor = connection.connection.cursor()
+    try:
+        return hasattr(cursor, "copy_expert")
+    finally:
+        cursor.close()
+
+
+def load_csv(csv_path, table, url=None, chunksize=DEFAULT_CHUNKSIZE, replace=True, **read_csv_kwargs):
+    """Cargar un CSV en `table` por bloques. Devuelve las filas cargadas.
+
+    Todo ocurre en una transacción: si algo falla la tabla queda como
+    estaba.
+    """
+    engine = get_engine(url)
+    rows = 0
+    with engine.begin() as connection:
+        chunks = pd.read_csv(csv_path, chunksize=chunksize, **read_csv_kwargs)
+        for i, chunk in enumerate(chunks):
+            if i == 0:
+                # Crear (o vaciar) la tabla con el esquema del primer bloque
+                chunk.head(0).to_sql(
+                    table, connection, index=False, if_exists="replace" if replace else "append"
+                )
+                copy = _use_copy(connection)
+            if copy:
+                _copy_chunk(connection, table, chunk)
+            else:
+                _insert_chunk(connection, table, chunk)
+            rows += len(chunk)
+    return rows
+
+
+# Lectura: tabla -> DataFrames -----------------------------------------
+def _select(engine, table, columns):
+    names = "*" if columns is None else ", ".join(_quote(engine, column) for column in columns)
+    return text(f"SELECT {names} FROM {_quote(engine, table)}")
+
+
+def iter_table(table, url=None, columns=None, chunksize=DEFAULT_CHUNKSIZE, dtype=None):
+    """DataFrames de hasta `chunksize` filas de `table`.
+
+    Con stream_results el driver usa un cursor del lado del servidor (en
+    Postgres) y solo mantiene en memoria un bloque a la vez. La conexión
+    vuelve al pool al terminar la iteración.
+    """
+    engine = get_engine(url)
+    dtype = {column: kind for column, kind in (dtype or {}).items()
+             if columns is None or column in columns}
+    with engine.connect() as connection:
+        connection = connection.execution_options(stream_results=True, max_row_buffer=chunksize)
+        for chunk in pd.read_sql(_select(engine, table, columns), connection, chunksize=chunksize):
+            yield chunk.astype({column: kind for column, kind in dtype.items() if column in chunk})
+
+
+def read_table(table, url=None, columns=None, chunksize=DEFAULT_CHUNKSIZE, dtype=None):
+    """`table` completa (o solo `columns`) con los dtypes indicados."""
+    chunks = list(iter_table(table, url, columns, chunksize))
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    df = pd.concat(chunks, ignore_index=True)
+    if dtype:
+        df = df.astype({column: kind for column, kind in dtype.items() if column in df})
+    return df
+
+
+def pull_parquet(table, parquet_path, url=None, columns=None, chunksize=DEFAULT_CHUNKSIZE, dtype=None):
+    """Escribir `table` en un Parquet bloque a bloque. Devuelve las filas."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(os.path.dirname(os.path.abspath(parquet_path)), exist_ok=True)
+    tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+    rows = 0
+    writer = None
+    try:
+        for chunk in iter_table(table, url, columns, chunksize, dtype):
+            batch = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                # Categóricas con índices int32 en todos los bloques, para que
+                # el esquema no cambie según cuántas categorías traiga cada uno
+                schema = pa.schema([
+                    field.with_type(pa.dictionary(pa.int32(), field.type.value_type))
+                    if pa.types.is_dictionary(field.type) else field
+                    for field in batch.schema
+                ], metadata=batch.schema.metadata)
+                writer = pq.ParquetWriter(tmp_path, schema, compression="snappy")
+            writer.write_table(batch.cast(schema))
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError(f"La tabla {table} está vacía")
+    os.replace(tmp_path, parquet_path)
+    return rows
+
+
+# Verificación con SQLite temporal ---------------------------------------
+def _same_frame(expected, actual, step):
+    # Las categorías de cada bloque dependen de sus valores: se comparan
+    # los valores, no el dtype categórico
+    try:
+        pd.testing.assert_frame_equal(
+            expected.reset_index(drop=True), actual.reset_index(drop=True),
+            check_dtype=False, check_categorical=False
+        )
+    except AssertionError as e:
+        raise ValueError(f"{step}: el resultado no coincide con el CSV original\n{e}") from None
+
+
+def round_trip_check(csv_path=CHECK_CSV_PATH, kind="raw", chunksize=1_000):
+    """load_csv -> iter_table -> pull_parquet contra un SQLite temporal.
+
+    Lanza ValueError si algún paso no devuelve exactamente el CSV.
+    Devuelve {paso: filas}.
+    """
+    options = KINDS[kind]
+    expected = pd.read_csv(csv_path, dtype=options["dtype"], **options["read_csv"])
+    table = options["table"]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = f"sqlite:///{os.path.join(tmp_dir, 'check.sqlite')}"
+        try:
+            loaded = load_csv(csv_path, table, url, chunksize, dtype=options["dtype"], **options["read_csv"])
+            if loaded != len(expected):
+                raise ValueError(f"load_csv: {loaded} filas cargadas, el CSV tiene {len(expected)}")
+
+            chunks = list(iter_table(table, url, chunksize=chunksize, dtype=options["dtype"]))
+            if any(len(chunk) > chunksize for chunk in chunks):
+                raise ValueError(f"iter_table: bloques de más de {chunksize} filas")
+            _same_frame(expected, pd.concat(chunks), "iter_table")
+
+            parquet_path = os.path.join(tmp_dir, f"{table}.parquet")
+            pulled = pull_parquet(table, parquet_path, url, chunksize=chunksize, dtype=options["dtype"])
+            _same_frame(expected, pd.read_parquet(parquet_path), "pull_parquet")
+        finally:
+            # Cerrar el engine antes de borrar el archivo temporal
+            with _lock:
+                engine = _engines.pop(url, None)
+            if engine is not None:
+                engine.dispose()
+    return {"load_csv": loaded, "iter_table": sum(len(chunk) for chunk in chunks), "pull_parquet": pulled}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Cargar y leer los datos del banco desde una base de datos.")
+    parser.add_argument("command", choices=["load", "pull", "check"],
+                        help="load: CSV -> tabla; pull: tabla -> Parquet; "
+                             "check: ida y vuelta con un SQLite temporal")
+    parser.add_argument("path", nargs="?",
+                        help="CSV de entrada (load, check) o Parquet de salida (pull)")
+    parser.add_argument("--kind", choices=list(KINDS), default="raw",
+                        help="Formato del CSV y tabla por defecto")
+    parser.add_argument("--table", help="Nombre de la tabla (por defecto bank_raw / bank_clean)")
+    parser.add_argument("--url", help="URL de SQLAlchemy (por defecto DATABASE_URL o SQLite local)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--append", action="store_true", help="load: agregar filas en lugar de reemplazar")
+    args = parser.parse_args(argv)
+    if args.path is None and args.command != "check":
+        parser.error(f"{args.command} necesita la ruta del archivo")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "check":
+        csv_path = args.path or CHECK_CSV_PATH
+        rows = round_trip_check(csv_path, args.kind)
+        print(f"{csv_path}: ida y vuelta con SQLite correcta ({rows})")
+        return
+
+    kind = KINDS[args.kind]
+    table = args.table or kind["table"]
+    engine = get_engine(args.url)
+
+    start = time.perf_counter()
+    if args.command == "load":
+        rows = load_csv(args.path, table, args.url, args.chunksize, replace=not args.append,
+                        dtype=kind["dtype"], **kind["read_csv"])
+        action = f"{args.path} -> {engine.dialect.name}:{table}"
+    else:
+        rows = pull_parquet(table, args.path, args.url, chunksize=args.chunksize, dtype=kind["dtype"])
+        action = f"{engine.dialect.name}:{table} -> {args.path}"
+    seconds = time.perf_counter() - start
+    print(f"{action}: {rows} filas en {seconds:.2f} s ({rows / seconds:,.0f} filas/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+# Snapshot de estadísticas del EDA (sección 6) ------------------------
+# En lugar de calcular notnull().sum() y describe() en cada visita, se
+# guardan una vez por versión de los datos los conteos de valores de cada
+# columna en data/processed/eda_snapshot.json. A partir de esos conteos
+# se reconstruyen exactamente las tablas de info y describe.
+#
+# Los conteos se pueden sumar (ver update_snapshot), pero el snapshot
+# describe df_train y la partición train/test se rehace con cada archivo
+# nuevo: un snapshot con filas sumadas no equivale a rehacerlo con la
+# nueva versión. Por eso --append no lo asocia a ninguna versión del
+# archivo (guarda la versión de la que partió en base_version) y la app
+# lo recalcula en la siguiente visita.
+#
+# Uso:
+#   python src/eda_snapshot.py                      # (re)generar snapshot
+#   python src/eda_snapshot.py --append nuevas.csv  # sumar filas nuevas
+import argparse
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_loader import CLEAN_DATA_PATH, CLEAN_DTYPES, clean_dtypes, dataset_version, get_train_data
+
+# Obtener la ruta absoluta del directorio donde está el script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SNAPSHOT_PATH = os.path.join(BASE_DIR, "../data/processed/eda_snapshot.json")
+
+# Snapshot en memoria: (versión, snapshot)
+_cache = {}
+_lock = threading.Lock()
+
+
+# Cálculo de los conteos ------------------------------------------------
+def _column_counts(series):
+    counts = series.value_counts(dropna=True, sort=False)
+    counts = counts[counts > 0]
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        counts = counts.sort_index()
+        return {
+            "kind": "number",
+            "values": counts.index.to_numpy(dtype=np.float64).tolist(),
+            "counts": counts.to_numpy(dtype=np.int64).tolist(),
+        }
+    return {
+        "kind": "category",
+        "values": [str(value) for value in counts.index],
+        "counts": counts.to_numpy(dtype=np.int64).tolist(),
+    }
+
+
+def compute_snapshot(df, source_version=None, dtypes=None):
+    """Conteos por columna de `df` (estadísticas suficientes del EDA).
+
+    `dtypes` es el tipo a mostrar por columna; por defecto el de `df`.
+    """
+    dtypes = df.dtypes if dtypes is None else dtypes
+    return {
+        "source_version": list(source_version) if source_version else None,
+        "n_rows": len(df),
+        "columns": {
+            col: {
+                "dtype": str(dtypes[col]),
+                "non_null": int(df[col].notnull().sum()),
+                **_column_counts(df[col]),
+            }
+            for col in df.columns
+        },
+    }
+
+
+def _merge_counts(old, new):
+    merged = dict(zip(old["values"], old["counts"]))
+    for value, count in zip(new["values"], new["counts"]):
+        merged[value] = merged.get(value, 0) + count
+    values = sorted(merged) if old["kind"] == "number" else list(merged)
+    return values, [merged[value] for value in values]
+
+
+def update_snapshot(snapshot, new_rows, source_version=None):
+    """Snapshot de (filas anteriores + `new_rows`) sin re-escanear lo anterior."""
+    delta = compute_snapshot(new_rows)
+    columns = {}
+    for col, stats in snapshot["columns"].items():
+        new_stats = delta["columns"].get(col)
+        if new_stats is None:
+            raise ValueError(f"Falta la columna '{col}' en las filas nuevas")
+        values, counts = _merge_counts(stats, new_stats)
+        columns[col] = {
+            **stats,
+            "non_null": stats["non_null"] + new_stats["non_null"],
+            "values": values,
+            "counts": counts,
+        }
+    return {
+        "source_version": list(source_version) if source_version else None,
+        "base_version": snapshot.get("base_version") or snapshot.get("source_version"),
+        "appended_rows": snapshot.get("appended_rows", 0) + delta["n_rows"],
+        "n_rows": snapshot["n_rows"] + delta["n_rows"],
+        "columns": columns,
+    }
+
+
+# Tablas de la sección 6 ------------------------------------------------
+def _quantile(values, cumulative, q):
+    # Interpolación lineal, igual que pandas.describe
+    n = cumulative[-1]
+    position = (n - 1) * q
+    lower = int(np.floor(position))
+    upper = min(lower + 1, n - 1)
+    lower_value = values[np.searchsorted(cumulative, lower, side="right")]
+    upper_value = values[np.searchsorted(cumulative, upper, side="right")]
+    return lower_value + (position - lower) * (upper_value - lower_value)
+
+
+def _numeric_describe(stats):
+    values = np.asarray(stats["values"], dtype=np.float64)
+    counts = np.asarray(stats["counts"], dtype=np.int64)
+    n = counts.sum()
+    cumulative = np.cumsum(counts)
+    mean = (values * counts).sum() / n
+    std = np.sqrt((counts * (values - mean) ** 2).sum() / (n - 1)) if n > 1 else np.nan
+    return {
+        "count": float(n),
+        "mean": mean,
+        "std": std,
+        "min": values[0],
+        "25%": _quantile(values, cumulative, 0.25),
+        "50%": _quantile(values, cumulative, 0.50),
+        "75%": _quantile(values, cumulative, 0.75),
+        "max": values[-1],
+    }
+
+
+def _category_describe(stats):
+    counts = np.asarray(stats["counts"], dtype=np.int64)
+    top = int(np.argmax(counts))
+    return {
+        "count": int(counts.sum()),
+        "unique": len(counts),
+        "top": stats["values"][top],
+        "freq": int(counts[top]),
+    }
+
+
+def snapshot_tables(snapshot):
+    """(info_df, numeric_stats, category_stats) como en la sección 6."""
+    columns = snapshot["columns"]
+    info_df = pd.DataFrame({
+        "Columna": list(columns),
+        "No. Valores No Nulos": [stats["non_null"] for stats in columns.values()],
+        "Tipo de Dato": [stats["dtype"] for stats in columns.values()],
+    })
+    numeric_stats = pd.DataFrame.from_dict({
+        col: _numeric_describe(stats)
+        for col, stats in columns.items() if stats["kind"] == "number"
+    }, orient="index")
+    category_stats = pd.DataFrame.from_dict({
+        col: _category_describe(stats)
+        for col, stats in columns.items() if stats["kind"] == "category"
+    }, orient="index").astype(object)
+    return info_df, numeric_stats, category_stats
+
+
+# Persistencia ----------------------------------------------------------
+def save_snapshot(snapshot, path=SNAPSHOT_PATH):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as snapshot_file:
+        json.dump(snapshot, snapshot_file)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path=SNAPSHOT_PATH):
+    with open(path, encoding="utf-8") as snapshot_file:
+        return json.load(snapshot_file)
+
+
+def build_snapshot(data_path=CLEAN_DATA_PATH, path=SNAPSHOT_PATH):
+    """Calcular el snapshot de df_train y guardarlo."""
+    # Tipos del archivo, no los compactos de la memoria (int8, int16...)
+    snapshot = compute_snapshot(get_train_data(data_path), dataset_version(data_path),
+                                dtypes=clean_dtypes(data_path))
+    save_snapshot(snapshot, path)
+    return snapshot
+
+
+def load_snapshot(data_path=CLEAN_DATA_PATH, path=SNAPSHOT_PATH):
+    """Snapshot vigente: memoria -> disco -> se calcula si está desactualizado."""
+    version = list(dataset_version(data_path))
+    with _lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        snapshot = None
+        if os.path.exists(path):
+            snapshot = read_snapshot(path)
+            if snapshot.get("source_version") != version:
+                snapshot = None
+        if snapshot is None:
+            snapshot = build_snapshot(data_path, path)
+
+        _cache[path] = (version, snapshot)
+        return snapshot
+
+
+def append_rows(new_rows, path=SNAPSHOT_PATH):
+    """Sumar `new_rows` al snapshot guardado, sin recalcular lo anterior.
+
+    El resultado no queda asociado a ninguna versión del archivo de datos
+    (source_version None): load_snapshot lo reemplaza por el de df_train
+    de la versión vigente.
+    """
+    snapshot = update_snapshot(read_snapshot(path), new_rows)
+    save_snapshot(snapshot, path)
+    return snapshot
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Snapshot de estadísticas del EDA.")
+    parser.add_argument("--append", help="CSV (formato df_clean) con filas nuevas a sumar")
+    parser.add_argument("--output", default=SNAPSHOT_PATH, help="Ruta del snapshot")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.append:
+        new_rows = pd.read_csv(args.append, index_col=0, dtype=CLEAN_DTYPES)
+        snapshot = append_rows(new_rows, path=args.output)
+        print(f"Se agregaron {len(new_rows)} filas al snapshot ({snapshot['n_rows']} en total). "
+              "La app lo recalcula con df_train de la versión vigente de los datos.")
+    else:
+        snapshot = build_snapshot(path=args.output)
+        print(f"Snapshot generado con {snapshot['n_rows']} filas: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
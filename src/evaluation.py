@@ -0,0 +1,226 @@
+# Evaluación de los modelos en df_test ---------------------------------
+# Calcula para cada modelo de models/ (archivos *_model.joblib) accuracy,
+# F1 y recall de la clase 1, la matriz de confusión y el recall a varios
+# umbrales. Cada modelo se evalúa con una sola llamada a predict_proba
+# sobre todo df_test y el resultado se memoriza por hash del modelo,
+# versión de los datos, del preprocesamiento y umbral: en memoria para el
+# proceso y en data/interim/evaluation para los siguientes arranques.
+#
+# Las métricas se calculan con el umbral de models/threshold.json para la
+# versión del modelo (el mismo que usa la sección 9); si el umbral se
+# ajustó para otra versión, con 0.5. Los modelos sin archivo en models/
+# se completan con la última búsqueda (models/metrics.json), a 0.5.
+# Si df_test repite filas de df_train (data_loader.check_test_overlap)
+# no se evalúa: la sección 7 muestra entonces la tabla publicada.
+#
+# Uso:
+#   python src/evaluation.py
+import glob
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from joblib import load
+
+from data_loader import CLEAN_DATA_PATH, check_test_overlap, dataset_version, get_test_data
+from feature_encoder import FeatureEncoder
+from preprocessing import PREPROCESSING_PATH, load_preprocessing
+from threshold import DEFAULT_THRESHOLD, load_threshold
+from train import METRIC_COLUMNS, MODELS, MODELS_DIR, read_metrics_table, target_vector
+
+# Obtener la ruta absoluta del directorio donde está el script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+EVALUATION_DIR = os.path.join(BASE_DIR, "../data/interim/evaluation")
+
+THRESHOLDS = np.round(np.arange(0.1, 1.0, 0.1), 2)
+
+# Nombre en la tabla según el archivo del modelo
+MODEL_NAMES = {file_name: name for name, _, file_name in MODELS.values()}
+
+# Columnas de la tabla de la sección 7
+TABLE_COLUMNS = METRIC_COLUMNS + ["Umbral", "Fuente"]
+LIVE_SOURCE = "df_test (en vivo)"
+STORED_SOURCE = "última búsqueda"
+
+# Caché en memoria: {clave: resultado}, {ruta: ((mtime, tamaño), hash)}
+# y {(modelo, preprocesamiento): (firmas, versión)}
+_cache = {}
+_hashes = {}
+_versions = {}
+_lock = threading.Lock()
+
+
+def _file_hash(path):
+    # El hash se recalcula solo si cambian mtime o tamaño
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return "none"
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _hashes.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for block in iter(lambda: source.read(1 << 20), b""):
+            digest.update(block)
+    _hashes[path] = (signature, digest.hexdigest()[:12])
+    return _hashes[path][1]
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def model_version(model_path, preprocessing_path=PREPROCESSING_PATH):
+    """Versión del modelo, con el mismo hash que ModelRegistry."""
+    signatures = (_signature(model_path), _signature(preprocessing_path))
+    cached = _versions.get((model_path, preprocessing_path))
+    if cached is not None and cached[0] == signatures:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    for path in (model_path, preprocessing_path):
+        if os.path.exists(path):
+            with open(path, "rb") as source:
+                for block in iter(lambda: source.read(1 << 20), b""):
+                    digest.update(block)
+    _versions[(model_path, preprocessing_path)] = (signatures, digest.hexdigest()[:12])
+    return _versions[(model_path, preprocessing_path)][1]
+
+
+def model_paths(models_dir=MODELS_DIR):
+    """Modelos disponibles, en el orden de la tabla de la sección 7."""
+    order = {file_name: i for i, file_name in enumerate(MODEL_NAMES)}
+    paths = glob.glob(os.path.join(models_dir, "*_model.joblib"))
+    return sorted(paths, key=lambda path: (order.get(os.path.basename(path), len(order)), path))
+
+
+def recall_at_thresholds(y_true, probability, thresholds=THRESHOLDS):
+    """Recall de la clase 1 para cada umbral (una sola pasada ordenada)."""
+    positives = np.sort(probability[y_true == 1])
+    if len(positives) == 0:
+        return np.zeros(len(thresholds))
+    # Positivos con probabilidad > umbral (misma regla que predict)
+    above = len(positives) - np.searchsorted(positives, thresholds, side="right")
+    return above / len(positives)
+
+
+def compute_metrics(y_true, probability, threshold=0.5):
+    """Métricas de la sección 7 a partir de las probabilidades."""
+    y_pred = probability > threshold
+    tp = int(np.sum(y_pred & (y_true == 1)))
+    fp = int(np.sum(y_pred & (y_true == 0)))
+    fn = int(np.sum(~y_pred & (y_true == 1)))
+    tn = len(y_true) - tp - fp - fn
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    return {
+        "Accuracy": (tp + tn) / len(y_true),
+        "F1-Score (Class 1)": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        "Recall (Class 1)": recall,
+        # [[tn, fp], [fn, tp]], igual que sklearn.metrics.confusion_matrix
+        "confusion_matrix": [[tn, fp], [fn, tp]],
+        "recall_at_thresholds": {
+            f"{threshold:.1f}": recall
+            for threshold, recall in zip(THRESHOLDS, recall_at_thresholds(y_true, probability).tolist())
+        },
+    }
+
+
+def evaluate_model(model_path, data_path=CLEAN_DATA_PATH, preprocessing_path=PREPROCESSING_PATH,
+                   evaluation_dir=EVALUATION_DIR, threshold=None):
+    """Métricas de un modelo en df_test (memorizadas).
+
+    Sin `threshold` se usa el umbral vigente para la versión del modelo.
+    Lanza ValueError si df_test repite filas de df_train.
+    """
+    check_test_overlap(data_path)
+    if threshold is None:
+        threshold = load_threshold(model_version(model_path, preprocessing_path))
+    threshold = float(threshold)
+    key = "_".join([
+        _file_hash(model_path),
+        hashlib.sha256(repr(dataset_version(data_path)).encode("utf-8")).hexdigest()[:12],
+        _file_hash(preprocessing_path),
+        hashlib.sha256(repr(threshold).encode("utf-8")).hexdigest()[:8],
+    ])
+    with _lock:
+        if key in _cache:
+            return _cache[key]
+
+        cache_path = os.path.join(evaluation_dir, f"{key}.json")
+        if os.path.exists(cache_path):
+            with open(cache_path, encoding="utf-8") as cache_file:
+                result = json.load(cache_file)
+        else:
+            model = load(model_path)
+            encoder = FeatureEncoder.from_model(model, load_preprocessing(preprocessing_path))
+            df_test = get_test_data(data_path)
+            probability = model.predict_proba(encoder.transform(df_test, prepared=True))[:, 1]
+
+            file_name = os.path.basename(model_path)
+            result = {
+                "Model": MODEL_NAMES.get(file_name, file_name.replace("_model.joblib", "")),
+                "path": file_name,
+                "Umbral": threshold,
+                **compute_metrics(target_vector(df_test), probability, threshold),
+            }
+            os.makedirs(evaluation_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as cache_file:
+                json.dump(result, cache_file)
+            os.replace(tmp_path, cache_path)
+
+        _cache[key] = result
+        return result
+
+
+def evaluate_models(models_dir=MODELS_DIR, data_path=CLEAN_DATA_PATH):
+    """Resultados de todos los modelos de `models_dir` (lista de dicts)."""
+    return [evaluate_model(path, data_path) for path in model_paths(models_dir)]
+
+
+def evaluation_table(results):
+    """DataFrame Model/Accuracy/F1/Recall/Umbral de los modelos evaluados."""
+    return pd.DataFrame(results, columns=METRIC_COLUMNS + ["Umbral"])
+
+
+def comparison_table(results, stored=None):
+    """Tabla de la sección 7: modelos evaluados en vivo y, para los que no
+    tienen archivo en models/, las métricas guardadas en `stored` (a 0.5).
+    """
+    table = evaluation_table(results).assign(Fuente=LIVE_SOURCE)
+    if stored is not None:
+        missing = stored[~stored["Model"].isin(table["Model"])]
+        missing = missing[METRIC_COLUMNS].assign(Umbral=DEFAULT_THRESHOLD, Fuente=STORED_SOURCE)
+        table = missing if table.empty else pd.concat([table, missing], ignore_index=True)
+
+    # Mismo orden que MODELS (Random Forest, XGBoost, LightGBM)
+    order = {name: i for i, name in enumerate(MODEL_NAMES.values())}
+    table = table.sort_values("Model", key=lambda names: names.map(lambda name: order.get(name, len(order))),
+                              kind="stable")
+    return table.reset_index(drop=True)[TABLE_COLUMNS]
+
+
+def threshold_table(results):
+    """Recall de la clase 1 por umbral (filas) y modelo (columnas)."""
+    return pd.DataFrame({
+        result["Model"]: pd.Series(result["recall_at_thresholds"]) for result in results
+    }).rename_axis("Umbral")
+
+
+if __name__ == "__main__":
+    results = evaluate_models()
+    print(comparison_table(results, read_metrics_table()).to_string(index=False))
+    print()
+    print(threshold_table(results).to_string())
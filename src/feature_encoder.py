@@ -0,0 +1,387 @@
+# Codificación de características para el modelo -----------------------
+# FeatureEncoder reemplaza a preprocess_input_data: calcula una sola vez
+# los vocabularios y el orden de columnas a partir de los nombres de
+# características del booster, y luego codifica N filas de una vez en una
+# matriz float32 contigua.
+# Si existe el JSON de preprocesamiento (preprocessing.py), balance se
+# transforma con el lambda de Yeo-Johnson ajustado en el pipeline.
+import hashlib
+import time
+
+import numpy as np
+import pandas as pd
+
+from preprocessing import yeo_johnson
+
+# Columnas categóricas (One-Hot) en el orden del ColumnTransformer
+CATEGORICAL_FEATURES = {
+    "job": ['admin.', 'blue-collar', 'entrepreneur', 'housemaid', 'management',
+            'retired', 'self-employed', 'services', 'student', 'technician',
+            'unemployed', 'unknown'],
+    "marital": ['divorced', 'married', 'single'],
+    "education": ['primary', 'secondary', 'tertiary', 'unknown'],
+    "default": ['no', 'yes'],
+    "housing": ['no', 'yes'],
+    "loan": ['no', 'yes'],
+    "contact": ['cellular', 'telephone', 'unknown'],
+    "poutcome": ['failure', 'other', 'success', 'unknown'],
+    "quarter": ['Q1', 'Q2', 'Q3', 'Q4'],
+}
+
+# Variables numéricas restantes (remainder del ColumnTransformer)
+NUMERIC_FEATURES = [
+    "age", "day", "duration", "balance_yeojohnson", "campaign_log", "pdays_tran"
+]
+
+# Nombres de salida del ColumnTransformer, en el orden de entrenamiento
+FEATURE_NAMES = [
+    f"cat__{col}_{value}"
+    for col, values in CATEGORICAL_FEATURES.items()
+    for value in values
+] + [f"remainder__{col}" for col in NUMERIC_FEATURES]
+
+# Columnas de entrada (mismo formato que el formulario de predicción)
+INPUT_COLUMNS = list(CATEGORICAL_FEATURES) + NUMERIC_FEATURES
+
+
+# Implementación original ----------------------------------------------
+# Se conserva como referencia para verificar que FeatureEncoder produce
+# exactamente la misma matriz.
+def preprocess_input_data(data):
+    processed_data = pd.DataFrame()
+
+    # Codificar 'job' (One-Hot Encoding manual)
+    job_categories = ['admin.', 'blue-collar', 'entrepreneur', 'housemaid', 'management',
+                    'retired', 'self-employed', 'services', 'student', 'technician',
+                    'unemployed', 'unknown']
+    for job in job_categories:
+        processed_data[f'cat__job_{job}'] = (data['job'] == job).astype(int)
+
+    # Codificar 'marital'
+    marital_categories = ['divorced', 'married', 'single']
+    for marital in marital_categories:
+        processed_data[f'cat__marital_{marital}'] = (data['marital'] == marital).astype(int)
+
+    # Codificar 'education'
+    education_categories = ['primary', 'secondary', 'tertiary', 'unknown']
+    for education in education_categories:
+        processed_data[f'cat__education_{education}'] = (data['education'] == education).astype(int)
+
+    # Codificar 'default'
+    processed_data['cat__default_no'] = (data['default'] == 'no').astype(int)
+    processed_data['cat__default_yes'] = (data['default'] == 'yes').astype(int)
+
+    # Codificar 'housing'
+    processed_data['cat__housing_no'] = (data['housing'] == 'no').astype(int)
+    processed_data['cat__housing_yes'] = (data['housing'] == 'yes').astype(int)
+
+    # Codificar 'loan'
+    processed_data['cat__loan_no'] = (data['loan'] == 'no').astype(int)
+    processed_data['cat__loan_yes'] = (data['loan'] == 'yes').astype(int)
+
+    # Codificar 'contact'
+    contact_categories = ['cellular', 'telephone', 'unknown']
+    for contact in contact_categories:
+        processed_data[f'cat__contact_{contact}'] = (data['contact'] == contact).astype(int)
+
+    # Codificar 'poutcome'
+    poutcome_categories = ['failure', 'other', 'success', 'unknown']
+    for poutcome in poutcome_categories:
+        processed_data[f'cat__poutcome_{poutcome}'] = (data['poutcome'] == poutcome).astype(int)
+
+    # Codificar 'quarter'
+    quarter_categories = ['Q1', 'Q2', 'Q3', 'Q4']
+    for quarter in quarter_categories:
+        processed_data[f'cat__quarter_{quarter}'] = (data['quarter'] == quarter).astype(int)
+
+    # Variables numéricas restantes
+    processed_data['remainder__age'] = data['age']
+    processed_data['remainder__day'] = data['day']
+    processed_data['remainder__duration'] = data['duration']
+    processed_data['remainder__balance_yeojohnson'] = data['balance_yeojohnson'] * -1
+    processed_data['remainder__campaign_log'] = np.log1p(data['campaign_log'])
+
+    # Codificar 'pdays'
+    processed_data['remainder__pdays_tran'] = data['pdays_tran'].apply(lambda x: 0 if x == 'no' else 1).astype(int)
+
+    return processed_data
+
+
+# Transformaciones numéricas aplicadas a la entrada del formulario ------
+# En el formulario las columnas balance_yeojohnson y campaign_log traen
+# los valores originales de balance y campaign, y pdays_tran 'no'/'yes'.
+def _numeric_values(data, col, balance_lambda=None):
+    if col == "balance_yeojohnson":
+        if balance_lambda is None:
+            # Sin parámetros ajustados: transformación original de la app
+            return data[col].to_numpy() * -1
+        return yeo_johnson(data[col].to_numpy(), balance_lambda)
+    if col == "campaign_log":
+        return np.log1p(data[col].to_numpy(dtype=np.float64))
+    if col == "pdays_tran":
+        return data[col].to_numpy() != 'no'
+    return data[col].to_numpy()
+
+
+# Rango de las numéricas contra el booster --------------------------------
+# El booster guarda el mínimo y el máximo de cada columna que vio al
+# entrenar (feature_infos). Si el JSON de preprocesamiento produce otro
+# rango, sus parámetros no son los del entrenamiento. El booster vio solo
+# df_train y el JSON mide todo df_clean: se tolera una diferencia de
+# RANGE_TOLERANCE veces el rango del booster en cada extremo.
+RANGE_TOLERANCE = 0.1
+
+
+def check_feature_ranges(model, preprocessing):
+    """ValueError si `preprocessing` no corresponde a los datos del booster."""
+    if preprocessing is None or not hasattr(model, "booster_"):
+        return
+    if not preprocessing.feature_ranges:
+        raise ValueError(
+            "El JSON de preprocesamiento no tiene feature_ranges y no se puede "
+            "verificar contra el modelo: regenerarlo con src/pipeline.py"
+        )
+    booster_names = model.booster_.feature_name()
+    if len(booster_names) != len(preprocessing.feature_names):
+        return  # from_model informa la diferencia de columnas
+    feature_infos = model.booster_.dump_model()["feature_infos"]
+    for name, (low, high) in preprocessing.feature_ranges.items():
+        if name not in preprocessing.feature_names:
+            continue
+        info = feature_infos.get(booster_names[preprocessing.feature_names.index(name)])
+        if not info or "min_value" not in info:
+            continue
+        margin = RANGE_TOLERANCE * max(info["max_value"] - info["min_value"], 1.0)
+        if abs(low - info["min_value"]) > margin or abs(high - info["max_value"]) > margin:
+            raise ValueError(
+                f"El JSON de preprocesamiento no corresponde al modelo: {name} queda en "
+                f"[{low:.1f}, {high:.1f}] y el modelo se entrenó con "
+                f"[{info['min_value']:.1f}, {info['max_value']:.1f}]"
+            )
+
+
+# Con pocas filas (formulario, API) un dict es más rápido que el hashing
+# vectorizado de pandas, que tiene un costo fijo por llamada.
+SMALL_BATCH_ROWS = 64
+
+
+class FeatureEncoder:
+    """Codificador precompilado a partir de los nombres de características."""
+
+    def __init__(self, feature_names, preprocessing=None):
+        self.feature_names = list(feature_names)
+        self.preprocessing = preprocessing
+        self.balance_lambda = preprocessing.balance_lambda if preprocessing else None
+        # {columna: (categorías, índices de salida)}
+        self.categorical = {}
+        # [(columna, índice de salida)]
+        self.numeric = []
+
+        for position, name in enumerate(self.feature_names):
+            if name.startswith("remainder__"):
+                self.numeric.append((name[len("remainder__"):], position))
+                continue
+            col, value = self._split_categorical(name)
+            values, positions = self.categorical.setdefault(col, ([], []))
+            values.append(value)
+            positions.append(position)
+
+        self.categorical = {
+            col: (pd.Index(values), np.asarray(positions, dtype=np.intp))
+            for col, (values, positions) in self.categorical.items()
+        }
+        self._lookup = {
+            col: {value: code for code, value in enumerate(categories)}
+            for col, (categories, _) in self.categorical.items()
+        }
+
+    @staticmethod
+    def _split_categorical(name):
+        # 'cat__job_self-employed' -> ('job', 'self-employed'). Los valores
+        # pueden contener '_', por eso se busca la columna conocida.
+        if name.startswith("cat__"):
+            rest = name[len("cat__"):]
+            for col in CATEGORICAL_FEATURES:
+                if rest.startswith(col + "_"):
+                    return col, rest[len(col) + 1:]
+        raise ValueError(f"Nombre de característica no reconocido: {name}")
+
+    @classmethod
+    def from_model(cls, model, preprocessing=None):
+        """Crear el codificador a partir de un clasificador entrenado.
+
+        `preprocessing` (FittedPreprocessing) aporta el lambda de balance y
+        el orden de columnas guardados por el pipeline. Lanza ValueError si
+        no corresponde a los datos con que se entrenó el booster.
+        """
+        check_feature_ranges(model, preprocessing)
+        if hasattr(model, "booster_"):
+            names = model.booster_.feature_name()
+        else:
+            # RandomForest / XGBoost (API de scikit-learn)
+            names = list(getattr(
+                model, "feature_names_in_",
+                [f"Column_{i}" for i in range(model.n_features_in_)]
+            ))
+        # El modelo se entrenó con una matriz NumPy, así que LightGBM solo
+        # guardó nombres genéricos (Column_0, ...). En ese caso las columnas
+        # corresponden por posición a la salida del ColumnTransformer.
+        if all(name.startswith("Column_") for name in names):
+            schema = preprocessing.feature_names if preprocessing else FEATURE_NAMES
+            if len(names) != len(schema):
+                raise ValueError(
+                    f"El modelo espera {len(names)} características, "
+                    f"el esquema define {len(schema)}"
+                )
+            names = schema
+        return cls(names, preprocessing)
+
+    def transform(self, data, prepared=False):
+        """Codificar un DataFrame de entrada en una matriz float32 (N, F).
+
+        Con `prepared=True` las columnas numéricas ya vienen transformadas
+        (formato df_clean) y se copian sin cambios.
+        """
+        n_rows = len(data)
+        matrix = np.zeros((n_rows, len(self.feature_names)), dtype=np.float32)
+        rows = np.arange(n_rows)
+
+        # One-Hot: códigos de categoría -> columna de salida. Los valores
+        # fuera del vocabulario (código -1) quedan en cero.
+        for col, (categories, positions) in self.categorical.items():
+            values = data[col].to_numpy()
+            if n_rows <= SMALL_BATCH_ROWS:
+                lookup = self._lookup[col]
+                codes = np.fromiter(
+                    (lookup.get(value, -1) for value in values), np.intp, n_rows
+                )
+            else:
+                codes = categories.get_indexer(values)
+            known = codes >= 0
+            matrix[rows[known], positions[codes[known]]] = 1
+
+        for col, position in self.numeric:
+            if prepared:
+                matrix[:, position] = data[col].to_numpy()
+            else:
+                matrix[:, position] = _numeric_values(data, col, self.balance_lambda)
+
+        return matrix
+
+
+def row_hashes(matrix):
+    """Hash (16 hex) de cada fila codificada: identifica la entrada del modelo."""
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    return [hashlib.blake2b(row.tobytes(), digest_size=8).hexdigest() for row in matrix]
+
+
+# Validación de la entrada ---------------------------------------------
+# transform no revisa tipos: un texto en una columna numérica hace fallar
+# todo el lote y un 0/1 en pdays_tran del formulario se codifica como 1.
+# validate_input revisa cada columna antes de codificar.
+#   form       formulario y API: balance y campaign originales en
+#              balance_yeojohnson y campaign_log, pdays_tran 'no'/'yes'
+#   processed  formato df_clean: valores ya transformados, pdays_tran 0/1
+INPUT_FORMATS = ("form", "processed")
+FORM_FLAG_VALUES = ("no", "yes")
+
+
+def _all_strings(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return (not series.isna().any()
+                and pd.api.types.infer_dtype(series.cat.categories, skipna=False) in ("string", "empty"))
+    return pd.api.types.infer_dtype(series, skipna=False) in ("string", "empty")
+
+
+def validate_input(data, input_format="form"):
+    """`data[INPUT_COLUMNS]` con las numéricas convertidas a número.
+
+    Lanza ValueError con todas las columnas que no tienen el tipo o los
+    valores esperados para `input_format` ('form' o 'processed').
+    """
+    if input_format not in INPUT_FORMATS:
+        raise ValueError(f"Formato desconocido: {input_format}")
+    missing = [col for col in INPUT_COLUMNS if col not in data.columns]
+    if missing:
+        raise ValueError(f"Faltan columnas: {', '.join(missing)}")
+    data = data[INPUT_COLUMNS]
+
+    errors = []
+    converted = {}
+    for col in CATEGORICAL_FEATURES:
+        if not _all_strings(data[col]):
+            errors.append(f"{col}: se esperaban textos")
+    for col in NUMERIC_FEATURES:
+        series = data[col]
+        if col == "pdays_tran" and input_format == "form":
+            if not series.isin(FORM_FLAG_VALUES).all():
+                errors.append("pdays_tran: se esperaba 'no' o 'yes' (¿datos ya procesados?)")
+            continue
+        values = pd.to_numeric(series, errors="coerce")
+        invalid = ~np.isfinite(values.to_numpy(dtype=np.float64, na_value=np.nan))
+        if invalid.any():
+            errors.append(f"{col}: {int(invalid.sum())} valores no numéricos "
+                          f"(p. ej. {series[invalid].iloc[0]!r})")
+        elif col == "pdays_tran" and not values.isin((0, 1)).all():
+            errors.append("pdays_tran: se esperaba 0 o 1")
+        elif values.dtype != series.dtype:
+            converted[col] = values
+    if errors:
+        raise ValueError("Entrada inválida: " + "; ".join(errors))
+    return data.assign(**converted) if converted else data
+
+
+# Datos de ejemplo y benchmark ------------------------------------------
+def make_sample_input(n_rows, seed=42):
+    """DataFrame sintético con el formato del formulario de predicción."""
+    rng = np.random.default_rng(seed)
+    data = {
+        col: rng.choice(values + ["unknow"], size=n_rows)
+        for col, values in CATEGORICAL_FEATURES.items()
+    }
+    data.update({
+        "age": rng.integers(18, 71, size=n_rows),
+        "day": rng.integers(1, 32, size=n_rows),
+        "duration": rng.integers(0, 4919, size=n_rows),
+        "balance_yeojohnson": rng.integers(0, 3001, size=n_rows),
+        "campaign_log": rng.integers(0, 61, size=n_rows),
+        "pdays_tran": rng.choice(["no", "yes"], size=n_rows),
+    })
+    return pd.DataFrame(data)
+
+
+def _best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(sizes=(1, 1_000, 1_000_000)):
+    """Comparar preprocess_input_data contra FeatureEncoder."""
+    encoder = FeatureEncoder(FEATURE_NAMES)
+    results = []
+    for n_rows in sizes:
+        data = make_sample_input(n_rows)
+
+        # Salida idéntica bit a bit
+        expected = preprocess_input_data(data).to_numpy(dtype=np.float32)
+        if not np.array_equal(expected, encoder.transform(data)):
+            raise AssertionError(f"Salida distinta para {n_rows} filas")
+
+        repeat = 3 if n_rows >= 1_000_000 else 20
+        legacy = _best_time(lambda: preprocess_input_data(data), repeat)
+        encoded = _best_time(lambda: encoder.transform(data), repeat)
+        results.append({
+            "rows": n_rows,
+            "preprocess_input_data_s": legacy,
+            "feature_encoder_s": encoded,
+            "speedup": legacy / encoded,
+        })
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    print(benchmark().to_string(index=False))
@@ -0,0 +1,247 @@
+# Gráficos de las secciones "1." y "5. Hallazgos Clave" ----------------
+# Cada figura se construye una sola vez por versión de los datos y los
+# datos se agregan en el servidor (conteos por bin, estadísticas del
+# boxplot), así al navegador solo viajan unos pocos KB en lugar de la
+# columna completa de ~45k filas.
+import threading
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from data_loader import (
+    CLEAN_DATA_PATH,
+    RAW_DATA_PATH,
+    dataset_version,
+    load_clean_data,
+    load_raw_data
+)
+
+# Caché: {nombre: (versiones de los datos, figura)}
+_cache = {}
+_lock = threading.Lock()
+
+
+def _cached(name, paths, build):
+    # La figura se reconstruye solo si alguno de los archivos cambió
+    versions = tuple(dataset_version(path) for path in paths)
+    with _lock:
+        cached = _cache.get(name)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+        figure = build()
+        _cache[name] = (versions, figure)
+        return figure
+
+
+def clear_cache():
+    """Vaciar la caché de figuras."""
+    with _lock:
+        _cache.clear()
+
+
+# Agregaciones en el servidor -------------------------------------------
+def histogram_counts(values, nbins=30):
+    """DataFrame (centro del bin, conteo) y ancho del bin."""
+    counts, edges = np.histogram(np.asarray(values, dtype=np.float64), bins=nbins)
+    centers = (edges[:-1] + edges[1:]) / 2
+    return pd.DataFrame({"bin": centers, "count": counts}), edges[1] - edges[0]
+
+
+def box_statistics(values):
+    """Cuartiles, bigotes (regla 1.5 IQR) y outliers únicos."""
+    values = np.asarray(values, dtype=np.float64)
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    lowerfence, upperfence = inside.min(), inside.max()
+    outliers = np.unique(values[(values < lowerfence) | (values > upperfence)])
+    return {
+        "q1": q1, "median": median, "q3": q3,
+        "lowerfence": lowerfence, "upperfence": upperfence,
+        "outliers": outliers,
+    }
+
+
+def _histogram_figure(values, title, label, color, nbins=30):
+    bins, width = histogram_counts(values, nbins)
+    fig = px.bar(
+        bins,
+        x="bin",
+        y="count",
+        title=title,
+        labels={"bin": label},
+        color_discrete_sequence=[color],
+        template="plotly_white"
+    )
+    fig.update_traces(width=width)
+    fig.update_layout(title_x=0, bargap=0)
+    return fig
+
+
+# Sección 1 ----------------------------------------------------------------
+def target_pie():
+    """Distribución de la variable objetivo (df_raw['y'])."""
+    def build():
+        # Conteo de valores de la variable objetivo
+        target_counts = load_raw_data(columns=['y'])['y'].value_counts().reset_index()
+        target_counts.columns = ['Target', 'Count']
+
+        # Crear el gráfico interactivo con Plotly
+        fig = px.pie(
+            target_counts,
+            names='Target',
+            values='Count',
+            title='Distribución de la Variable Objetivo',
+            color_discrete_map={'no': '#FF6F61', 'yes': '#6A89CC'}  # Mapear colores
+        )
+
+        # Ajustar tamaño de las fuentes
+        fig.update_traces(textinfo='percent+label', textfont_size=12)
+        return fig
+
+    return _cached("target_pie", [RAW_DATA_PATH], build)
+
+
+# Sección 5 ----------------------------------------------------------------
+def age_boxplot():
+    """Boxplot de edad con estadísticas precalculadas."""
+    def build():
+        stats = box_statistics(load_raw_data(columns=['age'])['age'])
+
+        fig = go.Figure([
+            go.Box(
+                q1=[stats["q1"]], median=[stats["median"]], q3=[stats["q3"]],
+                lowerfence=[stats["lowerfence"]], upperfence=[stats["upperfence"]],
+                y=[0], orientation="h", name="",
+                marker_color="#636EFA"
+            ),
+            # Outliers como puntos (valores únicos)
+            go.Scatter(
+                x=stats["outliers"], y=np.zeros(len(stats["outliers"])),
+                mode="markers", name="", showlegend=False,
+                marker_color="#636EFA"
+            ),
+        ])
+
+        # Añadir anotaciones narrativas
+        fig.update_layout(
+            template="plotly_white",  # Tema visual limpio
+            title="Distribución de Edad de los Clientes",
+            showlegend=False,
+            xaxis=dict(
+                title="Edad de los Clientes",
+                title_standoff=20  # Separación del título del eje X
+            ),
+            yaxis=dict(title="", showticklabels=False),  # Eliminar etiquetas del eje Y
+            annotations=[
+                dict(
+                    x=0.5, y=-0.3, xref="paper", yref="paper", showarrow=False,
+                    text="Los outliers representan edades que se desvían significativamente del rango típico."
+                )
+            ],
+            height=400,  # Ajustar altura del gráfico
+            title_x=0  # Centrar el título
+        )
+        return fig
+
+    return _cached("age_boxplot", [RAW_DATA_PATH], build)
+
+
+def balance_histograms():
+    """(original, Yeo-Johnson) de balance."""
+    def build():
+        fig_original = _histogram_figure(
+            load_raw_data(columns=['balance'])['balance'],
+            "Distribución Original", "Balance", "blue"
+        )
+        fig_transformed = _histogram_figure(
+            load_clean_data(columns=['balance_yeojohnson'])['balance_yeojohnson'],
+            "Distribución Transformada (Yeo-Johnson)",
+            "Balance Transformado (Yeo-Johnson)", "orange"
+        )
+        return fig_original, fig_transformed
+
+    return _cached("balance_histograms", [RAW_DATA_PATH, CLEAN_DATA_PATH], build)
+
+
+def campaign_histograms():
+    """(original, log) de campaign."""
+    def build():
+        fig_original = _histogram_figure(
+            load_raw_data(columns=['campaign'])['campaign'],
+            "Distribución Original de Campaign", "Número de Campañas", "blue"
+        )
+        fig_log_transform = _histogram_figure(
+            load_clean_data(columns=['campaign_log'])['campaign_log'],
+            "Distribución Transformada (Log-Transform)",
+            "Log Transform de Campañas", "green"
+        )
+        return fig_original, fig_log_transform
+
+    return _cached("campaign_histograms", [RAW_DATA_PATH, CLEAN_DATA_PATH], build)
+
+
+def quarter_histogram():
+    """Conteo por trimestre."""
+    def build():
+        quarters = load_clean_data(columns=['quarter'])['quarter']
+        quarter_counts = quarters.value_counts(sort=False).sort_index().reset_index()
+        quarter_counts.columns = ['quarter', 'count']
+
+        fig = px.bar(
+            quarter_counts,
+            x='quarter',
+            y='count',
+            title="Distribución de Trimestres",
+            labels={'quarter': 'Trimestre'},  # Etiqueta personalizada para el eje X
+            color_discrete_sequence=['#636EFA'],  # Color del gráfico
+            template='plotly_white',  # Tema visual limpio
+            text_auto=True  # Mostrar conteos encima de las barras
+        )
+
+        # Personalizar el diseño
+        fig.update_layout(
+            title_x=0,  # Título alineado a la izquierda
+            xaxis_title="Trimestre",  # Etiqueta del eje X
+            yaxis_title="Conteo",  # Etiqueta del eje Y
+            bargap=0.2  # Espacio entre barras
+        )
+        return fig
+
+    return _cached("quarter_histogram", [CLEAN_DATA_PATH], build)
+
+
+def pdays_bar():
+    """Contactados vs no contactados (pdays_tran)."""
+    def build():
+        # Preparar los datos para el gráfico
+        pdays = load_clean_data(columns=['pdays_tran'])['pdays_tran']
+        contact_counts = pdays.value_counts().reset_index()
+        contact_counts.columns = ['Contactado', 'Frecuencia']
+
+        # Crear el gráfico de barras usando Plotly Express
+        fig = px.bar(
+            contact_counts,
+            x='Contactado',
+            y='Frecuencia',
+            title='Distribución de Contactados y No Contactados',
+            labels={'Contactado': 'Contactado (1) o No Contactado (0)', 'Frecuencia': 'Frecuencia'},  # Etiquetas personalizadas
+            template='plotly_white',  # Tema visual limpio
+            color_discrete_sequence=['blue', 'red']
+        )
+
+        # Personalizar el diseño
+        fig.update_layout(
+            title_x=0,  # Título alineado a la izquierda
+            xaxis=dict(
+                tickmode='array',
+                tickvals=[0, 1],
+                ticktext=['No Contactado (0)', 'Contactado (1)']  # Etiquetas personalizadas para el eje X
+            ),
+            bargap=0.2  # Espacio entre las barras
+        )
+        return fig
+
+    return _cached("pdays_bar", [CLEAN_DATA_PATH], build)
@@ -0,0 +1,127 @@
+# Representación compacta de los DataFrames -----------------------------
+# df_raw y df_clean quedan en memoria durante toda la vida del proceso de
+# Streamlit, así que cada byte por fila cuenta. compact_frame reduce cada
+# columna al tipo más chico que conserva exactamente los valores:
+#
+# - enteros (y el índice) al menor entero que cubre su rango (age -> int8,
+#   duration -> int16, balance -> int32);
+# - flotantes a float32 solo si el redondeo no cambia ningún valor (o
+#   siempre, con downcast_floats=True);
+# - strings a category cuando se repiten (los datasets del banco ya llegan
+#   como categóricas desde el Parquet).
+#
+# Los rangos se calculan con los datos leídos, no se fijan en
+# RAW_DTYPES/CLEAN_DTYPES: un archivo nuevo con valores más grandes
+# nunca se trunca.
+#
+# Uso (informe de memoria por columna, antes y después):
+#   python src/frame_memory.py
+#   python src/frame_memory.py --downcast-floats
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Proporción máxima de valores distintos para pasar un string a category
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def _smallest_integer(series):
+    # Siempre con signo: restar dos columnas no debe dar la vuelta
+    if series.empty or series.hasnans:
+        return series
+    return pd.to_numeric(series, downcast="signed")
+
+
+def _smallest_float(series, force):
+    if series.dtype == np.float32:
+        return series
+    compact = series.astype(np.float32)
+    if force or np.array_equal(compact.to_numpy(np.float64), series.to_numpy(), equal_nan=True):
+        return compact
+    return series
+
+
+def _compact_index(index):
+    if isinstance(index, pd.RangeIndex) or not pd.api.types.is_integer_dtype(index.dtype):
+        return index
+    values = pd.to_numeric(index.to_numpy(), downcast="signed")
+    return pd.Index(values, name=index.name)
+
+
+def compact_frame(df, downcast_floats=False):
+    """`df` con cada columna en el tipo más chico sin perder valores.
+
+    Modifica `df` en el lugar (no hay una copia completa en ningún
+    momento) y lo devuelve.
+    """
+    for col in df.columns:
+        series = df[col]
+        dtype = series.dtype
+        if pd.api.types.is_bool_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_integer_dtype(dtype):
+            compact = _smallest_integer(series)
+        elif pd.api.types.is_float_dtype(dtype):
+            compact = _smallest_float(series, downcast_floats)
+        elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            n_unique = series.nunique(dropna=True)
+            if n_unique > CATEGORY_MAX_UNIQUE_RATIO * max(len(series), 1):
+                continue
+            compact = series.astype("category")
+        else:
+            continue
+        if compact is not series:
+            df[col] = compact
+    df.index = _compact_index(df.index)
+    return df
+
+
+# Informe de memoria ------------------------------------------------------
+def memory_by_column(df):
+    """Bytes por columna (con strings y categorías), índice incluido."""
+    return df.memory_usage(index=True, deep=True)
+
+
+def memory_report(before, after):
+    """Tabla de tipo y memoria por columna antes/después, con el total."""
+    dtypes_before = before.dtypes.astype(str)
+    dtypes_after = after.dtypes.astype(str)
+    report = pd.DataFrame({
+        "dtype_before": pd.concat([pd.Series({"Index": str(before.index.dtype)}), dtypes_before]),
+        "dtype_after": pd.concat([pd.Series({"Index": str(after.index.dtype)}), dtypes_after]),
+        "kb_before": memory_by_column(before) / 1024,
+        "kb_after": memory_by_column(after) / 1024,
+    })
+    total = report[["kb_before", "kb_after"]].sum()
+    report.loc["Total"] = ["", "", total["kb_before"], total["kb_after"]]
+    report["saved_pct"] = (100 * (1 - report["kb_after"] / report["kb_before"])).round(1)
+    return report.round({"kb_before": 1, "kb_after": 1})
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Memoria de df_raw y df_clean antes y después de compactar.")
+    parser.add_argument("--downcast-floats", action="store_true",
+                        help="Pasar también a float32 los flotantes que pierden precisión")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    import storage
+    from data_loader import CLEAN_DATA_PATH, CLEAN_DTYPES, RAW_DATA_PATH, RAW_DTYPES
+
+    args = parse_args(argv)
+    datasets = {
+        "df_raw": storage.ensure_parquet(RAW_DATA_PATH, sep=";", dtype=RAW_DTYPES),
+        "df_clean": storage.ensure_parquet(CLEAN_DATA_PATH, index_col=0, dtype=CLEAN_DTYPES),
+    }
+    with pd.option_context("display.width", 120, "display.max_columns", 10):
+        for name, parquet_path in datasets.items():
+            before = storage.read_parquet(parquet_path)
+            after = compact_frame(before.copy(), downcast_floats=args.downcast_floats)
+            print(f"\n{name} ({len(before)} filas)")
+            print(memory_report(before, after).to_string())
+
+
+if __name__ == "__main__":
+    main()
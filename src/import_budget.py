@@ -0,0 +1,139 @@
+# Presupuesto de arranque de la app -------------------------------------
+# Mide con `python -X importtime` cuánto cuesta importar lo que carga
+# fp_ds_bank.py al arrancar y, por separado, lo que agrega cada sección
+# de src/sections/ la primera vez que se muestra. Cada medición corre en
+# un proceso nuevo (sin módulos ya importados) y se toma la mejor de
+# --repeat corridas.
+#
+# Con --render también mide la primera pantalla ("Inicio") con AppTest
+# en un proceso nuevo. Sale con código 1 si se supera un presupuesto, así
+# que sirve como chequeo antes de publicar cambios:
+#   python src/import_budget.py
+#   python src/import_budget.py --render --startup-budget-ms 1500
+import argparse
+import os
+import subprocess
+import sys
+
+from sections import SECTIONS
+
+# Obtener la ruta absoluta del directorio donde está el script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+APP_PATH = os.path.join(BASE_DIR, "fp_ds_bank.py")
+
+# Lo que importa fp_ds_bank.py antes de mostrar una sección
+STARTUP_IMPORTS = "import streamlit, profiling, sections, sections.common"
+
+DEFAULT_STARTUP_BUDGET_MS = 1_500
+DEFAULT_PAINT_BUDGET_MS = 3_000
+DEFAULT_REPEAT = 3
+MARK = "import-budget-mark"
+
+
+def _run_python(args):
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([BASE_DIR, os.environ.get("PYTHONPATH", "")])}
+    return subprocess.run(
+        [sys.executable, *args], cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def parse_importtime(stderr):
+    """{módulo: (self_us, cumulative_us)} de la salida de -X importtime.
+
+    Si la salida tiene la marca MARK, solo cuenta lo importado después.
+    """
+    lines = stderr.splitlines()
+    if MARK in lines:
+        lines = lines[lines.index(MARK) + 1:]
+    modules = {}
+    for line in lines:
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def import_cost(statement, before=None, repeat=DEFAULT_REPEAT):
+    """(ms totales, módulos) de `statement` en un proceso nuevo.
+
+    `before` se importa primero y no se cuenta (p. ej. el arranque de la
+    app para medir solo lo que agrega una sección).
+    """
+    code = statement
+    if before:
+        code = f"{before}\nimport sys\nsys.stderr.write('{MARK}\\n')\n{statement}"
+    best = None
+    for _ in range(repeat):
+        modules = parse_importtime(_run_python(["-X", "importtime", "-c", code]).stderr)
+        total_ms = sum(self_us for self_us, _ in modules.values()) / 1000
+        if best is None or total_ms < best[0]:
+            best = (total_ms, modules)
+    return best
+
+
+def top_level(modules, top=5):
+    """Los paquetes de primer nivel más caros (ms, suma de self)."""
+    packages = {}
+    for name, (self_us, _) in modules.items():
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us / 1000
+    return sorted(packages.items(), key=lambda item: -item[1])[:top]
+
+
+def first_paint_ms(repeat=DEFAULT_REPEAT):
+    """Tiempo (ms) de importar y mostrar "Inicio" con AppTest, en frío."""
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "from streamlit.testing.v1 import AppTest\n"
+        f"app = AppTest.from_file({APP_PATH!r}, default_timeout=300).run()\n"
+        "assert not app.exception, app.exception\n"
+        "print((time.perf_counter() - start) * 1000)\n"
+    )
+    return min(float(_run_python(["-c", code]).stdout.split()[-1]) for _ in range(repeat))
+
+
+def _format_top(modules, top):
+    return ", ".join(f"{name} {ms:.0f}" for name, ms in top_level(modules, top))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tiempo de importación al arrancar la app.")
+    parser.add_argument("--startup-budget-ms", type=float, default=DEFAULT_STARTUP_BUDGET_MS)
+    parser.add_argument("--render", action="store_true", help="Medir también la primera pantalla")
+    parser.add_argument("--paint-budget-ms", type=float, default=DEFAULT_PAINT_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--top", type=int, default=5, help="Paquetes más caros a mostrar")
+    parser.add_argument("--startup", default=STARTUP_IMPORTS, help="Imports del arranque a medir")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    failed = False
+
+    startup_ms, modules = import_cost(args.startup, repeat=args.repeat)
+    status = "ok" if startup_ms <= args.startup_budget_ms else "EXCEDIDO"
+    failed |= status != "ok"
+    print(f"Arranque: {startup_ms:8.0f} ms (presupuesto {args.startup_budget_ms:.0f} ms) {status}")
+    print(f"  {_format_top(modules, args.top)}")
+
+    print("Primera importación de cada sección:")
+    for label, module in SECTIONS.items():
+        section_ms, modules = import_cost(f"import sections.{module}", args.startup, args.repeat)
+        print(f"  {label:45s} {section_ms:8.0f} ms  {_format_top(modules, 3)}")
+
+    if args.render:
+        paint_ms = first_paint_ms(args.repeat)
+        status = "ok" if paint_ms <= args.paint_budget_ms else "EXCEDIDO"
+        failed |= status != "ok"
+        print(f"Primera pantalla (Inicio): {paint_ms:8.0f} ms (presupuesto {args.paint_budget_ms:.0f} ms) {status}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
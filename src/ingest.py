@@ -0,0 +1,187 @@
+# Ingesta por bloques para archivos más grandes que la RAM -------------
+# Lee el CSV por bloques tipados cuyo tamaño se calcula a partir de un
+# presupuesto de memoria, aplica la limpieza bloque a bloque y escribe un
+# directorio de Parquet particionado (un archivo por bloque, opcionalmente
+# en subdirectorios hive "columna=valor"). El resultado se lee con
+# pd.read_parquet(directorio).
+#
+# Formatos de entrada:
+#   raw        bank-full.csv (separado por ';'): se aplican los pasos del
+#              pipeline y Yeo-Johnson con el lambda guardado junto al modelo
+#   processed  df_clean_bank.csv (separado por ','): solo se tipa
+#
+# Uso:
+#   python src/ingest.py exportacion.csv salida/ --memory-mb 256
+#   python src/ingest.py exportacion.csv salida/ --partition-by quarter
+import argparse
+import os
+import time
+
+import pandas as pd
+
+from data_loader import CLEAN_DTYPES, RAW_DTYPES
+from pipeline import apply_row_steps, finalize
+from preprocessing import PREPROCESSING_PATH, load_preprocessing
+
+DEFAULT_MEMORY_MB = 256
+
+# Filas leídas para estimar los bytes por fila
+SAMPLE_ROWS = 1_000
+
+# Copias simultáneas de un bloque: strings del parser, DataFrame tipado,
+# DataFrame limpio y la tabla Arrow al escribir
+MEMORY_OVERHEAD = 3
+
+MIN_CHUNK_ROWS = 1_000
+
+FORMATS = {
+    "raw": {"sep": ";", "dtypes": RAW_DTYPES, "index_col": None},
+    "processed": {"sep": ",", "dtypes": CLEAN_DTYPES, "index_col": 0},
+}
+
+
+def detect_format(path):
+    """'raw' o 'processed' según la cabecera del CSV."""
+    with open(path, encoding="utf-8") as csv_file:
+        header = csv_file.readline()
+    if "balance_yeojohnson" in header:
+        return "processed"
+    if ";" in header:
+        return "raw"
+    raise ValueError(f"Formato no reconocido: {path}")
+
+
+def _read_csv(path, input_format, **kwargs):
+    spec = FORMATS[input_format]
+    return pd.read_csv(
+        path, sep=spec["sep"], dtype=spec["dtypes"], index_col=spec["index_col"], **kwargs
+    )
+
+
+def chunk_rows_for_budget(path, input_format, memory_mb=DEFAULT_MEMORY_MB):
+    """Filas por bloque para que el pico de memoria quede dentro de `memory_mb`."""
+    # Antes de convertir a category el parser crea un string por celda,
+    # así que se mide el bloque con las columnas de texto como object
+    spec = FORMATS[input_format]
+    sample = pd.read_csv(path, sep=spec["sep"], index_col=spec["index_col"], nrows=SAMPLE_ROWS)
+    if sample.empty:
+        return MIN_CHUNK_ROWS
+    bytes_per_row = sample.memory_usage(deep=True).sum() / len(sample)
+    rows = int(memory_mb * 1024 ** 2 / (bytes_per_row * MEMORY_OVERHEAD))
+    return max(MIN_CHUNK_ROWS, rows)
+
+
+def iter_typed_chunks(path, input_format=None, memory_mb=DEFAULT_MEMORY_MB, chunksize=None):
+    """Generador de bloques tipados del CSV (crudo o procesado)."""
+    input_format = input_format or detect_format(path)
+    chunksize = chunksize or chunk_rows_for_budget(path, input_format, memory_mb)
+    with _read_csv(path, input_format, chunksize=chunksize) as reader:
+        start = 0
+        for chunk in reader:
+            if FORMATS[input_format]["index_col"] is None:
+                # Número de fila del archivo completo, como en el pipeline
+                chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            yield chunk
+
+
+def clean_chunk(chunk, input_format, balance_lambda=None):
+    """Bloque en formato df_clean (con tipos de CLEAN_DTYPES)."""
+    if input_format == "raw":
+        chunk = finalize(apply_row_steps(chunk), balance_lambda)
+    return chunk.astype({col: dtype for col, dtype in CLEAN_DTYPES.items() if col in chunk.columns})
+
+
+def _write_partition(df, output_dir, part, partition_by=None):
+    if partition_by is None:
+        groups = [("", df)]
+    else:
+        groups = [
+            (f"{partition_by}={value}", group.drop(columns=partition_by))
+            for value, group in df.groupby(partition_by, observed=True, sort=False)
+        ]
+    for subdir, group in groups:
+        directory = os.path.join(output_dir, subdir)
+        os.makedirs(directory, exist_ok=True)
+        group.to_parquet(os.path.join(directory, f"part-{part:05d}.parquet"), compression="snappy")
+
+
+def _remove_previous_parts(output_dir):
+    # Solo lo que escribe la ingesta: part-*.parquet y los subdirectorios
+    # "columna=valor" que queden vacíos. Cualquier otro archivo se conserva.
+    for directory, subdirs, files in os.walk(output_dir, topdown=False):
+        for name in files:
+            if name.startswith("part-") and name.endswith(".parquet"):
+                os.remove(os.path.join(directory, name))
+        if directory != output_dir and "=" in os.path.basename(directory) and not os.listdir(directory):
+            os.rmdir(directory)
+
+
+def ingest(input_path, output_dir, input_format=None, memory_mb=DEFAULT_MEMORY_MB,
+           chunksize=None, partition_by=None, preprocessing_path=PREPROCESSING_PATH,
+           overwrite=False):
+    """Limpiar `input_path` por bloques y escribirlo en `output_dir`.
+
+    Devuelve (filas leídas, filas escritas, bloques). Si `output_dir` ya
+    tiene archivos se lanza FileExistsError, salvo con `overwrite=True`:
+    entonces se borran solo los part-*.parquet de una ingesta anterior.
+    """
+    input_format = input_format or detect_format(input_path)
+    balance_lambda = None
+    if input_format == "raw":
+        # Un lambda global no se puede ajustar viendo un bloque a la vez:
+        # se usa el guardado por el pipeline
+        preprocessing = load_preprocessing(preprocessing_path)
+        if preprocessing is None:
+            raise FileNotFoundError(
+                f"No se encontró {preprocessing_path}; ejecuta primero src/pipeline.py"
+            )
+        balance_lambda = preprocessing.balance_lambda
+
+    if os.path.isdir(output_dir) and os.listdir(output_dir):
+        if not overwrite:
+            raise FileExistsError(
+                f"{output_dir} no está vacío; usa --overwrite para reemplazar una ingesta anterior"
+            )
+        _remove_previous_parts(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    rows_read = rows_written = parts = 0
+    for chunk in iter_typed_chunks(input_path, input_format, memory_mb, chunksize):
+        rows_read += len(chunk)
+        cleaned = clean_chunk(chunk, input_format, balance_lambda)
+        _write_partition(cleaned, output_dir, parts, partition_by)
+        rows_written += len(cleaned)
+        parts += 1
+    return rows_read, rows_written, parts
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ingesta por bloques a Parquet particionado.")
+    parser.add_argument("input", help="CSV crudo (';') o procesado (',')")
+    parser.add_argument("output", help="Directorio de salida")
+    parser.add_argument("--format", choices=sorted(FORMATS), help="Formato de entrada (por defecto se detecta)")
+    parser.add_argument("--memory-mb", type=float, default=DEFAULT_MEMORY_MB,
+                        help="Presupuesto de memoria por bloque")
+    parser.add_argument("--chunksize", type=int, help="Filas por bloque (ignora --memory-mb)")
+    parser.add_argument("--partition-by", choices=["quarter", "y"],
+                        help="Columna para particionar la salida")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Reemplazar los part-*.parquet de una ingesta anterior en el directorio")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    rows_read, rows_written, parts = ingest(
+        args.input, args.output, args.format, args.memory_mb,
+        args.chunksize, args.partition_by, overwrite=args.overwrite
+    )
+    seconds = time.perf_counter() - start
+    print(f"{rows_read} filas leídas, {rows_written} escritas en {parts} bloques ({seconds:.2f} s)")
+    print(f"Resultados guardados en: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
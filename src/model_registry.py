@@ -0,0 +1,116 @@
+# Registro del modelo --------------------------------------------------
+# Carga el modelo joblib una sola vez por proceso y conserva los bytes
+# serializados para el botón de descarga. En cada acceso solo se hace un
+# os.stat del archivo; si mtime o tamaño cambian se lee de nuevo y, si el
+# hash también cambió, se recarga el modelo (hot reload).
+# Lo mismo vale para el JSON de preprocesamiento que acompaña al modelo:
+# si cambia, se reconstruye el FeatureEncoder.
+# Para los modelos LightGBM también se arma el ArrayTreePredictor, que
+# puntúa una fila ya codificada sin pasar por el wrapper de scikit-learn.
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import namedtuple
+
+from joblib import load
+
+from feature_encoder import FeatureEncoder
+from preprocessing import PREPROCESSING_PATH, FittedPreprocessing
+from tree_predictor import ArrayTreePredictor
+
+# Obtener la ruta absoluta del directorio donde está el script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MODEL_PATH = os.path.join(BASE_DIR, "../models/bank_marketing_lgbm_model.joblib")
+
+# Modelo cargado: el estimador, su codificador, los bytes del archivo,
+# la versión (prefijo del sha256 del modelo y del preprocesamiento) y el
+# predictor de una fila (None si el modelo no es un LightGBM binario)
+LoadedModel = namedtuple(
+    "LoadedModel", ["model", "encoder", "data", "version", "path", "predictor"]
+)
+
+
+def file_signature(path):
+    """(mtime, tamaño) del archivo: detecta cambios sin leerlo."""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _row_predictor(model):
+    if not hasattr(model, "booster_"):
+        return None
+    try:
+        return ArrayTreePredictor.from_booster(model)
+    except ValueError:
+        return None
+
+
+def _optional_signature(path):
+    try:
+        return file_signature(path)
+    except FileNotFoundError:
+        return None
+
+
+class ModelRegistry:
+    """Modelo compartido por todo el proceso, con recarga si cambia en disco."""
+
+    def __init__(self, path=MODEL_PATH, preprocessing_path=PREPROCESSING_PATH):
+        self.path = os.path.abspath(path)
+        self.preprocessing_path = os.path.abspath(preprocessing_path)
+        self._lock = threading.Lock()
+        self._signature = None
+        self._loaded = None
+
+    def get(self):
+        """LoadedModel vigente. Lanza FileNotFoundError si no existe."""
+        signature = (file_signature(self.path), _optional_signature(self.preprocessing_path))
+        if signature == self._signature:
+            return self._loaded
+
+        with self._lock:
+            if signature == self._signature:
+                return self._loaded
+
+            with open(self.path, "rb") as model_file:
+                data = model_file.read()
+            preprocessing_data = b""
+            if signature[1] is not None:
+                with open(self.preprocessing_path, "rb") as preprocessing_file:
+                    preprocessing_data = preprocessing_file.read()
+            version = hashlib.sha256(data + preprocessing_data).hexdigest()[:12]
+
+            # Si solo cambió el mtime (p. ej. un touch) no se deserializa
+            if self._loaded is None or self._loaded.version != version:
+                model = load(io.BytesIO(data))
+                preprocessing = None
+                if preprocessing_data:
+                    preprocessing = FittedPreprocessing(**json.loads(preprocessing_data))
+                self._loaded = LoadedModel(
+                    model, FeatureEncoder.from_model(model, preprocessing),
+                    data, version, self.path, _row_predictor(model)
+                )
+            self._signature = signature
+            return self._loaded
+
+
+# Un registro por ruta, compartido por todo el proceso
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(path=MODEL_PATH):
+    """ModelRegistry compartido para `path`."""
+    path = os.path.abspath(path)
+    with _registries_lock:
+        if path not in _registries:
+            _registries[path] = ModelRegistry(path)
+        return _registries[path]
+
+
+def get_model(path=MODEL_PATH):
+    """Atajo: LoadedModel vigente de `path`."""
+    return get_registry(path).get()
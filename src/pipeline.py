@@ -0,0 +1,284 @@
+# Pipeline de preprocesamiento -----------------------------------------
+# Regenera data/processed/df_clean_bank.csv a partir de data/raw_2 con los
+# mismos pasos descritos en la sección 5:
+#   1. eliminar outliers de edad (age > 70)
+#   2. log1p de campaign
+#   3. month -> quarter
+#   4. pdays -> binario (contactado o no)
+#   5. Yeo-Johnson de balance (ajustado sobre todas las filas limpias)
+#   6. eliminar las columnas originales transformadas
+# y guarda los parámetros ajustados junto al modelo (ver preprocessing.py).
+#
+# Los pasos por fila (1-4) se aplican por bloques de filas del CSV crudo y
+# cada bloque se guarda como Parquet en data/interim/pipeline, con el hash
+# de sus bytes en el nombre. En el refresco mensual los bloques que no
+# cambiaron se reutilizan y solo se procesan las filas nuevas. El lambda
+# de Yeo-Johnson se guarda con el hash de la columna balance, y si nada
+# cambió el CSV final no se vuelve a escribir.
+#
+# Uso:
+#   python src/pipeline.py            # regenerar (reutiliza la caché)
+#   python src/pipeline.py --force    # ignorar la caché
+import argparse
+import glob
+import hashlib
+import io
+import itertools
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_loader import CLEAN_DATA_PATH, CLEAN_DTYPES, RAW_DATA_PATH, RAW_DTYPES
+from feature_encoder import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+from preprocessing import (
+    PREPROCESSING_PATH,
+    fit_preprocessing,
+    save_preprocessing,
+    yeo_johnson
+)
+
+# Obtener la ruta absoluta del directorio donde está el script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+INTERIM_DIR = os.path.join(BASE_DIR, "../data/interim/pipeline")
+MANIFEST_NAME = "manifest.json"
+
+# Filas del CSV crudo por bloque de caché
+DEFAULT_BLOCK_ROWS = 20_000
+
+# Versión de los pasos: cambiarla invalida toda la caché
+PIPELINE_VERSION = "2"
+
+# Parámetros de los pasos
+MAX_AGE = 70
+QUARTERS = {
+    "jan": "Q1", "feb": "Q1", "mar": "Q1",
+    "apr": "Q2", "may": "Q2", "jun": "Q2",
+    "jul": "Q3", "aug": "Q3", "sep": "Q3",
+    "oct": "Q4", "nov": "Q4", "dec": "Q4",
+}
+DROP_COLUMNS = ["balance", "campaign", "month", "pdays", "previous"]
+CLEAN_COLUMNS = list(CLEAN_DTYPES)
+
+
+# Pasos por fila --------------------------------------------------------
+def remove_age_outliers(df, max_age=MAX_AGE):
+    """Eliminar clientes mayores de `max_age` años."""
+    return df[df["age"] <= max_age]
+
+
+def log_campaign(df):
+    """campaign_log = log(1 + campaign)."""
+    return df.assign(campaign_log=np.log1p(df["campaign"].to_numpy(dtype=np.float64)))
+
+
+def month_to_quarter(df):
+    """Agrupar los meses en trimestres (Q1-Q4)."""
+    return df.assign(quarter=df["month"].astype(str).map(QUARTERS))
+
+
+def pdays_to_binary(df):
+    """pdays_tran = 1 si el cliente fue contactado antes (pdays != -1)."""
+    return df.assign(pdays_tran=(df["pdays"] != -1).astype("int64"))
+
+
+ROW_STEPS = [remove_age_outliers, log_campaign, month_to_quarter, pdays_to_binary]
+
+
+def apply_row_steps(df):
+    """Aplicar los pasos por fila (1-4) a un bloque del CSV crudo."""
+    for step in ROW_STEPS:
+        df = step(df)
+    return df
+
+
+# Pasos globales --------------------------------------------------------
+def fit_yeo_johnson(balance):
+    """Lambda de Yeo-Johnson (sin estandarizar) ajustado sobre `balance`."""
+    from sklearn.preprocessing import PowerTransformer
+
+    transformer = PowerTransformer(method="yeo-johnson", standardize=False)
+    transformer.fit(np.asarray(balance, dtype=np.float64).reshape(-1, 1))
+    return float(transformer.lambdas_[0])
+
+
+def finalize(df, lmbda):
+    """Aplicar Yeo-Johnson a balance y dejar las columnas de df_clean.
+
+    Sin la columna `y` (listas a puntuar) se devuelven las demás.
+    """
+    df = df.assign(balance_yeojohnson=yeo_johnson(df["balance"], lmbda))
+    return df.drop(columns=DROP_COLUMNS)[[col for col in CLEAN_COLUMNS if col in df.columns]]
+
+
+# Caché por bloques -----------------------------------------------------
+def _digest(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def iter_raw_blocks(path, block_rows=DEFAULT_BLOCK_ROWS):
+    """(fila inicial, cabecera, bytes) de cada bloque de `block_rows` filas."""
+    with open(path, "rb") as raw_file:
+        header = raw_file.readline()
+        start = 0
+        while True:
+            lines = list(itertools.islice(raw_file, block_rows))
+            if not lines:
+                break
+            yield start, header, b"".join(lines)
+            start += len(lines)
+
+
+def clean_block(header, data, start, sep=";"):
+    """Leer un bloque del CSV crudo y aplicarle los pasos por fila."""
+    dtypes = {col: ("string" if dtype == "category" else dtype) for col, dtype in RAW_DTYPES.items()}
+    df = pd.read_csv(io.BytesIO(header + data), sep=sep, dtype=dtypes)
+    # Mismo índice que tendría el CSV completo
+    df.index = pd.RangeIndex(start, start + len(df))
+    return apply_row_steps(df)
+
+
+def _write_parquet(df, path):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path, compression="snappy")
+    os.replace(tmp_path, path)
+
+
+def _read_manifest(interim_dir):
+    try:
+        with open(os.path.join(interim_dir, MANIFEST_NAME), encoding="utf-8") as manifest_file:
+            return json.load(manifest_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_manifest(manifest, interim_dir):
+    path = os.path.join(interim_dir, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    os.replace(tmp_path, path)
+
+
+def run_pipeline(raw_path=RAW_DATA_PATH, output_path=CLEAN_DATA_PATH,
+                 interim_dir=INTERIM_DIR, block_rows=DEFAULT_BLOCK_ROWS,
+                 force=False, verbose=False, preprocessing_path=PREPROCESSING_PATH):
+    """Regenerar df_clean a partir del CSV crudo, reutilizando la caché.
+
+    Devuelve un diccionario con el número de bloques reutilizados y
+    procesados, el lambda de Yeo-Johnson y si se escribió la salida.
+    """
+    def log(message):
+        if verbose:
+            print(message)
+
+    os.makedirs(interim_dir, exist_ok=True)
+    manifest = {} if force else _read_manifest(interim_dir)
+
+    # 1-4. Pasos por fila, por bloque
+    blocks, block_keys = [], []
+    reused = computed = 0
+    for start, header, data in iter_raw_blocks(raw_path, block_rows):
+        key = _digest(PIPELINE_VERSION, MAX_AGE, start, header, data)
+        block_path = os.path.join(interim_dir, f"rows_{key}.parquet")
+        if not force and os.path.exists(block_path):
+            blocks.append(pd.read_parquet(block_path))
+            reused += 1
+        else:
+            block = clean_block(header, data, start)
+            _write_parquet(block, block_path)
+            blocks.append(block)
+            computed += 1
+        block_keys.append(key)
+    log(f"Bloques: {reused} reutilizados, {computed} procesados")
+
+    if not blocks:
+        raise ValueError(f"El archivo {raw_path} no tiene filas")
+    df = pd.concat(blocks)
+
+    # 5. Lambda de Yeo-Johnson, ajustado sobre todas las filas limpias
+    balance_key = _digest(PIPELINE_VERSION, pd.util.hash_pandas_object(df["balance"]).to_numpy().tobytes())
+    if manifest.get("balance_key") == balance_key:
+        lmbda = manifest["yeo_johnson_lambda"]
+        log(f"Yeo-Johnson: lambda reutilizado ({lmbda:.6f})")
+    else:
+        lmbda = fit_yeo_johnson(df["balance"])
+        log(f"Yeo-Johnson: lambda ajustado ({lmbda:.6f})")
+
+    # 6. Salida: solo se escribe si cambió algún bloque o el lambda
+    output_key = _digest(PIPELINE_VERSION, *block_keys, repr(lmbda))
+    written = (
+        force
+        or manifest.get("output_key") != output_key
+        or not os.path.exists(output_path)
+        or not os.path.exists(preprocessing_path)
+    )
+    if written:
+        df_clean = finalize(df, lmbda)
+        tmp_path = f"{output_path}.{os.getpid()}.tmp"
+        df_clean.to_csv(tmp_path)
+        os.replace(tmp_path, output_path)
+        log(f"Escrito {output_path} ({len(df_clean)} filas)")
+
+        # Parámetros ajustados, para aplicarlos igual en inferencia
+        save_preprocessing(
+            fit_preprocessing(df_clean, lmbda, CATEGORICAL_FEATURES, NUMERIC_FEATURES),
+            preprocessing_path
+        )
+        log(f"Escrito {preprocessing_path}")
+    else:
+        log(f"Sin cambios: {output_path}")
+
+    # Borrar bloques que ya no corresponden al CSV crudo
+    current = {f"rows_{key}.parquet" for key in block_keys}
+    for block_path in glob.glob(os.path.join(interim_dir, "rows_*.parquet")):
+        if os.path.basename(block_path) not in current:
+            os.remove(block_path)
+
+    _write_manifest({
+        "raw_path": os.path.abspath(raw_path),
+        "block_rows": block_rows,
+        "blocks": block_keys,
+        "balance_key": balance_key,
+        "yeo_johnson_lambda": lmbda,
+        "output_key": output_key,
+    }, interim_dir)
+
+    return {
+        "blocks_reused": reused,
+        "blocks_computed": computed,
+        "yeo_johnson_lambda": lmbda,
+        "written": written,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Regenerar df_clean_bank.csv desde data/raw_2.")
+    parser.add_argument("--raw", default=RAW_DATA_PATH, help="CSV crudo (separado por ';')")
+    parser.add_argument("--output", default=CLEAN_DATA_PATH, help="CSV procesado de salida")
+    parser.add_argument("--interim-dir", default=INTERIM_DIR, help="Directorio de la caché")
+    parser.add_argument("--preprocessing", default=PREPROCESSING_PATH,
+                        help="JSON con los parámetros ajustados (junto al modelo)")
+    parser.add_argument("--block-rows", type=int, default=DEFAULT_BLOCK_ROWS,
+                        help="Filas del CSV crudo por bloque de caché")
+    parser.add_argument("--force", action="store_true", help="Ignorar la caché")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    run_pipeline(args.raw, args.output, args.interim_dir, args.block_rows,
+                 force=args.force, verbose=True, preprocessing_path=args.preprocessing)
+    print(f"Pipeline completado en {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
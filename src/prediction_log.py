@@ -0,0 +1,273 @@
+# Registro de predicciones ----------------------------------------------
+# Cada predicción (formulario de la sección 9 o scoring por lotes) deja
+# un registro con las entradas, el hash de la fila codificada, la
+# probabilidad, el umbral, la predicción y la versión del modelo.
+#
+# Las entradas se registran siempre con el mismo esquema, el de df_clean:
+# las categóricas como texto y las numéricas tal como las recibió el
+# modelo (balance y campaign transformados, pdays_tran 0/1), con los tipos
+# de CLEAN_DTYPES. La columna input_format indica de qué formato venían
+# (form, processed o raw). Así los archivos de un mismo día se pueden
+# leer juntos aunque mezclen el formulario y el scoring por lotes.
+#
+# Quien predice solo encola el lote en memoria (put_nowait, sin esperar):
+# un hilo de fondo junta los lotes y escribe cuando hay `flush_rows`
+# filas pendientes o pasaron `flush_interval_s` segundos desde la primera.
+# El hash de las filas también se calcula en ese hilo. Si la cola está
+# llena (disco lento) los lotes se descartan y se cuentan en `dropped`,
+# en lugar de frenar la predicción.
+#
+# Destinos (variable de entorno PREDICTION_LOG, por defecto sqlite):
+#   sqlite   tabla `predictions` en data/predictions/predictions.sqlite
+#   parquet  data/predictions/date=AAAA-MM-DD/part-*.parquet (un archivo
+#            por escritura)
+#   off      sin registro
+# Tamaño e intervalo: PREDICTION_LOG_FLUSH_ROWS, PREDICTION_LOG_FLUSH_INTERVAL_S.
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from data_loader import CLEAN_DTYPES
+from feature_encoder import CATEGORICAL_FEATURES, NUMERIC_FEATURES, row_hashes
+
+# Obtener la ruta absoluta del directorio donde está el script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PREDICTIONS_DIR = os.path.join(BASE_DIR, "../data/predictions")
+SQLITE_FILE = "predictions.sqlite"
+TABLE = "predictions"
+
+DEFAULT_SINK = "sqlite"
+DEFAULT_FLUSH_ROWS = 1_000
+DEFAULT_FLUSH_INTERVAL_S = 5.0
+# Lotes en cola como máximo antes de descartar
+DEFAULT_MAX_PENDING = 10_000
+
+# Tipos de las numéricas registradas (los de df_clean)
+NUMERIC_DTYPES = {col: CLEAN_DTYPES[col] for col in NUMERIC_FEATURES}
+
+_STOP = object()
+
+
+# Destinos ----------------------------------------------------------------
+def _sqlite_type(dtype):
+    if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+
+class SqliteSink:
+    """Tabla `predictions` de un archivo SQLite (se crea al primer lote)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._connection = None
+
+    def write(self, frame):
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # Se abre en el hilo de escritura, el único que la usa
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            columns = ", ".join(f'"{name}" {_sqlite_type(dtype)}' for name, dtype in frame.dtypes.items())
+            self._connection.execute(f"CREATE TABLE IF NOT EXISTS {TABLE} ({columns})")
+        names = ", ".join(f'"{name}"' for name in frame.columns)
+        values = ", ".join(["?"] * frame.shape[1])
+        rows = frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None)
+        with self._connection:
+            self._connection.executemany(f"INSERT INTO {TABLE} ({names}) VALUES ({values})", rows)
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class ParquetSink:
+    """Un Parquet por escritura, particionado por fecha (date=AAAA-MM-DD)."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._sequence = 0
+
+    def write(self, frame):
+        partition = os.path.join(self.directory, f"date={time.strftime('%Y-%m-%d')}")
+        os.makedirs(partition, exist_ok=True)
+        self._sequence += 1
+        name = f"part-{time.strftime('%H%M%S')}-{os.getpid()}-{self._sequence:06d}.parquet"
+        path = os.path.join(partition, name)
+        tmp_path = f"{path}.tmp"
+        frame.to_parquet(tmp_path, engine="pyarrow", compression="snappy", index=False)
+        os.replace(tmp_path, path)
+
+    def close(self):
+        pass
+
+
+def make_sink(kind, directory=PREDICTIONS_DIR):
+    if kind == "sqlite":
+        return SqliteSink(os.path.join(directory, SQLITE_FILE))
+    if kind == "parquet":
+        return ParquetSink(directory)
+    raise ValueError(f"Destino desconocido: {kind}")
+
+
+# Registro asíncrono --------------------------------------------------------
+class PredictionLog:
+    """Cola en memoria + hilo de fondo que escribe por lotes en `sink`."""
+
+    def __init__(self, sink, flush_rows=DEFAULT_FLUSH_ROWS,
+                 flush_interval_s=DEFAULT_FLUSH_INTERVAL_S, max_pending=DEFAULT_MAX_PENDING):
+        self.sink = sink
+        self.flush_rows = flush_rows
+        self.flush_interval_s = flush_interval_s
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.errors = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="prediction-log", daemon=True)
+        self._thread.start()
+
+    def log(self, inputs, probability, threshold, model_version, source,
+            matrix=None, encoder=None, block=False, input_format="form"):
+        """Encolar un lote de predicciones (no espera ninguna escritura).
+
+        `inputs`: DataFrame con las columnas de INPUT_COLUMNS en el formato
+        `input_format` ('form' o, ya en formato df_clean, 'processed' o
+        'raw'). El hash y las numéricas registradas salen de `matrix`
+        (filas codificadas) o, si no se pasa, de `encoder.transform` en el
+        hilo de escritura.
+        Con `block=True` (scoring por lotes) espera lugar en la cola en
+        lugar de descartar.
+        """
+        if self._closed:
+            return False
+        item = (time.time(), inputs, np.atleast_1d(probability), threshold,
+                model_version, source, matrix, encoder, input_format)
+        try:
+            self._queue.put(item, block=block)
+        except queue.Full:
+            self.dropped += len(inputs)
+            return False
+        return True
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def stats(self):
+        return {"written": self.written, "dropped": self.dropped, "flushes": self.flushes,
+                "errors": self.errors, "pending": self.pending()}
+
+    @staticmethod
+    def _frame(item):
+        logged_at, inputs, probability, threshold, model_version, source, matrix, encoder, input_format = item
+        if matrix is None:
+            matrix = encoder.transform(inputs, prepared=input_format != "form")
+        frame = pd.DataFrame({
+            col: inputs[col].astype(str).to_numpy(dtype=object) for col in CATEGORICAL_FEATURES
+        })
+        # Las numéricas son las últimas columnas de la matriz (remainder del
+        # ColumnTransformer), en el orden de NUMERIC_FEATURES
+        numeric = matrix[:, -len(NUMERIC_FEATURES):].astype(np.float64)
+        for position, (col, dtype) in enumerate(NUMERIC_DTYPES.items()):
+            frame[col] = numeric[:, position].astype(dtype)
+        frame.insert(0, "logged_at", datetime.fromtimestamp(logged_at, timezone.utc).isoformat(
+            timespec="milliseconds"
+        ))
+        frame.insert(1, "source", source)
+        frame.insert(2, "input_format", input_format)
+        frame.insert(3, "model_version", model_version)
+        frame.insert(4, "threshold", float(threshold))
+        frame.insert(5, "probability", probability.astype(np.float64))
+        frame.insert(6, "prediction", (probability > threshold).astype(np.int64))
+        frame.insert(7, "features_hash", row_hashes(matrix))
+        return frame
+
+    def _flush(self, items):
+        try:
+            frames = [self._frame(item) for item in items]
+            batch = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            self.sink.write(batch)
+        except Exception:
+            # Un lote que no se pudo escribir no debe detener el registro
+            self.errors += 1
+            return
+        self.written += len(batch)
+        self.flushes += 1
+
+    def _run(self):
+        items, n_rows, deadline = [], 0, None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                if items:
+                    self._flush(items)
+                self.sink.close()
+                return
+            if item is not None:
+                items.append(item)
+                n_rows += len(item[1])
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval_s
+            if items and (n_rows >= self.flush_rows or time.monotonic() >= deadline):
+                self._flush(items)
+                items, n_rows, deadline = [], 0, None
+
+    def close(self, timeout=None):
+        """Escribir lo pendiente y detener el hilo."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+
+def open_prediction_log(kind=None, flush_rows=None, flush_interval_s=None,
+                        max_pending=DEFAULT_MAX_PENDING, directory=PREDICTIONS_DIR):
+    """PredictionLog nuevo, o None si el destino es 'off'.
+
+    Lo que no se indica sale de PREDICTION_LOG, PREDICTION_LOG_FLUSH_ROWS
+    y PREDICTION_LOG_FLUSH_INTERVAL_S.
+    """
+    kind = (kind or os.environ.get("PREDICTION_LOG", DEFAULT_SINK)).strip().lower()
+    if kind == "off":
+        return None
+    if flush_rows is None:
+        flush_rows = int(os.environ.get("PREDICTION_LOG_FLUSH_ROWS", DEFAULT_FLUSH_ROWS))
+    if flush_interval_s is None:
+        flush_interval_s = float(os.environ.get("PREDICTION_LOG_FLUSH_INTERVAL_S", DEFAULT_FLUSH_INTERVAL_S))
+    return PredictionLog(make_sink(kind, directory), flush_rows, flush_interval_s, max_pending)
+
+
+# Registro compartido por el proceso -------------------------------------
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_prediction_log():
+    """PredictionLog compartido del proceso, o None si PREDICTION_LOG=off."""
+    global _log
+    with _log_lock:
+        if _log is None:
+            _log = open_prediction_log()
+            if _log is None:
+                return None
+            # Escribir lo pendiente al terminar el proceso
+            atexit.register(_log.close)
+        return _log
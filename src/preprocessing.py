@@ -0,0 +1,88 @@
+# Transformaciones ajustadas en el preprocesamiento --------------------
+# El pipeline (src/pipeline.py) guarda junto al modelo los parámetros que
+# ajustó: el lambda de Yeo-Johnson de balance y las categorías de cada
+# variable categórica (en el orden del One-Hot). En inferencia no se
+# vuelve a ajustar nada: FeatureEncoder aplica esos parámetros como
+# aritmética vectorizada de NumPy, igual en el formulario, el servicio
+# HTTP y el scoring por lotes.
+#
+# También guarda el rango de cada variable numérica ya transformada.
+# FeatureEncoder.from_model lo compara con el rango que vio el booster
+# (feature_infos) y rechaza un JSON ajustado con otros datos: un lambda
+# distinto al del entrenamiento cambia la escala de balance sin error.
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+
+# Obtener la ruta absoluta del directorio donde está el script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PREPROCESSING_PATH = os.path.join(BASE_DIR, "../models/bank_marketing_preprocessing.json")
+
+# Parámetros ajustados: lambda de balance, {columna: categorías}, los
+# nombres de salida del ColumnTransformer en orden y {nombre: [mín, máx]}
+# de las numéricas transformadas (None en archivos anteriores)
+FittedPreprocessing = namedtuple(
+    "FittedPreprocessing", ["balance_lambda", "categories", "feature_names", "feature_ranges"],
+    defaults=[None]
+)
+
+
+def yeo_johnson(values, lmbda):
+    """Yeo-Johnson con un lambda ya ajustado (igual a PowerTransformer).
+
+    Para x >= 0: ((x + 1)^lambda - 1) / lambda   (log1p(x) si lambda == 0)
+    Para x < 0:  -((1 - x)^(2 - lambda) - 1) / (2 - lambda)   (-log1p(-x) si lambda == 2)
+    """
+    x = np.asarray(values, dtype=np.float64)
+    out = np.empty_like(x)
+    positive = x >= 0
+    negative = ~positive
+
+    if abs(lmbda) < np.spacing(1.0):
+        out[positive] = np.log1p(x[positive])
+    else:
+        out[positive] = np.expm1(lmbda * np.log1p(x[positive])) / lmbda
+
+    if abs(lmbda - 2) < np.spacing(1.0):
+        out[negative] = -np.log1p(-x[negative])
+    else:
+        out[negative] = -np.expm1((2 - lmbda) * np.log1p(-x[negative])) / (2 - lmbda)
+    return out
+
+
+def fit_preprocessing(df, balance_lambda, categorical_columns, numeric_columns):
+    """Parámetros a guardar a partir del df_clean generado por el pipeline."""
+    # Mismo orden que OneHotEncoder: categorías ordenadas
+    categories = {
+        col: sorted(str(value) for value in df[col].dropna().unique())
+        for col in categorical_columns
+    }
+    feature_names = [
+        f"cat__{col}_{value}"
+        for col, values in categories.items()
+        for value in values
+    ] + [f"remainder__{col}" for col in numeric_columns]
+    feature_ranges = {
+        f"remainder__{col}": [float(df[col].min()), float(df[col].max())]
+        for col in numeric_columns
+    }
+    return FittedPreprocessing(float(balance_lambda), categories, feature_names, feature_ranges)
+
+
+def save_preprocessing(fitted, path=PREPROCESSING_PATH):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as preprocessing_file:
+        json.dump(fitted._asdict(), preprocessing_file, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_preprocessing(path=PREPROCESSING_PATH):
+    """FittedPreprocessing guardado, o None si todavía no se generó."""
+    try:
+        with open(path, encoding="utf-8") as preprocessing_file:
+            return FittedPreprocessing(**json.load(preprocessing_file))
+    except FileNotFoundError:
+        return None
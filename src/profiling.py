@@ -0,0 +1,239 @@
+# Tiempos por sección de la app -----------------------------------------
+# Mide cuánto tarda cada sección del menú y, dentro de ella, los tramos
+# de acceso a datos, construcción de gráficos, carga de imágenes y
+# llamada al modelo. Se activa con la variable de entorno BANK_PROFILE:
+#
+#   BANK_PROFILE=1             solo tiempos
+#   BANK_PROFILE=cprofile      tiempos + cProfile de cada render (.prof)
+#   BANK_PROFILE=pyinstrument  tiempos + pyinstrument (.html), si está
+#
+# Los tiempos se agregan en memoria por (sección, tramo) y se exportan en
+# formato de texto de Prometheus a data/interim/profiling/metrics.prom
+# (como mucho cada BANK_PROFILE_INTERVAL segundos), y cada render deja
+# una línea JSON en timings.jsonl. Sin BANK_PROFILE, span() y section()
+# devuelven un context manager vacío: el costo es una llamada de función.
+#
+# Uso:
+#   BANK_PROFILE=1 streamlit run src/fp_ds_bank.py
+#   python -m pstats data/interim/profiling/<sección>_<fecha>.prof
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+
+# Obtener la ruta absoluta del directorio donde está el script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PROFILING_DIR = os.path.join(BASE_DIR, "../data/interim/profiling")
+METRICS_FILE = "metrics.prom"
+TIMINGS_FILE = "timings.jsonl"
+
+MODES = {"1": "timing", "true": "timing", "timing": "timing",
+         "cprofile": "cprofile", "pyinstrument": "pyinstrument"}
+MODE = MODES.get(os.environ.get("BANK_PROFILE", "").strip().lower())
+ENABLED = MODE is not None
+EXPORT_INTERVAL = float(os.environ.get("BANK_PROFILE_INTERVAL", "10"))
+
+# Nombre del tramo que cubre toda la sección
+SECTION_SPAN = "total"
+
+
+class _NullContext:
+    # Context manager sin estado: se reutiliza la misma instancia
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL = _NullContext()
+
+
+# Agregación ---------------------------------------------------------------
+class Timings:
+    """Conteo, suma y máximo (s) por (sección, tramo), seguro entre hilos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, section, span, seconds):
+        with self._lock:
+            stats = self._stats.get((section, span))
+            if stats is None:
+                self._stats[(section, span)] = [1, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {key: tuple(stats) for key, stats in self._stats.items()}
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def prometheus_text(snapshot):
+    """Texto en formato de exposición de Prometheus."""
+    lines = [
+        "# HELP bank_app_span_seconds Tiempo de render por sección y tramo.",
+        "# TYPE bank_app_span_seconds summary",
+    ]
+    maxima = [
+        "# HELP bank_app_span_seconds_max Máximo observado por sección y tramo.",
+        "# TYPE bank_app_span_seconds_max gauge",
+    ]
+    for (section, span), (count, total, maximum) in sorted(snapshot.items()):
+        labels = f'section="{_label(section)}",span="{_label(span)}"'
+        lines.append(f"bank_app_span_seconds_count{{{labels}}} {count}")
+        lines.append(f"bank_app_span_seconds_sum{{{labels}}} {total:.6f}")
+        maxima.append(f"bank_app_span_seconds_max{{{labels}}} {maximum:.6f}")
+    return "\n".join(lines + maxima) + "\n"
+
+
+# Estado del proceso ---------------------------------------------------------
+timings = Timings()
+# Streamlit ejecuta cada sesión en su propio hilo
+_local = threading.local()
+_last_export = 0.0
+_export_lock = threading.Lock()
+
+
+def export(profiling_dir=PROFILING_DIR):
+    """Escribir metrics.prom con los tiempos acumulados."""
+    os.makedirs(profiling_dir, exist_ok=True)
+    path = os.path.join(profiling_dir, METRICS_FILE)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as metrics_file:
+        metrics_file.write(prometheus_text(timings.snapshot()))
+    os.replace(tmp_path, path)
+    return path
+
+
+def _maybe_export():
+    global _last_export
+    now = time.monotonic()
+    with _export_lock:
+        if now - _last_export < EXPORT_INTERVAL:
+            return
+        _last_export = now
+    export()
+
+
+def _log_render(section, spans):
+    os.makedirs(PROFILING_DIR, exist_ok=True)
+    record = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "section": section, "spans": spans}
+    with _export_lock, open(os.path.join(PROFILING_DIR, TIMINGS_FILE), "a", encoding="utf-8") as log:
+        log.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _file_stem(section):
+    name = re.sub(r"[^\w]+", "_", section).strip("_") or "section"
+    return f"{name}_{time.strftime('%Y%m%d-%H%M%S')}"
+
+
+# Perfiladores -----------------------------------------------------------------
+class _CProfiler:
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self, section):
+        self._profile.disable()
+        self._profile.dump_stats(os.path.join(PROFILING_DIR, f"{_file_stem(section)}.prof"))
+
+
+class _PyInstrumentProfiler:
+    def __init__(self):
+        from pyinstrument import Profiler
+
+        self._profile = Profiler()
+
+    def start(self):
+        self._profile.start()
+
+    def stop(self, section):
+        self._profile.stop()
+        with open(os.path.join(PROFILING_DIR, f"{_file_stem(section)}.html"), "w",
+                  encoding="utf-8") as report:
+            report.write(self._profile.output_html())
+
+
+def _profiler():
+    if MODE == "cprofile":
+        return _CProfiler()
+    if MODE == "pyinstrument":
+        try:
+            return _PyInstrumentProfiler()
+        except ImportError:
+            # pyinstrument es opcional: se usa cProfile
+            return _CProfiler()
+    return None
+
+
+# Context managers -------------------------------------------------------------
+class _Span:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self._start
+        section = getattr(_local, "section", None)
+        if section is not None:
+            timings.record(section, self.name, seconds)
+            _local.spans[self.name] = _local.spans.get(self.name, 0.0) + seconds
+        return False
+
+
+class _Section:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        _local.section = self.name
+        _local.spans = {}
+        os.makedirs(PROFILING_DIR, exist_ok=True)
+        self._profiler = _profiler()
+        if self._profiler is not None:
+            self._profiler.start()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        # También con st.stop() / st.rerun() (se propagan como excepciones)
+        seconds = time.perf_counter() - self._start
+        if self._profiler is not None:
+            self._profiler.stop(self.name)
+        timings.record(self.name, SECTION_SPAN, seconds)
+        spans = {SECTION_SPAN: seconds, **_local.spans}
+        _local.section = None
+        _local.spans = {}
+        _log_render(self.name, spans)
+        _maybe_export()
+        return False
+
+
+def span(name):
+    """Tramo dentro de la sección actual (datos, gráfico, imagen, modelo)."""
+    return _Span(name) if ENABLED else _NULL
+
+
+def section(name):
+    """Render completo de una sección del menú (con perfilador opcional)."""
+    return _Section(name) if ENABLED else _NULL
@@ -0,0 +1,348 @@
+# Reentrenamiento incremental del LightGBM ------------------------------
+# Cada ola de campaña trae resultados nuevos. En lugar de volver a ajustar
+# el modelo con toda la historia, se sigue boosting desde el modelo
+# vigente (init_model): se agregan `rounds` árboles ajustados solo con las
+# filas nuevas y los 200 árboles existentes quedan como están.
+#
+# 1. Las filas nuevas (CSV crudo ';' o procesado, o Parquet de ingest.py)
+#    se llevan al formato de df_clean con el lambda guardado y se separa
+#    una parte estratificada (`holdout`) que no se usa para ajustar.
+# 2. Se codifican con el FeatureEncoder del modelo vigente: mismas
+#    columnas y categorías, así que el JSON de preprocesamiento no cambia.
+# 3. Se comparan el modelo vigente y el candidato en el holdout y en
+#    df_test (para ver que no se olvide lo aprendido). De ambos se quitan
+#    las filas idénticas a alguna fila de ajuste (df_train o las nuevas):
+#    un duplicado en la evaluación premia memorizar, no generalizar.
+# 4. El candidato se guarda en models/versions/ con un JSON de metadatos
+#    (versión padre, filas, métricas, tiempos). La versión es la misma que
+#    calcula ModelRegistry, así que coincide con la del log de
+#    predicciones, el caché de puntajes y threshold.json.
+# 5. Si la métrica de promoción (por defecto Recall de la clase 1, la que
+#    usa el proyecto para elegir modelo) no baja en el holdout ni cae más
+#    de `max_regression` en df_test, y el recall tampoco cae más de
+#    `max_regression` en ninguno de los dos, se promueve: se reemplaza
+#    el joblib de models/ (la app y el servicio lo recargan solos) y se
+#    vuelve a ajustar el umbral con el mismo criterio de threshold.json.
+#
+# Uso:
+#   python src/retrain.py ola_2024_11.csv
+#   python src/retrain.py ola_2024_11.csv --rounds 50 --compare-full
+#   python src/retrain.py --promote 3f2a9c1b7d4e      # volver a una versión
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from data_loader import CLEAN_DATA_PATH, RANDOM_STATE
+from feature_encoder import row_hashes
+from ingest import clean_chunk, detect_format, iter_typed_chunks
+from model_registry import MODEL_PATH, get_model
+from preprocessing import PREPROCESSING_PATH, load_preprocessing
+from train import (VERSIONS_DIR, load_fold_data, model_version, target_vector,
+                   test_metrics, versioned_name)
+
+DEFAULT_ROUNDS = 100
+DEFAULT_HOLDOUT = 0.2
+DEFAULT_MAX_REGRESSION = 0.01
+
+# Métrica de promoción por defecto (de train.test_metrics); el recall
+# además no puede caer más de `max_regression` con cualquier métrica
+RECALL_METRIC = "Recall (Class 1)"
+PROMOTION_METRICS = {"recall": RECALL_METRIC, "f1": "F1-Score (Class 1)", "accuracy": "Accuracy"}
+
+
+# Datos nuevos ------------------------------------------------------------
+def load_new_rows(path, preprocessing_path=PREPROCESSING_PATH):
+    """Filas nuevas en formato df_clean (CSV crudo/procesado o Parquet)."""
+    if os.path.isdir(path) or path.endswith(".parquet"):
+        # Directorio o archivo escrito por ingest.py: ya está limpio
+        return pd.read_parquet(path)
+    input_format = detect_format(path)
+    balance_lambda = None
+    if input_format == "raw":
+        preprocessing = load_preprocessing(preprocessing_path)
+        if preprocessing is None:
+            raise FileNotFoundError(f"Falta {preprocessing_path} para transformar las filas crudas")
+        balance_lambda = preprocessing.balance_lambda
+    chunks = [clean_chunk(chunk, input_format, balance_lambda)
+              for chunk in iter_typed_chunks(path, input_format)]
+    return pd.concat(chunks) if len(chunks) > 1 else chunks[0]
+
+
+def split_holdout(df, holdout=DEFAULT_HOLDOUT):
+    """(filas para ajustar, holdout) estratificado por y."""
+    from sklearn.model_selection import train_test_split
+
+    return train_test_split(df, test_size=holdout, random_state=RANDOM_STATE, stratify=df["y"])
+
+
+def unseen_rows(X, y, *seen):
+    """(X, y) sin las filas idénticas a alguna fila de las matrices `seen`."""
+    seen_hashes = set()
+    for matrix in seen:
+        seen_hashes.update(row_hashes(matrix))
+    keep = np.array([row_hash not in seen_hashes for row_hash in row_hashes(X)], dtype=bool)
+    return X[keep], y[keep]
+
+
+# Versiones en models/versions ------------------------------------------
+def version_path(version, versions_dir=VERSIONS_DIR):
+    return os.path.join(versions_dir, versioned_name(os.path.basename(MODEL_PATH), version))
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as output_file:
+        output_file.write(data)
+    os.replace(tmp_path, path)
+
+
+def save_version(version, data, metadata, versions_dir=VERSIONS_DIR):
+    """Guardar el joblib y sus metadatos (<versión>.json) en `versions_dir`."""
+    path = version_path(version, versions_dir)
+    _write_atomic(path, data)
+    _write_atomic(f"{os.path.splitext(path)[0]}.json",
+                  json.dumps(metadata, indent=2).encode("utf-8"))
+    return path
+
+
+def archive_current(loaded, versions_dir=VERSIONS_DIR):
+    """Copiar el modelo vigente a `versions_dir` (para poder volver a él)."""
+    path = version_path(loaded.version, versions_dir)
+    if not os.path.exists(path):
+        _write_atomic(path, loaded.data)
+    return path
+
+
+def promote_version(version, model_path=MODEL_PATH, versions_dir=VERSIONS_DIR):
+    """Reemplazar el modelo de la app por una versión guardada."""
+    source = version_path(version, versions_dir)
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"No existe la versión {version} en {versions_dir}")
+    # Copia y rename: la app nunca lee un joblib a medio escribir
+    tmp_path = f"{model_path}.{os.getpid()}.tmp"
+    shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, model_path)
+    return model_path
+
+
+def retune_threshold():
+    """Volver a ajustar threshold.json para el modelo promovido, si existe."""
+    from threshold import (choose_threshold, read_threshold, save_threshold,
+                           test_probabilities, threshold_sweep)
+
+    record = read_threshold()
+    if record is None:
+        return None
+    y_test, probability, version = test_probabilities()
+    choice = choose_threshold(threshold_sweep(y_test, probability), record["objective"], **record["params"])
+    return save_threshold(choice, record["objective"], record["params"], version)
+
+
+# Reentrenamiento -------------------------------------------------------
+def _params(model, n_jobs):
+    params = model.get_params()
+    params.setdefault("verbose", -1)
+    if n_jobs is not None:
+        params["n_jobs"] = n_jobs
+    return params
+
+
+def warm_start(model, X, y, rounds=DEFAULT_ROUNDS, learning_rate=None, n_jobs=None):
+    """LGBMClassifier con los árboles de `model` más `rounds` nuevos."""
+    from lightgbm import LGBMClassifier
+
+    params = _params(model, n_jobs)
+    params["n_estimators"] = rounds
+    if learning_rate is not None:
+        params["learning_rate"] = learning_rate
+    candidate = LGBMClassifier(**params)
+    candidate.fit(X, y, init_model=model.booster_)
+    return candidate
+
+
+def full_refit(model, X, y, n_jobs=None):
+    """El mismo modelo ajustado desde cero (para comparar tiempos)."""
+    from lightgbm import LGBMClassifier
+
+    return LGBMClassifier(**_params(model, n_jobs)).fit(X, y)
+
+
+def _compare(current, candidate, X, y):
+    return {"current": test_metrics(current, X, y), "candidate": test_metrics(candidate, X, y)}
+
+
+def should_promote(metrics, max_regression=DEFAULT_MAX_REGRESSION, metric=RECALL_METRIC):
+    """`metric` mejor o igual en el holdout y sin perder más de
+    `max_regression` en df_test; el recall no puede caer más de
+    `max_regression` en ninguno de los dos."""
+    holdout, test = metrics["holdout"], metrics["test"]
+    if holdout["candidate"][metric] < holdout["current"][metric]:
+        return False
+    if test["candidate"][metric] < test["current"][metric] - max_regression:
+        return False
+    return all(
+        split["candidate"][RECALL_METRIC] >= split["current"][RECALL_METRIC] - max_regression
+        for split in (holdout, test)
+    )
+
+
+def retrain(new_rows_path, model_path=MODEL_PATH, data_path=CLEAN_DATA_PATH,
+            rounds=DEFAULT_ROUNDS, holdout=DEFAULT_HOLDOUT, learning_rate=None,
+            max_regression=DEFAULT_MAX_REGRESSION, promotion_metric=RECALL_METRIC,
+            promote=True, compare_full=False,
+            n_jobs=None, versions_dir=VERSIONS_DIR, verbose=False):
+    """Seguir boosting con las filas nuevas y versionar el resultado.
+
+    Devuelve los metadatos guardados junto al candidato.
+    """
+    loaded = get_model(model_path)
+    new_rows = load_new_rows(new_rows_path)
+    fit_rows, holdout_rows = split_holdout(new_rows, holdout)
+    X_fit = loaded.encoder.transform(fit_rows, prepared=True)
+    y_fit = target_vector(fit_rows)
+    history = load_fold_data(data_path)
+    # Evaluar solo con filas que ningún modelo vio al ajustar
+    X_holdout, y_holdout = unseen_rows(
+        loaded.encoder.transform(holdout_rows, prepared=True), target_vector(holdout_rows),
+        X_fit, history["X_train"]
+    )
+    X_test, y_test = unseen_rows(history["X_test"], history["y_test"], history["X_train"], X_fit)
+    duplicates = {
+        "holdout": len(holdout_rows) - len(y_holdout),
+        "test": len(history["y_test"]) - len(y_test),
+    }
+    if verbose and any(duplicates.values()):
+        print(f"Filas de evaluación repetidas en el ajuste (descartadas): {duplicates}")
+    if not len(y_holdout) or not len(y_test):
+        raise ValueError(f"No quedan filas de evaluación sin repetir en el ajuste: {duplicates}")
+
+    start = time.perf_counter()
+    candidate = warm_start(loaded.model, X_fit, y_fit, rounds, learning_rate, n_jobs)
+    seconds = time.perf_counter() - start
+    if verbose:
+        print(f"{rounds} árboles nuevos con {len(fit_rows)} filas en {seconds:.2f} s")
+
+    metrics = {
+        "holdout": _compare(loaded.model, candidate, X_holdout, y_holdout),
+        "test": _compare(loaded.model, candidate, X_test, y_test),
+    }
+    version, data = model_version(candidate)
+    metadata = {
+        "version": version,
+        "parent_version": loaded.version,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "new_rows_path": os.path.abspath(new_rows_path),
+        "fit_rows": len(fit_rows),
+        "holdout_rows": len(y_holdout),
+        "test_rows": len(y_test),
+        "duplicates_dropped": duplicates,
+        "rounds": rounds,
+        "n_trees": candidate.booster_.num_trees(),
+        "learning_rate": candidate.get_params()["learning_rate"],
+        "seconds": seconds,
+        "metrics": metrics,
+    }
+
+    if compare_full:
+        # Referencia: el mismo modelo desde cero con la historia + lo nuevo
+        X_all = np.vstack([history["X_train"], X_fit])
+        y_all = np.concatenate([history["y_train"], y_fit])
+        start = time.perf_counter()
+        refit = full_refit(loaded.model, X_all, y_all, n_jobs)
+        metadata["full_refit"] = {
+            "rows": len(y_all),
+            "seconds": time.perf_counter() - start,
+            "metrics": {
+                "holdout": test_metrics(refit, X_holdout, y_holdout),
+                "test": test_metrics(refit, X_test, y_test),
+            },
+        }
+
+    metadata["promotion_metric"] = promotion_metric
+    metadata["promoted"] = bool(promote and should_promote(metrics, max_regression, promotion_metric))
+    archive_current(loaded, versions_dir)
+    metadata["path"] = os.path.basename(save_version(version, data, metadata, versions_dir))
+    if metadata["promoted"]:
+        promote_version(version, model_path, versions_dir)
+        if model_path == MODEL_PATH:
+            retune_threshold()
+    return metadata
+
+
+def _print_metrics(metadata):
+    rows = []
+    for split, models in metadata["metrics"].items():
+        for name, values in models.items():
+            rows.append({"split": split, "model": name, **values})
+    full = metadata.get("full_refit")
+    if full:
+        for split, values in full["metrics"].items():
+            rows.append({"split": split, "model": "full_refit", **values})
+    print(pd.DataFrame(rows).round(4).to_string(index=False))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Reentrenar el LightGBM con filas nuevas siguiendo desde el modelo vigente."
+    )
+    parser.add_argument("new_rows", nargs="?",
+                        help="CSV (crudo o procesado) o Parquet con las filas nuevas etiquetadas")
+    parser.add_argument("--model", default=MODEL_PATH, help="Ruta del modelo joblib")
+    parser.add_argument("--data", default=CLEAN_DATA_PATH, help="CSV procesado (df_clean) para df_test")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="Árboles a agregar")
+    parser.add_argument("--learning-rate", type=float,
+                        help="Learning rate de los árboles nuevos (por defecto el del modelo)")
+    parser.add_argument("--holdout", type=float, default=DEFAULT_HOLDOUT,
+                        help="Fracción de las filas nuevas reservada para validar")
+    parser.add_argument("--max-regression", type=float, default=DEFAULT_MAX_REGRESSION,
+                        help="Caída máxima de la métrica de promoción (y del recall) para promover")
+    parser.add_argument("--promotion-metric", choices=list(PROMOTION_METRICS), default="recall",
+                        help="Métrica que decide la promoción")
+    parser.add_argument("--no-promote", action="store_true",
+                        help="Solo guardar la versión en models/versions")
+    parser.add_argument("--compare-full", action="store_true",
+                        help="Ajustar también desde cero con toda la historia y comparar")
+    parser.add_argument("--n-jobs", type=int, help="Hilos de LightGBM (por defecto todos)")
+    parser.add_argument("--promote", metavar="VERSION",
+                        help="Promover una versión guardada (sin reentrenar)")
+    args = parser.parse_args(argv)
+    if args.new_rows is None and args.promote is None:
+        parser.error("Indicar las filas nuevas o --promote VERSION")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.promote:
+        promote_version(args.promote, args.model)
+        if args.model == MODEL_PATH:
+            retune_threshold()
+        print(f"Versión {args.promote} promovida a {args.model}")
+        return
+
+    metadata = retrain(
+        args.new_rows, args.model, args.data,
+        rounds=args.rounds, holdout=args.holdout, learning_rate=args.learning_rate,
+        max_regression=args.max_regression, promotion_metric=PROMOTION_METRICS[args.promotion_metric],
+        promote=not args.no_promote,
+        compare_full=args.compare_full, n_jobs=args.n_jobs, verbose=True
+    )
+    _print_metrics(metadata)
+    full = metadata.get("full_refit")
+    if full:
+        print(f"Reentrenamiento: {metadata['seconds']:.2f} s; desde cero con {full['rows']} filas: "
+              f"{full['seconds']:.2f} s ({full['seconds'] / metadata['seconds']:.1f}x)")
+    print(f"Versión {metadata['version']} (padre {metadata['parent_version']}) guardada en "
+          f"{os.path.join(VERSIONS_DIR, metadata['path'])}")
+    print("Promovida a models/" if metadata["promoted"] else "No promovida: el modelo vigente no cambia")
+
+
+if __name__ == "__main__":
+    main()
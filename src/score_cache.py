@@ -0,0 +1,137 @@
+# Caché de puntajes -----------------------------------------------------
+# El formulario recibe perfiles repetidos y el CRM vuelve a puntuar a los
+# mismos clientes varias veces al día. ScoreCache guarda la probabilidad
+# de cada fila codificada con clave (versión del modelo, hash de la fila):
+# el mismo hash que queda en el log de predicciones (features_hash).
+#
+# - LRU acotado a `max_entries` y con vencimiento `ttl_s` por entrada.
+# - Cuando cambia la versión del modelo (ModelRegistry recarga el joblib
+#   o el JSON de preprocesamiento) se vacía: nada viejo se sirve ni ocupa
+#   memoria.
+# - En un lote solo se puntúan las filas que faltan, una vez cada una
+#   aunque estén repetidas, en una sola llamada al modelo.
+#
+# Configuración del caché del proceso: SCORE_CACHE_SIZE (0 = apagado) y
+# SCORE_CACHE_TTL_S.
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from feature_encoder import row_hashes
+
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_TTL_S = 3600.0
+
+
+def score_rows(loaded, matrix):
+    """Probabilidad de la clase 1 para filas ya codificadas (LoadedModel)."""
+    if len(matrix) == 1 and loaded.predictor is not None:
+        # Una fila: predictor de arreglos, sin el wrapper de sklearn
+        return np.array([loaded.predictor.predict_proba_row(matrix[0])])
+    return loaded.model.predict_proba(matrix)[:, 1]
+
+
+class ScoreCache:
+    """LRU con TTL de probabilidades por (versión del modelo, fila)."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl_s=DEFAULT_TTL_S):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # {(versión, hash): (probabilidad, vence)}
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def predict(self, model_version, matrix, score):
+        """Probabilidades de `matrix`; `score(filas)` calcula las que faltan."""
+        keys = [(model_version, digest) for digest in row_hashes(matrix)]
+        probability = np.empty(len(keys), dtype=np.float64)
+        missing = {}
+        now = time.monotonic()
+
+        with self._lock:
+            if model_version != self._version:
+                # Modelo nuevo: los puntajes anteriores ya no sirven
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._version = model_version
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] > now:
+                    self._entries.move_to_end(key)
+                    probability[i] = entry[0]
+                    self.hits += 1
+                    continue
+                if entry is not None:
+                    del self._entries[key]
+                    self.expired += 1
+                # Filas repetidas en el lote: se puntúa solo la primera
+                missing.setdefault(key, []).append(i)
+                self.misses += 1
+
+        if missing:
+            first = [positions[0] for positions in missing.values()]
+            scored = np.asarray(score(matrix[first]), dtype=np.float64)
+            expires = time.monotonic() + self.ttl_s
+            with self._lock:
+                for (key, positions), value in zip(missing.items(), scored):
+                    probability[positions] = value
+                    if key[0] != self._version:
+                        continue
+                    self._entries[key] = (value, expires)
+                    self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return probability
+
+    def predict_proba(self, loaded, matrix):
+        """Atajo para un LoadedModel del ModelRegistry."""
+        return self.predict(loaded.version, matrix, lambda rows: score_rows(loaded, rows))
+
+
+# Caché compartido por el proceso (None si SCORE_CACHE_SIZE=0)
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_score_cache():
+    """ScoreCache del proceso según SCORE_CACHE_SIZE y SCORE_CACHE_TTL_S."""
+    global _cache
+    max_entries = int(os.environ.get("SCORE_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+    if max_entries <= 0:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ScoreCache(max_entries, float(os.environ.get("SCORE_CACHE_TTL_S", DEFAULT_TTL_S)))
+        return _cache
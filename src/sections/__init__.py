@@ -0,0 +1,25 @@
+# Secciones de la app ---------------------------------------------------
+# Cada sección del menú vive en su propio módulo con una función render().
+# El módulo (y las librerías que use: plotly, LightGBM, el registro del
+# modelo...) se importa la primera vez que se muestra la sección, así el
+# arranque y la primera pantalla ("Inicio") solo cargan Streamlit.
+import importlib
+
+# Opción del menú -> módulo de sections/
+SECTIONS = {
+    "Inicio": "inicio",
+    "1. El Rescate de las Campañas Perdidas": "rescate",
+    "2. La misión del rescate": "mision",
+    "3. Desafíos abordados": "desafios",
+    "4. Herramientas y metodologías": "herramientas",
+    "5. Hallazgos Clave": "hallazgos",
+    "6. Análisis Exploratorio de Datos (EDA)": "eda",
+    "7. Resultados": "resultados",
+    "8. Puesta en acción": "puesta_en_accion",
+    "9. Predicción": "prediccion",
+}
+
+
+def render(menu):
+    """Importar (una vez por proceso) y mostrar la sección `menu`."""
+    importlib.import_module(f"{__name__}.{SECTIONS[menu]}").render()
@@ -0,0 +1,20 @@
+# Utilidades compartidas por las secciones -----------------------------
+import os
+
+import streamlit as st
+
+import profiling
+from assets import image_bytes
+
+# Directorio src/ (las rutas de las imágenes son relativas a él)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def show_image(image_path, size, caption=None):
+    # Mostrar una imagen ya redimensionada (sin decodificar en cada rerun)
+    try:
+        with profiling.span("image"):
+            data = image_bytes(image_path, size)
+        st.image(data, use_container_width=False, caption=caption)
+    except FileNotFoundError:
+        st.error(f"No se encontró la imagen en la ruta: {image_path}")
@@ -0,0 +1,55 @@
+# Sección 3: 3. Desafíos abordados ----------------------------------------
+import pandas as pd
+import streamlit as st
+
+from data_loader import raw_dtypes, clean_dtypes
+
+
+def render():
+    st.title("3. Desafíos abordados")
+    st.markdown("""
+    El análisis afrontó desafíos interesantes para procesar los datos, permitiendo
+    mejorar el poder predictivo de las características.
+    """)
+        # Construir columnas
+    col1, col2, col3 = st.columns([1, 1, 1])
+
+    with col1:
+        # Crear tabla con las variables y su tipo de dato
+        data_types = pd.DataFrame({
+            'Tipo de Dato': raw_dtypes().astype(str)  # Convertir a string para visualización
+        })
+
+        # Mostrar la tabla en Streamlit
+        st.write(data_types)
+    
+    
+    with col2:
+        st.markdown("#### Info dataset original")
+        st.markdown("""
+            - Dataset Original:
+            - Registros: 45,211
+            - Variables: 16 características
+            - Meta: 1 objetivo a predecir (y)
+        """)
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("#### Info dataset limpio")
+        st.markdown("""
+            - Dataset Original:
+            - Registros: 44,724
+            - Variables: 15 características
+            - Meta: 1 objetivo a predecir (y)
+        """)
+
+    with col3:
+        # Crear tabla df_clean
+        data_types2 = pd.DataFrame({
+            'Tipo de Dato': clean_dtypes().astype(str)  # Convertir a string para visualización
+        })
+
+        # Mostrar la tabla en Streamlit
+        st.write(data_types2)
+
+    st.markdown("**Nota:** *Haz clic en el menú lateral para explorar las secciones.*")
@@ -0,0 +1,78 @@
+# Sección 6: 6. Análisis Exploratorio de Datos (EDA)-----------------------
+import os
+
+import streamlit as st
+
+import profiling
+from eda_snapshot import load_snapshot, snapshot_tables
+from sections.common import BASE_DIR, show_image
+
+
+def render():
+    st.title("6. Análisis Exploratorio de Datos (EDA)")
+    st.markdown("""
+        Es fundamental realizar este análisis de nuestros datos    
+    """)
+    # Estadísticas de df_train precalculadas (una vez por versión de datos)
+    with profiling.span("data"):
+        info_df, numeric_stats, category_stats = snapshot_tables(load_snapshot())
+
+    st.markdown("")
+    st.markdown("### **Info**")
+    # Mostrar la tabla en Streamlit
+    st.dataframe(info_df)
+
+    st.markdown("")
+    st.markdown("### **Describe**")
+
+    # Mostrar estadísticas de variables numéricas
+    st.markdown("### Estadísticas Descriptivas de Variables Numéricas")
+    st.dataframe(numeric_stats)
+
+    # Mostrar estadísticas de variables categóricas
+    st.markdown("### Estadísticas Descriptivas de Variables Categóricas")
+    st.dataframe(category_stats)
+
+    st.markdown("")
+    st.markdown("### **Análisis Univariado** *(numéricas)*")
+    # Construir la ruta absoluta del archivo de imagen
+    img_6_0 = os.path.join(BASE_DIR, "../streamlit/s_6_0.png")
+
+    # Imagen principal
+    show_image(img_6_0, (1000, 1000))
+
+    st.markdown("")
+    st.markdown("### **Análisis Univariado** *(categoricas)*")
+    # Construir la ruta absoluta del archivo de imagen
+    img_6_1 = os.path.join(BASE_DIR, "../streamlit/s_6_1.png")
+
+    # Imagen principal
+    show_image(img_6_1, (1000, 1000))
+
+    st.markdown("")
+    st.markdown("### **Análisis Bivariado** *(numéricas)*")
+    # Construir la ruta absoluta del archivo de imagen
+    img_6_2 = os.path.join(BASE_DIR, "../streamlit/s_6_2.png")
+
+    # Imagen principal
+    show_image(img_6_2, (1000, 1000))
+
+    st.markdown("")
+    st.markdown("### **Análisis Bivariado** *(categoricas)*")
+    # Construir la ruta absoluta del archivo de imagen
+    img_6_3 = os.path.join(BASE_DIR, "../streamlit/s_6_3.png")
+
+    # Imagen principal
+    show_image(img_6_3, (1000, 1000))
+
+    st.markdown("")
+    st.markdown("### **Correlación**")
+    # Construir la ruta absoluta del archivo de imagen
+    img_6_4 = os.path.join(BASE_DIR, "../streamlit/s_6_4.png")
+
+    # Imagen principal
+    show_image(img_6_4, (500, 500))
+
+    st.markdown("### Haz clic en el menú lateral para explorar las secciones.")
+
+    st.markdown("**Nota:** *Haz clic en el menú lateral para explorar las secciones.*")
@@ -0,0 +1,130 @@
+# Sección 5: 5. Hallazgos Clave -------------------------------------------
+import streamlit as st
+
+import figures
+import profiling
+
+
+def render():
+    st.title("5. Hallazgos Clave")
+    st.markdown("""
+    En este apartado explicaremos las características que tuvieron comportamientos a considerarse:  
+    """)
+
+    # Crear columnas Var_1
+    col1, col2 = st.columns([1, 2])
+
+    with col1:
+        st.markdown("#### **Age**")
+        st.markdown(""""
+            Los datos mayores a 70 años son outliers que pueden 
+            sesgar el análisis, por lo que los eliminamos para 
+            garantizar un modelo más robusto.
+        """)
+
+    with col2:
+        # Boxplot con estadísticas precalculadas en el servidor
+        with profiling.span("figure"):
+            fig = figures.age_boxplot()
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Crear columnas Var_2
+    col1, col2, col3 = st.columns([1, 1, 1])
+
+    with col1:
+        # Histogramas con conteos por bin calculados en el servidor
+        with profiling.span("figure"):
+            fig_original, fig_transformed = figures.balance_histograms()
+
+        # Mostrar ambos gráficos en Streamlit
+        st.plotly_chart(fig_original, use_container_width=True)
+
+    with col2:
+        st.plotly_chart(fig_transformed, use_container_width=True)
+
+
+    with col3:
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("#### **Balance**")
+        st.markdown("""
+            Presentaba una distribución sesgada con outliers
+            extremos, lo que dificultaba el modelado. Aplicamos 
+            la transformación Yeo-Johnson para normalizar los datos.
+        """)
+
+    # Crear columnas Var_3
+    col1, col2, col3 = st.columns([1, 1, 1])
+
+    with col1:
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("#### **Campaign**")
+        st.markdown("""
+            Las campañas tenían una distribución altamente sesgada. 
+            La transformación logarítmica permitió comprimir la 
+            escala y mejorar la estabilidad del modelo.
+        """)
+    with col2:
+        # Histogramas con conteos por bin calculados en el servidor
+        with profiling.span("figure"):
+            fig_original, fig_log_transform = figures.campaign_histograms()
+
+        # Mostrar gráficos lado a lado en Streamlit
+        st.plotly_chart(fig_original, use_container_width=True)
+
+    with col3:
+            st.plotly_chart(fig_log_transform, use_container_width=True)
+
+
+    # Crear columnas Var_4
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        # Conteo por trimestre
+        with profiling.span("figure"):
+            fig = figures.quarter_histogram()
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("#### **Month**")
+        st.markdown("""
+            Agrupamos los meses en trimestres para simplificar el 
+            análisis y capturar estacionalidad en las campañas.
+        """)
+
+    # Crear columnas Var_5
+    col1, col2 = st.columns([1, 2])
+
+    with col1:
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("#### **Pdays**")
+        st.markdown("""
+            Convertimos pdays en una variable binaria (contactado/no 
+            contactado) para simplificar el análisis y mejorar la 
+            interpretabilidad.
+        """)
+    with col2:
+        # Contactados vs no contactados
+        with profiling.span("figure"):
+            fig = figures.pdays_bar()
+        st.plotly_chart(fig, use_container_width=True)
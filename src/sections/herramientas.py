@@ -0,0 +1,48 @@
+# Sección 4: 4. Herramientas y metodologías -------------------------------
+import os
+
+import streamlit as st
+
+from sections.common import BASE_DIR, show_image
+
+
+def render():
+    st.title("4. Herramientas y metodologías")
+    st.markdown("Todo lo utilizado para el proyecto se describe a continuación:")
+    # Crear columnas
+    col1, col2, col3 = st.columns([1, 1, 1])
+
+    with col1:    
+        st.markdown("""
+            **Herramientas:**
+            - Pandas
+            - Numpy
+            - Seaborn
+            - Matplotlib
+            - Sklearn
+            - Joblib
+            - Python
+            - Jupyter
+            - Streamlit
+        """)
+
+    with col2:
+        # Construir la ruta absoluta del archivo de imagen
+        img_4_0 = os.path.join(BASE_DIR, "../streamlit/s_4.png")
+
+        # Imagen principal
+        show_image(img_4_0, (256, 256))
+
+    with col3:    
+        st.markdown("""
+            **Metodologias:**
+            - Estadística descriptiva e inferencial
+            - Análisis exploratorio de datos
+            - Transformación de datos (log, Yeo-Johnson, clasificación y binarias)
+            - Encodear características
+            - Modelos de Machine Learning (Random Forest, XGBoost y LGBM)
+            - Mejoramiento de hiperparametros de los modelos ML
+            - Técnicas de evaluación de modelos ML
+        """)
+
+    st.markdown("**Nota:** *Haz clic en el menú lateral para explorar las secciones.*")
@@ -0,0 +1,47 @@
+# Sección: Inicio ------------------------------------------------------
+import os
+
+import streamlit as st
+
+from sections.common import BASE_DIR, show_image
+
+
+def render():
+    st.title(" Inicio")
+
+    # Construir la ruta absoluta del archivo de imagen
+    image_inicio = os.path.join(BASE_DIR, "../streamlit/inicio.png")
+
+    # Crear las tres columnas
+    col1, col2, col3 = st.columns([1, 1, 1])
+
+    # Contenido de la columna izquierda
+    with col1:
+        st.markdown("#### Anteriormente")
+        st.markdown("- Decisiones basadas en suposiciones")
+        st.markdown("- Incertidumbre elevada")
+        st.markdown("- Rendimientos ineficientes")
+        st.markdown("")
+        st.markdown("#### Limitaciones de anteriores")
+        st.markdown("- Parece complicado")
+        st.markdown("- Desconocimiento")
+
+    # Contenido de la columna central (imagen)
+    with col2:
+        show_image(image_inicio, (256, 256))
+        st.markdown("#### Apoyo de herramientas tecnológicas")
+        st.markdown("Decisiones basadas en evidencias, impulsadas por datos.")
+
+    # Contenido de la columna derecha
+    with col3:
+        st.markdown("#### Apoyo de la Ciencia de Datos")
+        st.markdown("- Desarrollo de IA personalizadas")
+        st.markdown("- Mayor ventaja competitiva")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("#### Ventajas")
+        st.markdown("- Enfrentar el futuro con confianza")
+        st.markdown("- Cambios estructurados")
+
+    # Mensaje de bienvenida adicional
+    st.markdown("#### Haz clic en el menú lateral para explorar las secciones.")
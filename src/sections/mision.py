@@ -0,0 +1,35 @@
+# Sección 2: 2. La Misión del Rescate -------------------------------------
+import os
+
+import streamlit as st
+
+from sections.common import BASE_DIR, show_image
+
+
+def render():
+    st.title("2. La Misión del Rescate")
+
+    # Construir la ruta absoluta del archivo de imagen
+    img_2_0 = os.path.join(BASE_DIR, "../streamlit/s_2.png")
+
+    # Construir columnas
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("### **Objetivo:**")
+        st.markdown("""
+        Predecir cuando un cliente del banco realizará un depósito a plazo.
+
+        A través de identificar patrones en los datos históricos para 
+        optimizar las campañas y mejorar la tasa de éxito.
+    """)
+    
+    with col2:
+
+        # Imagen principal
+        show_image(img_2_0, (256, 256))
+
+    st.markdown("**Nota:** *Haz clic en el menú lateral para explorar las secciones.*")
@@ -0,0 +1,152 @@
+# Sección 9: 9. Predicción ------------------------------------------
+import pandas as pd
+import streamlit as st
+
+import profiling
+from model_registry import get_model
+from prediction_log import get_prediction_log
+from score_cache import get_score_cache, score_rows
+from threshold import load_threshold
+
+
+def render():
+    st.title("9. Predicción")
+
+    # Cargar el modelo (se deserializa una vez por proceso)
+    try:
+        with profiling.span("model_load"):
+            loaded_model = get_model()
+        model = loaded_model.model
+        st.success("Modelo cargado exitosamente.")
+    except FileNotFoundError:
+        st.error("No se encontró el modelo guardado en la ruta especificada.")
+    except ValueError as e:
+        # Preprocesamiento que no corresponde al modelo
+        st.error(f"No se puede usar el modelo: {e}")
+
+    # Crear un formulario para recolectar datos del usuario
+    st.markdown("### Introduce los datos del cliente:")
+
+    # Crear columnas
+    col1, col2 = st.columns([1, 2])
+
+    with col1:
+        with st.form("prediction_form"):
+            age = st.number_input("Edad", min_value=18, max_value=95, step=1, value=20)
+            job = st.selectbox("Trabajo", ["blue-collar", "admin.", "entrepreneur", "housemaid", "management", "retired", "self-employed", "services", "student", "technician", "unemployed", "unknow"])
+            marital = st.selectbox("Estado civil", ["married", "single", "divorced"])
+            education = st.selectbox("Educación?", ["primary", "secondary", "tertiary", "unknow"])
+            default = st.selectbox("¿Tiene crédito en mora?", ["yes", "no"])
+            housing = st.selectbox("¿Tiene hipoteca?", ["yes", "no"])
+            loan = st.selectbox("¿Tiene préstamo personal?", ["yes", "no"])
+            contact = st.selectbox("¿Tipo de contacto?", ["celullar", "telephone", "unknow"])
+            day = st.number_input("¿Qué día lo contactaron?", step=1, value=1)
+            duration = st.number_input("¿Tiempo de la llamada (segundos)?", step=0, value=3600)
+            poutcome = st.selectbox("Resultado de la campaña previa", ["success", "failure", "other", "unknown"])
+            balance = st.number_input("Balance", min_value=0, max_value=3000, step=1, value=0)
+            campaign = st.number_input("Número de contactos durante la campaña", min_value=0, max_value=60, step=1, value=0)
+            quarter = st.selectbox("Trimestre contactado", ["Q1", "Q2", "Q3", "Q4"])
+            pdays = st.selectbox("¿Se lo contacto antes?", ["no", "yes"])
+        
+        
+            # Botón para realizar la predicción
+            submitted = st.form_submit_button("Hacer Predicción")
+
+        if submitted:
+            # Crear un DataFrame con los datos ingresados
+            input_data = pd.DataFrame({
+                "age": [age],
+                "job": [job],
+                "marital": [marital],
+                "education": [education],
+                "default": [default],
+                "housing": [housing],
+                "loan": [loan],
+                "contact": [contact],
+                "day": [day],
+                "duration": [duration],
+                "poutcome": [poutcome],
+                "balance_yeojohnson": [balance],
+                "campaign_log": [campaign],
+                "quarter": [quarter],
+                "pdays_tran": [pdays]
+            })
+
+            # Verificar si el modelo está cargado
+            if 'model' in locals():
+                # Codificar los datos (mismo orden de columnas que el modelo)
+                with profiling.span("model"):
+                    processed_data = loaded_model.encoder.transform(input_data)
+
+                    # Hacer predicción (umbral ajustado en models/threshold.json).
+                    # Perfiles repetidos salen del caché de puntajes
+                    score_cache = get_score_cache()
+                    if score_cache is not None:
+                        probability = score_cache.predict_proba(loaded_model, processed_data)[0]
+                    else:
+                        probability = score_rows(loaded_model, processed_data)[0]
+                    threshold = load_threshold(loaded_model.version)
+                    prediction = [int(probability > threshold)]
+
+                # Registrar la predicción (la escritura ocurre en segundo plano)
+                prediction_log = get_prediction_log()
+                if prediction_log is not None:
+                    prediction_log.log(input_data, probability, threshold, loaded_model.version,
+                                       source="form", matrix=processed_data)
+
+                # Mostrar el resultado
+                if prediction[0] == 1:
+                    st.success(f"El modelo predice que el cliente **REALIZARA EL DEPOSITO A PLAZO**.")
+                else:
+                    st.info(f"El modelo predice que el cliente **NO REALIZARA EL DEPOSITO A PLAZO**.")
+
+            else:
+                st.error("El modelo no está cargado. Verifica el archivo del modelo.")
+    
+    with col2:
+        st.markdown("""
+            ### **Conclusiones**
+            - Integrar el modelo predictivo en el sistema de gestión de 
+                    campañas para priorizar a los clientes más propensos.
+            - Identificar qué clientes son más propensos a aceptar un depósito
+                    a plazo fijo permitió un uso más eficiente de los recursos del banco.
+            - Extender la solución a otros productos financieros como tarjetas de 
+                    crédito o préstamos personales.            
+        """)
+        st.markdown("")
+        st.markdown("")
+        st.markdown("""
+            Este proyecto demostró cómo la combinación de ciencia de datos y Machine
+                     Learning puede transformar un problema tradicionalmente ineficiente 
+                    en una solución moderna y escalable. Con este enfoque, el banco no 
+                    solo optimiza sus recursos, sino que también posiciona al cliente
+                     en el centro de sus decisiones.
+        """)
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+
+        st.markdown("**Para descargar el modelo precione el botón**")
+        # Verificar si el modelo está cargado
+        if 'loaded_model' in locals():
+            # Botón de descarga (bytes ya en memoria, sin releer el archivo)
+            st.download_button(
+                label="📥 Descargar Modelo LightGBM",
+                data=loaded_model.data,
+                file_name="bank_marketing_lgbm_model.joblib",
+                mime="application/octet-stream"
+            )
+
+            st.markdown("##### **Son bienvenidas las sugerencias de mejora**")
+            st.markdown("""
+                Pueden acceder a los repositorios de Github para revisar el proyecto:
+                - [**Rodrigo Pinedo**](https://github.com/rodri-iot/Final_Project_Data_Science)
+                - [**Alejandro Diaz**](https://github.com/a70mico/Final_Project_Data_Science)
+            """)
+        else:
+            st.error("El archivo del modelo no se encontró en la ruta especificada.")
+
+
+
+    st.markdown("**Nota:** *Haz clic en el menú lateral para explorar las secciones.*")
@@ -0,0 +1,32 @@
+# Sección 8: 8. Puesta en acción ------------------------------------------
+import os
+
+import streamlit as st
+
+from sections.common import BASE_DIR, show_image
+
+
+def render():
+    st.title("8. Puesta en acción")
+
+    # Crear columnas
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("""
+        - El equipo de marketing podrá enfocar sus esfuerzos en clientes identificados como potenciales.
+        - Gracias al proyecto el banco podrá utilizar sus recursos de marketing de manera eficiente.
+        - El banco podrá tomar mejor decisiones con mayor confianza.
+        """)
+
+    with col2:
+        # Construir la ruta absoluta del archivo de imagen
+        img_8_0 = os.path.join(BASE_DIR, "../streamlit/s_8.png")
+
+        # Imagen principal
+        show_image(img_8_0, (256, 256))
+    st.markdown("**Nota:** *Haz clic en el menú lateral para explorar las secciones.*")
@@ -0,0 +1,46 @@
+# Sección 1: 1. El Rescate de las Campañas Perdidas -----------------------
+import os
+
+import streamlit as st
+
+import figures
+import profiling
+from sections.common import BASE_DIR, show_image
+
+
+def render():
+    st.title("1. El Rescate de las Campañas Perdidas")
+    st.markdown("""
+    ### El Problema
+    *"El banco enfrenta el reto de mejorar el desempeño de sus campañas 
+    de marketing telefónico, que actualmente tienen una baja tasa de éxito."*
+    """)
+    # Construir la ruta absoluta del archivo de imagen
+    image_s_1 = os.path.join(BASE_DIR, "../streamlit/s_1.png")
+
+    # Crear las tres columnas
+    col1, col2 = st.columns([1, 1])
+
+    # Contenido de la columna izquierda
+    with col1:
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+        st.markdown("")
+
+        # Imagen gerente
+        show_image(image_s_1, (256, 256))
+
+        st.markdown("""
+                    - Solo el 11.7% de las campañas tienen éxito.
+                    - Se evidencia que el dataset se encuentra desbalanceado.
+        """)
+
+    # Contenido de la columna central (imagen)
+    with col2:
+        # Gráfico de la variable objetivo (cacheado por versión de datos)
+        with profiling.span("figure"):
+            fig = figures.target_pie()
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("**Nota:** *Haz clic en el menú lateral para explorar las secciones.*")
@@ -0,0 +1,150 @@
+# Sección 7: 7. Resultados ------------------------------------------------
+import os
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+import profiling
+from evaluation import MODEL_NAMES, comparison_table, evaluate_models, threshold_table
+from model_registry import MODEL_PATH
+from train import read_metrics_table
+
+# Métricas de la búsqueda original (si no hay models/metrics.json)
+STORED_METRICS = pd.DataFrame({
+    "Model": ["Random Forest", "XGBoost", "LightGBM"],
+    "Accuracy": [0.840805, 0.838122, 0.833762],
+    "F1-Score (Class 1)": [0.543297, 0.544368, 0.538055],
+    "Recall (Class 1)": [0.841948, 0.859841, 0.860835],
+})
+
+# Nombre en la tabla del modelo que usa la sección 9
+PRODUCTION_MODEL = MODEL_NAMES.get(os.path.basename(MODEL_PATH), "LightGBM")
+
+
+def render():
+    st.title("7. Resultados")
+    st.markdown("""
+        En la búsqueda de hiperparámetros comparamos tres modelos de ML
+        para elegir el que mejor rendimiento tiene:
+        - Random Forest
+        - XGBoost
+        - LGBM
+
+        Los modelos guardados en `models/` se evalúan en vivo sobre df_test
+        con el umbral de decisión vigente (el mismo de la sección 9); los
+        demás muestran las métricas de la última búsqueda, con umbral 0.5.
+    """)
+
+    # Crear columnas
+    col1, col2 = st.columns([2, 1])    
+
+    # Métricas en vivo sobre df_test (memorizadas por modelo, datos y umbral)
+    try:
+        with profiling.span("data"):
+            results = evaluate_models()
+    except FileNotFoundError:
+        results = []
+    except ValueError as e:
+        # Datos con filas repetidas entre train y test: se muestra la
+        # tabla publicada en lugar de métricas con fuga
+        st.warning(f"Métricas en vivo no disponibles: {e}")
+        results = []
+
+    with col1:
+        # Modelos sin archivo: última búsqueda (models/metrics.json)
+        with profiling.span("data"):
+            stored = read_metrics_table()
+            df_eval = comparison_table(results, STORED_METRICS if stored is None else stored)
+
+        # Crear la tabla con Plotly
+        import plotly.graph_objects as go
+        table_fig = go.Figure(data=[go.Table(
+            header=dict(
+                values=list(df_eval.columns),
+                fill_color=["#d9ead3", "#fce5cd", "#cfe2f3", "#d9d2e9", "#fff2cc", "#f3f3f3"],
+                align="center",
+                font=dict(size=14, color="black"),
+            ),
+            cells=dict(
+                values=[df_eval[col] if col in ("Model", "Fuente") else df_eval[col].round(4)
+                        for col in df_eval.columns],
+                fill_color="white",
+                align="center",
+                font=dict(size=12, color="black"),
+                height=30  # Altura de las celdas
+            ),
+        )])
+
+        # Ajustar altura y diseño general
+        table_fig.update_layout(
+            height=400,  # Altura total del gráfico
+            margin=dict(l=0, r=0, t=10, b=10),  # Reducir márgenes para compactar
+        )
+
+        # Mostrar la tabla en Streamlit
+        st.plotly_chart(table_fig)
+
+    with col2:
+        st.markdown("")
+        st.markdown("")
+        st.markdown("**Evaluación de los modelos de ML:**")
+        st.markdown("""
+            La métrica para determinar el mejor modelo a aplicar,
+            es *Recall*. Debido a que nuestro dataset está desbalanceado.
+        """)
+
+    # Crear columnas
+    col1, col2 = st.columns([1, 2])
+
+    with col1:
+        # Mostrar texto debajo de la gráfica (con las métricas de la tabla)
+        production = df_eval[df_eval["Model"] == PRODUCTION_MODEL]
+        if not production.empty:
+            row = production.iloc[0]
+            st.markdown(f"""
+                El modelo en producción ({PRODUCTION_MODEL}) identifica al
+                {row["Recall (Class 1)"]:.0%} de los clientes que aceptarán
+                hacer el depósito a plazo fijo, con una exactitud (accuracy)
+                de {row["Accuracy"]:.0%} y umbral {row["Umbral"]:.2f}.
+            """)
+
+    with col2:
+        # Crear el gráfico de líneas con Plotly
+        df_melted = df_eval.melt(
+            id_vars=["Model"], 
+            value_vars=["Accuracy", "F1-Score (Class 1)", "Recall (Class 1)"],
+            var_name="Metric", 
+            value_name="Score"
+        )
+        line_fig = px.line(
+            df_melted,
+            x="Model", y="Score", color="Metric",
+            title="Comparación de Modelos de ML",
+            markers=True,
+        )
+
+        # Personalizar el diseño del gráfico
+        line_fig.update_layout(
+            title=dict(font=dict(size=18, family="Arial", color="black")),
+            xaxis_title="Modelo",
+            yaxis_title="Puntaje",
+            legend_title="Métricas",
+            margin=dict(l=0, r=0, t=50, b=10),  # Ajustar márgenes
+        )
+
+        # Mostrar el gráfico en Streamlit
+        st.plotly_chart(line_fig, use_container_width=True)
+
+    if results:
+        with st.expander("Detalle de la evaluación en df_test"):
+            st.markdown("**Recall (Class 1) según el umbral de probabilidad:**")
+            st.dataframe(threshold_table(results))
+
+            for result in results:
+                st.markdown(f"**Matriz de confusión - {result['Model']} (umbral {result['Umbral']:.2f}):**")
+                st.dataframe(pd.DataFrame(
+                    result["confusion_matrix"],
+                    index=["Real: no", "Real: sí"],
+                    columns=["Predicción: no", "Predicción: sí"]
+                ))
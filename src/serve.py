@@ -0,0 +1,307 @@
+# Servicio HTTP de predicción ------------------------------------------
+# Expone el modelo LightGBM para el CRM sin pasar por Streamlit. Usa solo
+# la librería estándar (http.server), el mismo FeatureEncoder y el modelo
+# del ModelRegistry (en memoria, con recarga si cambia el archivo).
+#
+# Las solicitudes concurrentes se agrupan en micro-lotes: un hilo junta
+# las filas que llegan durante `max_wait_ms` (o hasta `max_batch_rows`)
+# y hace una sola llamada a predict_proba. Cada solicitud se valida antes
+# de encolarla (400 si no cumple el formato), así un cliente no hace
+# fallar el lote de los demás. Las filas ya puntuadas con la
+# misma versión del modelo salen del caché de puntajes (score_cache.py).
+#
+# El umbral de la clase 1 es el de models/threshold.json (src/threshold.py)
+# si no se indica --threshold; se relee solo si el archivo cambia.
+#
+# Endpoints:
+#   POST /predict   {"age": 35, "job": "admin.", ...}          -> un cliente
+#                   {"instances": [{...}, {...}]}               -> varios
+#   GET  /health    estado y versión del modelo
+#   GET  /metrics   latencias p50/p99, tamaño medio de los lotes y caché
+#
+# Uso:
+#   python src/serve.py --port 8000
+#   curl -X POST localhost:8000/predict -d '{"age": 35, "job": "admin.", ...}'
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from feature_encoder import validate_input
+from model_registry import MODEL_PATH, get_registry
+from score_cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL_S, ScoreCache, score_rows
+from threshold import load_threshold
+
+DEFAULT_MAX_BATCH_ROWS = 256
+DEFAULT_MAX_WAIT_MS = 2.0
+
+
+class MicroBatcher:
+    """Agrupa solicitudes concurrentes en una sola llamada al modelo."""
+
+    def __init__(self, registry, max_batch_rows=DEFAULT_MAX_BATCH_ROWS,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS, cache=None):
+        self.registry = registry
+        # Caché de puntajes por fila codificada (None = sin caché)
+        self.cache = cache
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.batched_rows = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, data):
+        """Future con las probabilidades (clase 1) de las filas de `data`."""
+        future = Future()
+        self._queue.put((data, future))
+        return future
+
+    def _collect(self):
+        # Bloquear hasta la primera solicitud y luego juntar las que
+        # lleguen dentro de la ventana de espera
+        items = [self._queue.get()]
+        n_rows = len(items[0][0])
+        deadline = time.perf_counter() + self.max_wait
+        while n_rows < self.max_batch_rows:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            items.append(item)
+            n_rows += len(item[0])
+        return items
+
+    def _score(self, loaded, data):
+        matrix = loaded.encoder.transform(data)
+        if self.cache is not None:
+            return self.cache.predict_proba(loaded, matrix)
+        return score_rows(loaded, matrix)
+
+    def _score_each(self, loaded, items):
+        # El lote falló: cada solicitud por separado, así solo falla la
+        # que tiene el problema
+        for data, future in items:
+            try:
+                probability = self._score(loaded, data)
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            self.batches += 1
+            self.batched_rows += len(data)
+            future.set_result((probability, loaded.version))
+
+    def _run(self):
+        while True:
+            items = self._collect()
+            try:
+                loaded = self.registry.get()
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+
+            frames = [data for data, _ in items]
+            batch = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            try:
+                probability = self._score(loaded, batch)
+            except Exception:
+                self._score_each(loaded, items)
+                continue
+
+            self.batches += 1
+            self.batched_rows += len(batch)
+            start = 0
+            for data, future in items:
+                stop = start + len(data)
+                future.set_result((probability[start:stop], loaded.version))
+                start = stop
+
+
+class LatencyStats:
+    """Latencias de las últimas solicitudes (ventana acotada)."""
+
+    def __init__(self, window=10_000):
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, seconds, error=False):
+        with self._lock:
+            self._latencies.append(seconds)
+            self.requests += 1
+            self.errors += int(error)
+
+    def summary(self):
+        with self._lock:
+            latencies = np.array(self._latencies)
+            requests, errors = self.requests, self.errors
+        summary = {"requests": requests, "errors": errors}
+        if len(latencies):
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+            summary.update({"p50_ms": round(p50, 3), "p99_ms": round(p99, 3)})
+        return summary
+
+
+def _parse_payload(payload):
+    # Devuelve (DataFrame, es_lote)
+    if isinstance(payload, dict) and "instances" in payload:
+        records, is_batch = payload["instances"], True
+    else:
+        records, is_batch = [payload], False
+    if not isinstance(records, list) or not records:
+        raise ValueError("'instances' debe ser una lista no vacía")
+    if not all(isinstance(record, dict) for record in records):
+        raise ValueError("Cada instancia debe ser un objeto JSON")
+
+    data = pd.DataFrame.from_records(records)
+    return validate_input(data, "form"), is_batch
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    # Se configuran en make_server
+    batcher = None
+    stats = None
+    # None: umbral de models/threshold.json para la versión del modelo
+    threshold = None
+
+    def _send_json(self, status, body):
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        if self.path == "/health":
+            try:
+                version = self.batcher.registry.get().version
+            except FileNotFoundError:
+                self._send_json(503, {"status": "error", "detail": "modelo no encontrado"})
+                return
+            self._send_json(200, {"status": "ok", "model_version": version})
+        elif self.path == "/metrics":
+            summary = self.stats.summary()
+            summary["batches"] = self.batcher.batches
+            if self.batcher.batches:
+                summary["mean_batch_rows"] = self.batcher.batched_rows / self.batcher.batches
+            if self.batcher.cache is not None:
+                summary["cache"] = self.batcher.cache.stats()
+            self._send_json(200, summary)
+        else:
+            self._send_json(404, {"detail": "ruta no encontrada"})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {"detail": "ruta no encontrada"})
+            return
+
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            data, is_batch = _parse_payload(json.loads(self.rfile.read(length)))
+        except Exception as e:
+            # Cualquier error al leer la solicitud es del cliente: 400
+            self.stats.record(time.perf_counter() - start, error=True)
+            self._send_json(400, {"detail": str(e)})
+            return
+
+        try:
+            probability, version = self.batcher.submit(data).result()
+        except Exception as e:
+            self.stats.record(time.perf_counter() - start, error=True)
+            self._send_json(500, {"detail": str(e)})
+            return
+
+        threshold = self.threshold if self.threshold is not None else load_threshold(version)
+        predictions = [
+            {"probability": float(p), "prediction": int(p > threshold)}
+            for p in probability
+        ]
+        body = {"model_version": version}
+        if is_batch:
+            body["predictions"] = predictions
+        else:
+            body.update(predictions[0])
+        self.stats.record(time.perf_counter() - start)
+        self._send_json(200, body)
+
+    def log_message(self, format, *args):
+        # Sin log por solicitud: agrega latencia y ruido
+        pass
+
+
+class PredictionServer(ThreadingHTTPServer):
+    # La cola por defecto (5) resetea conexiones con muchos clientes
+    # concurrentes, justo el caso que aprovecha el micro-batching
+    request_queue_size = 128
+
+
+def make_server(host="127.0.0.1", port=8000, model_path=MODEL_PATH,
+                max_batch_rows=DEFAULT_MAX_BATCH_ROWS, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                threshold=None, cache_size=DEFAULT_MAX_ENTRIES, cache_ttl_s=DEFAULT_TTL_S):
+    """Crear el servidor (port=0 elige un puerto libre, útil para pruebas)."""
+    registry = get_registry(model_path)
+    # Cargar el modelo antes de aceptar solicitudes
+    registry.get()
+
+    handler = type("Handler", (PredictionHandler,), {
+        "batcher": MicroBatcher(
+            registry, max_batch_rows, max_wait_ms,
+            ScoreCache(cache_size, cache_ttl_s) if cache_size > 0 else None
+        ),
+        "stats": LatencyStats(),
+        "threshold": threshold,
+    })
+    return PredictionServer((host, port), handler)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP de predicción.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--model", default=MODEL_PATH, help="Ruta del modelo joblib")
+    parser.add_argument("--max-batch-rows", type=int, default=DEFAULT_MAX_BATCH_ROWS,
+                        help="Filas máximas por micro-lote")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="Espera máxima para completar un micro-lote")
+    parser.add_argument("--threshold", type=float,
+                        help="Umbral de probabilidad para la clase 1 (por defecto models/threshold.json)")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_ENTRIES,
+                        help="Filas en el caché de puntajes (0 = sin caché)")
+    parser.add_argument("--cache-ttl-s", type=float, default=DEFAULT_TTL_S,
+                        help="Vencimiento de cada puntaje en caché (segundos)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = make_server(
+        args.host, args.port, args.model,
+        args.max_batch_rows, args.max_wait_ms, args.threshold,
+        args.cache_size, args.cache_ttl_s
+    )
+    print(f"Servicio de predicción en http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
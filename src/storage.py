@@ -0,0 +1,58 @@
+# Almacenamiento columnar (Parquet) ------------------------------------
+# Los CSV siguen siendo la fuente de verdad; la primera vez que se leen
+# se convierten a Parquet (con las categóricas codificadas como
+# diccionario) y las lecturas siguientes usan el Parquet. Si el CSV es
+# más nuevo que el Parquet, se vuelve a convertir.
+import os
+
+import pandas as pd
+
+
+def parquet_path_for(csv_path):
+    """Ruta del Parquet asociado a un CSV (mismo directorio y nombre)."""
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def is_stale(csv_path, parquet_path):
+    """True si el Parquet no existe o es más viejo que el CSV."""
+    if not os.path.exists(parquet_path):
+        return True
+    return os.path.getmtime(parquet_path) < os.path.getmtime(csv_path)
+
+
+def convert_csv_to_parquet(csv_path, parquet_path=None, **read_csv_kwargs):
+    """Convertir un CSV a Parquet y devolver la ruta del Parquet.
+
+    Las columnas con dtype 'category' se guardan como diccionario de
+    Arrow, así que al leerlas vuelven como categóricas sin re-parsear.
+    """
+    parquet_path = parquet_path or parquet_path_for(csv_path)
+    df = pd.read_csv(csv_path, **read_csv_kwargs)
+
+    # Escribir a un archivo temporal y renombrar, para que un lector
+    # concurrente nunca vea un Parquet a medio escribir
+    tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path, engine="pyarrow", compression="snappy")
+    os.replace(tmp_path, parquet_path)
+    return parquet_path
+
+
+def ensure_parquet(csv_path, **read_csv_kwargs):
+    """Devolver la ruta del Parquet de un CSV, convirtiéndolo si hace falta."""
+    parquet_path = parquet_path_for(csv_path)
+    if is_stale(csv_path, parquet_path):
+        convert_csv_to_parquet(csv_path, parquet_path, **read_csv_kwargs)
+    return parquet_path
+
+
+def read_parquet(parquet_path, columns=None):
+    """Leer un Parquet cargando solo las columnas pedidas."""
+    return pd.read_parquet(parquet_path, engine="pyarrow", columns=columns)
+
+
+def read_schema(parquet_path):
+    """dtypes de pandas de un Parquet sin leer los datos."""
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(parquet_path)
+    return schema.empty_table().to_pandas().dtypes
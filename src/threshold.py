@@ -0,0 +1,223 @@
+# Umbral de decisión ---------------------------------------------------
+# El modelo devuelve una probabilidad; el umbral decide a quién llamar.
+# Las probabilidades de df_test se calculan una sola vez por versión del
+# modelo y de los datos (caché en data/interim/threshold) y el barrido de
+# umbrales se hace en una sola pasada vectorizada: con los puntajes
+# ordenados, los verdaderos y falsos positivos de cada umbral salen de un
+# searchsorted, sin llamar a las métricas de sklearn por cada umbral.
+#
+# El umbral elegido se guarda en models/threshold.json y lo usan el
+# formulario (sección 9), el scoring por lotes y el servicio HTTP. No
+# se ajusta si df_test repite filas de df_train (ver
+# data_loader.check_test_overlap): el barrido premiaría la memoria del
+# modelo.
+#
+# Criterios:
+#   f1        máximo F1 de la clase 1
+#   recall    el umbral más alto con recall >= --min-recall
+#   capacity  máximo recall llamando como mucho a --capacity (fracción)
+#             de los clientes: la capacidad semanal del call center
+#   profit    máximo valor esperado: conversiones * --conversion-value
+#             - llamadas * --call-cost
+#
+# Uso:
+#   python src/threshold.py --objective capacity --capacity 0.15
+#   python src/threshold.py --objective recall --min-recall 0.9
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Obtener la ruta absoluta del directorio donde está el script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+THRESHOLD_PATH = os.path.join(BASE_DIR, "../models/threshold.json")
+PROBABILITY_DIR = os.path.join(BASE_DIR, "../data/interim/threshold")
+
+# Umbral por defecto de predict (LightGBM / scikit-learn)
+DEFAULT_THRESHOLD = 0.5
+
+OBJECTIVES = ["f1", "recall", "capacity", "profit"]
+
+
+def threshold_sweep(y_true, probability, thresholds=None):
+    """Métricas de la clase 1 para cada umbral (predicción: p > umbral).
+
+    Sin `thresholds` se usan todos los puntajes distintos (más 0), es decir
+    todos los puntos de corte posibles.
+    """
+    y_true = np.asarray(y_true) == 1
+    probability = np.asarray(probability, dtype=np.float64)
+    if thresholds is None:
+        thresholds = np.unique(np.concatenate([[0.0], probability]))
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+
+    positives = np.sort(probability[y_true])
+    negatives = np.sort(probability[~y_true])
+    # Puntajes estrictamente mayores que cada umbral
+    tp = len(positives) - np.searchsorted(positives, thresholds, side="right")
+    fp = len(negatives) - np.searchsorted(negatives, thresholds, side="right")
+    fn = len(positives) - tp
+    contacted = tp + fp
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(contacted > 0, tp / contacted, 0.0)
+        recall = tp / len(positives) if len(positives) else np.zeros(len(thresholds))
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+
+    return pd.DataFrame({
+        "threshold": thresholds,
+        "tp": tp,
+        "fp": fp,
+        "fn": fn,
+        "contacted": contacted,
+        "contacted_rate": contacted / len(probability),
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+    })
+
+
+def choose_threshold(sweep, objective="f1", min_recall=None, capacity=None,
+                     call_cost=None, conversion_value=None):
+    """Fila de `sweep` elegida según el criterio. ValueError si ninguna cumple."""
+    if objective == "f1":
+        return sweep.loc[sweep["f1"].idxmax()]
+    if objective == "recall":
+        if min_recall is None:
+            raise ValueError("El criterio 'recall' necesita min_recall")
+        candidates = sweep[sweep["recall"] >= min_recall]
+        if candidates.empty:
+            raise ValueError(f"Ningún umbral alcanza recall >= {min_recall}")
+        return candidates.loc[candidates["threshold"].idxmax()]
+    if objective == "capacity":
+        if capacity is None:
+            raise ValueError("El criterio 'capacity' necesita capacity")
+        candidates = sweep[sweep["contacted_rate"] <= capacity]
+        if candidates.empty:
+            raise ValueError(f"Ningún umbral llama a menos del {capacity:.0%} de los clientes")
+        # A igual recall, el umbral más alto (menos llamadas)
+        best = candidates[candidates["recall"] == candidates["recall"].max()]
+        return best.loc[best["threshold"].idxmax()]
+    if objective == "profit":
+        if call_cost is None or conversion_value is None:
+            raise ValueError("El criterio 'profit' necesita call_cost y conversion_value")
+        profit = sweep["tp"] * conversion_value - sweep["contacted"] * call_cost
+        return sweep.loc[profit.idxmax()]
+    raise ValueError(f"Criterio desconocido: {objective}")
+
+
+# Probabilidades en df_test (caché) -------------------------------------
+def test_probabilities(data_path=None, probability_dir=PROBABILITY_DIR):
+    """(y_test, probabilidades, versión del modelo) del modelo vigente.
+
+    Lanza ValueError si df_test repite filas de df_train.
+    """
+    from data_loader import CLEAN_DATA_PATH, check_test_overlap, dataset_version, get_test_data
+    from model_registry import get_model
+    from train import target_vector
+
+    data_path = data_path or CLEAN_DATA_PATH
+    check_test_overlap(data_path)
+    loaded = get_model()
+    data_key = hashlib.sha256(repr(dataset_version(data_path)).encode("utf-8")).hexdigest()[:12]
+    path = os.path.join(probability_dir, f"{loaded.version}_{data_key}.npz")
+    if os.path.exists(path):
+        with np.load(path) as cached:
+            return cached["y_test"], cached["probability"], loaded.version
+
+    df_test = get_test_data(data_path)
+    y_test = target_vector(df_test)
+    probability = loaded.model.predict_proba(loaded.encoder.transform(df_test, prepared=True))[:, 1]
+
+    os.makedirs(probability_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp_path, y_test=y_test, probability=probability)
+    os.replace(tmp_path, path)
+    return y_test, probability, loaded.version
+
+
+# Persistencia ------------------------------------------------------------
+def save_threshold(choice, objective, params, model_version, path=THRESHOLD_PATH):
+    record = {
+        "threshold": float(choice["threshold"]),
+        "objective": objective,
+        "params": params,
+        "model_version": model_version,
+        "metrics": {
+            name: float(choice[name])
+            for name in ["precision", "recall", "f1", "contacted_rate"]
+        },
+    }
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as threshold_file:
+        json.dump(record, threshold_file, indent=2)
+    os.replace(tmp_path, path)
+    return record
+
+
+# {ruta: ((mtime, tamaño), registro)}
+_cache = {}
+
+
+def read_threshold(path=THRESHOLD_PATH):
+    """Registro guardado en threshold.json, o None si no existe."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(path)
+    if cached is None or cached[0] != signature:
+        with open(path, encoding="utf-8") as threshold_file:
+            cached = (signature, json.load(threshold_file))
+        _cache[path] = cached
+    return cached[1]
+
+
+def load_threshold(model_version=None, path=THRESHOLD_PATH):
+    """Umbral vigente. Si se ajustó para otra versión del modelo se usa 0.5."""
+    record = read_threshold(path)
+    if record is None:
+        return DEFAULT_THRESHOLD
+    if model_version is not None and record.get("model_version") != model_version:
+        return DEFAULT_THRESHOLD
+    return record["threshold"]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ajustar el umbral de decisión del modelo.")
+    parser.add_argument("--objective", choices=OBJECTIVES, default="f1")
+    parser.add_argument("--min-recall", type=float, help="Recall mínimo (criterio recall)")
+    parser.add_argument("--capacity", type=float,
+                        help="Fracción máxima de clientes a llamar (criterio capacity)")
+    parser.add_argument("--call-cost", type=float, help="Costo por llamada (criterio profit)")
+    parser.add_argument("--conversion-value", type=float, help="Valor por depósito (criterio profit)")
+    parser.add_argument("--output", default=THRESHOLD_PATH, help="Ruta del threshold.json")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    y_test, probability, model_version = test_probabilities()
+    sweep = threshold_sweep(y_test, probability)
+    params = {
+        "min_recall": args.min_recall,
+        "capacity": args.capacity,
+        "call_cost": args.call_cost,
+        "conversion_value": args.conversion_value,
+    }
+    choice = choose_threshold(sweep, args.objective, **params)
+    record = save_threshold(choice, args.objective, params, model_version, args.output)
+    print(f"{len(sweep)} umbrales evaluados")
+    print(f"Umbral elegido ({args.objective}): {record['threshold']:.4f}")
+    for name, value in record["metrics"].items():
+        print(f"  {name}: {value:.4f}")
+    print(f"Guardado en: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
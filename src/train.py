@@ -0,0 +1,349 @@
+# Entrenamiento y búsqueda de hiperparámetros --------------------------
+# Busca hiperparámetros para Random Forest, XGBoost y LightGBM sobre
+# df_train, evalúa el mejor de cada uno en df_test y escribe la tabla de
+# métricas (models/metrics.json) que muestra la sección "7. Resultados".
+#
+# - Paralelismo por procesos: cada búsqueda reparte candidatos x folds
+#   entre procesos (n_jobs); los estimadores usan un solo hilo para no
+#   sobresuscribir los núcleos.
+# - La matriz codificada y los índices de los folds se calculan una vez y
+#   se guardan en data/interim/train (clave: versión de los datos y del
+#   preprocesamiento), así las tres búsquedas y las siguientes ejecuciones
+#   no vuelven a codificar ni a dividir.
+# - Successive halving (HalvingRandomSearchCV): los candidatos se evalúan
+#   primero con pocas filas y solo los mejores pasan a la siguiente ronda.
+# - Si df_test repite filas de df_train (data_loader.check_test_overlap)
+#   no se busca: las métricas de metrics.json medirían memoria.
+# - Con --save el mejor de cada modelo se guarda como versión nueva en
+#   models/versions (<modelo>.<versión>.joblib). Nunca se reemplaza el
+#   modelo de la app: un LightGBM se pone en producción con
+#   `python src/retrain.py --promote <versión>`, que además reajusta el
+#   umbral.
+#
+# Uso:
+#   python src/train.py                         # los tres modelos
+#   python src/train.py --models lgbm --n-jobs 16 --save
+#   python src/train.py --no-halving --n-candidates 30
+import argparse
+import hashlib
+import io
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import dump
+
+from data_loader import (CLEAN_DATA_PATH, RANDOM_STATE, check_test_overlap, dataset_version,
+                         get_train_test)
+from feature_encoder import FEATURE_NAMES, FeatureEncoder
+from preprocessing import PREPROCESSING_PATH, load_preprocessing
+
+# Obtener la ruta absoluta del directorio donde está el script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MODELS_DIR = os.path.join(BASE_DIR, "../models")
+METRICS_PATH = os.path.join(MODELS_DIR, "metrics.json")
+VERSIONS_DIR = os.path.join(MODELS_DIR, "versions")
+FOLDS_DIR = os.path.join(BASE_DIR, "../data/interim/train")
+
+DEFAULT_N_SPLITS = 5
+DEFAULT_N_CANDIDATES = 60
+DEFAULT_SCORING = "f1"
+
+# Columnas de la tabla de la sección 7
+METRIC_COLUMNS = ["Model", "Accuracy", "F1-Score (Class 1)", "Recall (Class 1)"]
+
+
+# Modelos y espacios de búsqueda ----------------------------------------
+def _random_forest(pos_weight):
+    from scipy.stats import randint
+    from sklearn.ensemble import RandomForestClassifier
+
+    estimator = RandomForestClassifier(
+        class_weight="balanced", n_jobs=1, random_state=RANDOM_STATE
+    )
+    params = {
+        "n_estimators": randint(100, 500),
+        "max_depth": randint(4, 20),
+        "min_samples_leaf": randint(1, 20),
+        "max_features": ["sqrt", "log2"],
+    }
+    return estimator, params
+
+
+def _xgboost(pos_weight):
+    from scipy.stats import loguniform, randint, uniform
+    from xgboost import XGBClassifier
+
+    estimator = XGBClassifier(
+        scale_pos_weight=pos_weight, n_jobs=1, tree_method="hist",
+        eval_metric="logloss", random_state=RANDOM_STATE
+    )
+    params = {
+        "n_estimators": randint(100, 500),
+        "max_depth": randint(3, 10),
+        "learning_rate": loguniform(0.01, 0.3),
+        "subsample": uniform(0.6, 0.4),
+        "colsample_bytree": uniform(0.6, 0.4),
+        "min_child_weight": randint(1, 10),
+    }
+    return estimator, params
+
+
+def _lightgbm(pos_weight):
+    from lightgbm import LGBMClassifier
+    from scipy.stats import loguniform, randint, uniform
+
+    estimator = LGBMClassifier(
+        scale_pos_weight=pos_weight, n_jobs=1, verbose=-1, random_state=RANDOM_STATE
+    )
+    params = {
+        "n_estimators": randint(100, 500),
+        "max_depth": randint(3, 12),
+        "num_leaves": randint(15, 127),
+        "learning_rate": loguniform(0.01, 0.3),
+        "subsample": uniform(0.6, 0.4),
+        "subsample_freq": [1],
+        "colsample_bytree": uniform(0.6, 0.4),
+        "min_child_samples": randint(10, 100),
+    }
+    return estimator, params
+
+
+# clave: (nombre en la tabla, constructor, archivo del modelo)
+MODELS = {
+    "rf": ("Random Forest", _random_forest, "bank_marketing_rf_model.joblib"),
+    "xgb": ("XGBoost", _xgboost, "bank_marketing_xgb_model.joblib"),
+    "lgbm": ("LightGBM", _lightgbm, "bank_marketing_lgbm_model.joblib"),
+}
+
+
+# Datos de entrenamiento y folds (caché) --------------------------------
+def training_encoder(preprocessing_path=PREPROCESSING_PATH):
+    """FeatureEncoder con el esquema de columnas del preprocesamiento."""
+    preprocessing = load_preprocessing(preprocessing_path)
+    names = preprocessing.feature_names if preprocessing else FEATURE_NAMES
+    return FeatureEncoder(names, preprocessing)
+
+
+def target_vector(df):
+    return (df["y"].to_numpy() == "yes").astype(np.int8)
+
+
+def _folds_key(data_path, preprocessing_path, n_splits):
+    digest = hashlib.sha256()
+    digest.update(repr(dataset_version(data_path)).encode("utf-8"))
+    if os.path.exists(preprocessing_path):
+        with open(preprocessing_path, "rb") as preprocessing_file:
+            digest.update(preprocessing_file.read())
+    digest.update(f"{n_splits}-{RANDOM_STATE}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def load_fold_data(data_path=CLEAN_DATA_PATH, n_splits=DEFAULT_N_SPLITS,
+                   preprocessing_path=PREPROCESSING_PATH, folds_dir=FOLDS_DIR):
+    """Matrices de train/test y los índices de los folds (con caché en disco).
+
+    Devuelve un diccionario con X_train, y_train, X_test, y_test y folds
+    (lista de pares de índices para el parámetro `cv`).
+    """
+    key = _folds_key(data_path, preprocessing_path, n_splits)
+    path = os.path.join(folds_dir, f"folds_{key}.npz")
+    if os.path.exists(path):
+        with np.load(path) as cached:
+            arrays = {name: cached[name] for name in cached.files}
+    else:
+        from sklearn.model_selection import StratifiedKFold
+
+        df_train, df_test = get_train_test(data_path)
+        encoder = training_encoder(preprocessing_path)
+        arrays = {
+            "X_train": encoder.transform(df_train, prepared=True),
+            "y_train": target_vector(df_train),
+            "X_test": encoder.transform(df_test, prepared=True),
+            "y_test": target_vector(df_test),
+        }
+        splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=RANDOM_STATE)
+        fold_ids = np.empty(len(arrays["y_train"]), dtype=np.int8)
+        for fold, (_, test_index) in enumerate(splitter.split(arrays["X_train"], arrays["y_train"])):
+            fold_ids[test_index] = fold
+        arrays["fold_ids"] = fold_ids
+
+        os.makedirs(folds_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    fold_ids = arrays.pop("fold_ids")
+    arrays["folds"] = [
+        (np.flatnonzero(fold_ids != fold), np.flatnonzero(fold_ids == fold))
+        for fold in range(int(fold_ids.max()) + 1)
+    ]
+    return arrays
+
+
+# Búsqueda ----------------------------------------------------------------
+def run_search(key, data, n_candidates=DEFAULT_N_CANDIDATES, scoring=DEFAULT_SCORING,
+               n_jobs=-1, halving=True, verbose=0):
+    """Búsqueda de hiperparámetros de un modelo. Devuelve el buscador ajustado."""
+    y_train = data["y_train"]
+    pos_weight = float((y_train == 0).sum() / max(1, (y_train == 1).sum()))
+    estimator, params = MODELS[key][1](pos_weight)
+
+    if halving:
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+        from sklearn.model_selection import HalvingRandomSearchCV
+
+        search = HalvingRandomSearchCV(
+            estimator, params, n_candidates=n_candidates, factor=3,
+            resource="n_samples", min_resources="exhaust", cv=data["folds"],
+            scoring=scoring, n_jobs=n_jobs, random_state=RANDOM_STATE, verbose=verbose
+        )
+    else:
+        from sklearn.model_selection import RandomizedSearchCV
+
+        search = RandomizedSearchCV(
+            estimator, params, n_iter=n_candidates, cv=data["folds"],
+            scoring=scoring, n_jobs=n_jobs, random_state=RANDOM_STATE, verbose=verbose
+        )
+    search.fit(data["X_train"], y_train)
+    return search
+
+
+def test_metrics(model, X_test, y_test):
+    """Accuracy, F1 y Recall (clase 1) en df_test."""
+    from sklearn.metrics import accuracy_score, f1_score, recall_score
+
+    y_pred = model.predict(X_test)
+    return {
+        "Accuracy": accuracy_score(y_test, y_pred),
+        "F1-Score (Class 1)": f1_score(y_test, y_pred),
+        "Recall (Class 1)": recall_score(y_test, y_pred),
+    }
+
+
+# Versiones en models/versions ------------------------------------------
+def model_version(model, preprocessing_path=PREPROCESSING_PATH):
+    """(versión, bytes del joblib): mismo hash que ModelRegistry."""
+    buffer = io.BytesIO()
+    dump(model, buffer)
+    data = buffer.getvalue()
+    preprocessing_data = b""
+    if os.path.exists(preprocessing_path):
+        with open(preprocessing_path, "rb") as preprocessing_file:
+            preprocessing_data = preprocessing_file.read()
+    return hashlib.sha256(data + preprocessing_data).hexdigest()[:12], data
+
+
+def versioned_name(file_name, version):
+    """bank_marketing_lgbm_model.joblib -> bank_marketing_lgbm_model.<versión>.joblib"""
+    stem, extension = os.path.splitext(file_name)
+    return f"{stem}.{version}{extension}"
+
+
+def save_version_file(model, file_name, versions_dir=VERSIONS_DIR):
+    """Guardar `model` en `versions_dir` con su versión. Devuelve (versión, ruta)."""
+    version, data = model_version(model)
+    path = os.path.join(versions_dir, versioned_name(file_name, version))
+    os.makedirs(versions_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as model_file:
+        model_file.write(data)
+    os.replace(tmp_path, path)
+    return version, path
+
+
+def _json_params(params):
+    return {name: value.item() if isinstance(value, np.generic) else value
+            for name, value in params.items()}
+
+
+def train_models(keys=tuple(MODELS), data_path=CLEAN_DATA_PATH, n_candidates=DEFAULT_N_CANDIDATES,
+                 scoring=DEFAULT_SCORING, n_jobs=-1, halving=True, n_splits=DEFAULT_N_SPLITS,
+                 versions_dir=VERSIONS_DIR, metrics_path=METRICS_PATH, save_models=False, verbose=False):
+    """Buscar y evaluar los modelos; escribe la tabla de métricas.
+
+    Con `save_models` cada ganador se guarda como versión en
+    `versions_dir`; el modelo de la app no se toca. Lanza ValueError si
+    df_test repite filas de df_train.
+    """
+    check_test_overlap(data_path)
+    data = load_fold_data(data_path, n_splits)
+    rows = []
+    for key in keys:
+        name, _, file_name = MODELS[key]
+        start = time.perf_counter()
+        search = run_search(key, data, n_candidates, scoring, n_jobs, halving)
+        seconds = time.perf_counter() - start
+
+        row = {"Model": name, **test_metrics(search.best_estimator_, data["X_test"], data["y_test"])}
+        row.update({
+            "cv_score": float(search.best_score_),
+            "search_seconds": seconds,
+            "best_params": _json_params(search.best_params_),
+        })
+        if save_models:
+            version, path = save_version_file(search.best_estimator_, file_name, versions_dir)
+            row["version"] = version
+            row["path"] = os.path.relpath(path, MODELS_DIR)
+        rows.append(row)
+        if verbose:
+            print(f"{name}: {scoring}={search.best_score_:.4f} (CV) en {seconds:.1f} s")
+
+    metrics = {
+        "scoring": scoring,
+        "halving": halving,
+        "n_candidates": n_candidates,
+        "data_version": list(dataset_version(data_path)),
+        "models": rows,
+    }
+    tmp_path = f"{metrics_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as metrics_file:
+        json.dump(metrics, metrics_file, indent=2)
+    os.replace(tmp_path, metrics_path)
+    return metrics
+
+
+def read_metrics_table(path=METRICS_PATH):
+    """DataFrame Model/Accuracy/F1/Recall de metrics.json, o None si no existe."""
+    try:
+        with open(path, encoding="utf-8") as metrics_file:
+            metrics = json.load(metrics_file)
+    except FileNotFoundError:
+        return None
+    return pd.DataFrame(metrics["models"])[METRIC_COLUMNS]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Búsqueda de hiperparámetros (RF, XGBoost, LightGBM).")
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), default=list(MODELS))
+    parser.add_argument("--data", default=CLEAN_DATA_PATH, help="CSV procesado (df_clean)")
+    parser.add_argument("--n-candidates", type=int, default=DEFAULT_N_CANDIDATES,
+                        help="Configuraciones a probar por modelo")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Procesos (-1 = todos los núcleos)")
+    parser.add_argument("--n-splits", type=int, default=DEFAULT_N_SPLITS, help="Folds de validación cruzada")
+    parser.add_argument("--scoring", default=DEFAULT_SCORING, help="Métrica de la búsqueda")
+    parser.add_argument("--no-halving", action="store_true", help="RandomizedSearchCV sin successive halving")
+    parser.add_argument("--save", action="store_true",
+                        help="Guardar los ganadores como versiones nuevas en models/versions")
+    parser.add_argument("--metrics", default=METRICS_PATH, help="Ruta de la tabla de métricas")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    metrics = train_models(
+        args.models, args.data, args.n_candidates, args.scoring, args.n_jobs,
+        halving=not args.no_halving, n_splits=args.n_splits,
+        metrics_path=args.metrics, save_models=args.save, verbose=True
+    )
+    print(pd.DataFrame(metrics["models"])[METRIC_COLUMNS].to_string(index=False))
+    print(f"Entrenamiento completado en {time.perf_counter() - start:.1f} s")
+    print(f"Métricas guardadas en: {args.metrics}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,4 @@
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
 import pandas as pd
 
 # load the .env file variables
@@ -7,7 +6,9 @@ load_dotenv()
 
 
 def db_connect():
+    # Engine compartido con pool (src/db_source.py). Antes se creaba un
+    # engine nuevo por llamada y la conexión de engine.connect() quedaba
+    # abierta; ahora las conexiones se piden con `with engine.connect()`.
+    from db_source import get_engine
     import os
-    engine = create_engine(os.getenv('DATABASE_URL'))
-    engine.connect()
-    return engine
+    return get_engine(os.getenv('DATABASE_URL'))